@@ -0,0 +1,220 @@
+"""
+balance.py
+Interfaz de línea de comandos - Usa el controlador sin interfaz gráfica
+
+Solo importa models y controllers (nunca tkinter), por lo que funciona en
+servidores, contenedores y tareas programadas sin pantalla.
+
+Uso:
+    python -m balance [--estado ARCHIVO.json | --bd ARCHIVO.sqlite] COMANDO ...
+
+Comandos:
+    registrar TIPO campo=valor ...   Registra una transacción
+    importar ARCHIVO                 Importa operaciones (CSV o JSONL)
+    totales [--fecha AAAA-MM-DD]     Muestra los totales del balance
+    exportar [--salida ARCHIVO]      Exporta el estado completo en JSON
+"""
+
+import time
+
+_INICIO = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.balance_controller import BalanceController
+from models.almacenamiento import ALMACENAMIENTOS
+
+
+def _fecha(texto: str) -> date:
+    """Convierte AAAA-MM-DD para argparse"""
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida: {texto!r} (use AAAA-MM-DD)")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Define los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog='python -m balance',
+        description="Sistema de Balance General sin interfaz gráfica"
+    )
+    parser.add_argument('--estado', metavar='ARCHIVO',
+                        help="Archivo JSON con catálogo y diario; se carga si "
+                             "existe y se guarda después de registrar o importar")
+    parser.add_argument('--bd', metavar='ARCHIVO.sqlite',
+                        help="Base SQLite (o libro binario .blib) con catálogo, "
+                             "saldos y diario; se crea si no existe y cada "
+                             "operación queda guardada")
+    parser.add_argument('--almacenamiento', choices=ALMACENAMIENTOS, default='diccionario',
+                        help="Motor de almacenamiento de saldos")
+    parser.add_argument('--json', action='store_true',
+                        help="Imprime los resultados en JSON")
+    parser.add_argument('--tiempo', action='store_true',
+                        help="Reporta en stderr el tiempo de arranque y de ejecución")
+
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    registrar = comandos.add_parser(
+        'registrar', help="Registra una transacción",
+        description="Ejemplo: registrar compra_efectivo cuenta_pago=BANCO "
+                    "tipo_destino=ACTIVO_CIRCULANTE cuenta_destino=INVENTARIO total=1160"
+    )
+    registrar.add_argument('tipo', help="compra_efectivo, compra_credito, "
+                                        "compra_combinada o anticipo_clientes")
+    registrar.add_argument('campos', nargs='+', metavar='campo=valor')
+    registrar.add_argument('--fecha', type=_fecha)
+    registrar.add_argument('--forzar', action='store_true',
+                           help="No valida fondos")
+
+    importar = comandos.add_parser('importar', help="Importa operaciones desde CSV o JSONL")
+    importar.add_argument('archivo')
+    importar.add_argument('--formato', choices=('csv', 'jsonl'))
+    importar.add_argument('--bloque', type=int, default=5000,
+                          help="Registros por lote")
+    importar.add_argument('--forzar', action='store_true',
+                          help="No valida fondos")
+
+    totales = comandos.add_parser('totales', help="Muestra los totales del balance")
+    totales.add_argument('--fecha', type=_fecha,
+                         help="Balance a esa fecha (inclusive)")
+
+    exportar = comandos.add_parser('exportar', help="Exporta el estado completo en JSON")
+    exportar.add_argument('--salida', metavar='ARCHIVO',
+                          help="Archivo de salida (por omisión stdout)")
+
+    return parser
+
+
+# === COMANDOS ===
+
+def comando_registrar(controller: BalanceController, args) -> int:
+    from models.importador import normalizar_tipo, validar_registro
+
+    registro = {'tipo': args.tipo}
+    for campo in args.campos:
+        nombre, separador, valor = campo.partition('=')
+        if not separador:
+            print(f"Campo inválido: {campo!r} (use campo=valor)", file=sys.stderr)
+            return 2
+        registro[nombre.strip()] = valor
+
+    estado = controller.obtener_estado_actual()
+    try:
+        tipo, parametros, _ = validar_registro(
+            registro, lambda cat, cuenta: cat in estado and cuenta in estado[cat]
+        )
+    except ValueError as e:
+        print(f"{normalizar_tipo(args.tipo)}: {e}", file=sys.stderr)
+        return 1
+
+    exito, detalles, mensaje = controller.realizar_operacion(
+        tipo, parametros, args.forzar, args.fecha
+    )
+    _imprimir(args, detalles if exito else {'error': mensaje}, mensaje,
+              error=not exito)
+    return 0 if exito else 1
+
+
+def comando_importar(controller: BalanceController, args) -> int:
+    exito, detalles, mensaje = controller.importar_operaciones(
+        args.archivo, args.formato, args.bloque, args.forzar
+    )
+
+    if args.json:
+        detalles = dict(detalles, errores=[e._asdict() for e in detalles['errores']])
+        print(json.dumps(detalles, ensure_ascii=False))
+    else:
+        print(mensaje)
+        for error in detalles['errores']:
+            print(f"  línea {error.linea}: {error.mensaje}", file=sys.stderr)
+    return 0 if exito else 1
+
+
+def comando_totales(controller: BalanceController, args) -> int:
+    if args.fecha:
+        try:
+            totales = controller.balance_al(args.fecha)['totales']
+        except ValueError as e:
+            _imprimir(args, {'error': str(e)}, str(e), error=True)
+            return 1
+    else:
+        totales = controller.calcular_totales()
+
+    if args.json:
+        print(json.dumps(totales))
+    else:
+        for clave, valor in totales.items():
+            if isinstance(valor, bool):
+                print(f"{clave:<22} {'SI' if valor else 'NO'}")
+            else:
+                print(f"{clave:<22} {valor:>20,.2f}")
+    return 0 if totales['balance_cuadra'] else 1
+
+
+def comando_exportar(controller: BalanceController, args) -> int:
+    estado = controller.exportar_estado_completo()
+    texto = json.dumps(estado, ensure_ascii=False, indent=2)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto)
+    else:
+        print(texto)
+    return 0
+
+
+COMANDOS = {
+    'registrar': (comando_registrar, True),
+    'importar': (comando_importar, True),
+    'totales': (comando_totales, False),
+    'exportar': (comando_exportar, False),
+}
+
+
+def _imprimir(args, datos: dict, mensaje: str, error: bool = False):
+    """Imprime un resultado en texto o JSON"""
+    if args.json:
+        print(json.dumps(datos, ensure_ascii=False, default=str))
+    else:
+        print(mensaje, file=sys.stderr if error else sys.stdout)
+
+
+def main(argv=None) -> int:
+    """Función principal; retorna el código de salida"""
+    args = crear_parser().parse_args(argv)
+
+    controller = BalanceController(almacenamiento=args.almacenamiento, base_datos=args.bd)
+    if args.estado and os.path.exists(args.estado):
+        exito, mensaje = controller.cargar_estado(args.estado)
+        if not exito:
+            print(mensaje, file=sys.stderr)
+            return 1
+
+    arranque = time.perf_counter() - _INICIO
+    comando, modifica = COMANDOS[args.comando]
+    codigo = comando(controller, args)
+
+    if modifica and args.estado:
+        exito, mensaje = controller.guardar_estado(args.estado)
+        if not exito:
+            print(mensaje, file=sys.stderr)
+            codigo = codigo or 1
+
+    controller.cerrar()
+
+    if args.tiempo:
+        print(f"arranque: {arranque * 1000:.1f} ms, "
+              f"total: {(time.perf_counter() - _INICIO) * 1000:.1f} ms", file=sys.stderr)
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Mediciones de rendimiento - Se ejecutan con python -m benchmarks
+"""
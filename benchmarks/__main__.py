@@ -0,0 +1,5 @@
+import sys
+
+from benchmarks.rendimiento import main
+
+sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+benchmarks/rendimiento.py
+Mediciones de rendimiento de las rutas críticas (sin interfaz gráfica)
+
+Para cada combinación de motor de almacenamiento, tamaño de catálogo y
+tamaño del libro diario se crea un controlador con un catálogo sintético
+y un diario precargado, y se mide cada caso: operaciones por segundo y
+latencias (p50, p95, p99, máximo). El resultado se escribe en JSON para
+comparar contra el de otro commit.
+
+Uso:
+    python -m benchmarks [--cuentas 10,1000,100000] [--asientos 10,100,1000,100000]
+                         [--almacenamiento diccionario,centavos] [--completo]
+                         [--salida resultados.json] [--comparar anterior.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Agregar la raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.balance_controller import BalanceController
+from models.almacenamiento import ALMACENAMIENTOS
+
+VERSION_FORMATO = 1
+
+CUENTAS_POR_OMISION = (10, 1000, 100000)
+ASIENTOS_POR_OMISION = (10, 100, 1000, 100000)
+
+# Con --completo se llega a 10⁷ asientos (varios GB de memoria y minutos
+# solo para precargar el diario)
+ASIENTOS_COMPLETO = (10, 100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Operaciones por llamada en el caso realizar_lote
+TAMANO_LOTE = 1000
+
+# Cuentas que usan las transacciones medidas (el resto es relleno en cero)
+CATALOGO_MINIMO = {
+    'ACTIVO_CIRCULANTE': {
+        'CAJA': 50000.00,
+        'BANCO': 2000000.00,
+        'PAPELERIA': 0.00,
+        'IVA ACREDITABLE': 0.00,
+        'IVA POR ACREDITAR': 0.00
+    },
+    'ACTIVO_NO_CIRCULANTE': {},
+    'PASIVO_LARGO_PLAZO': {},
+    'PASIVO_CORTO_PLAZO': {
+        'PROVEEDORES': 0.00
+    },
+    'CAPITAL': {
+        'CAPITAL SOCIAL': 2050000.00,
+        'ANTICIPO CLIENTES': 0.00,
+        'IVA TRASLADO': 0.00
+    }
+}
+
+
+# === PREPARACIÓN ===
+
+def catalogo_sintetico(num_cuentas: int) -> Dict[str, Dict[str, float]]:
+    """Catálogo mínimo más cuentas en cero repartidas entre las categorías"""
+    catalogo = {c: dict(cuentas) for c, cuentas in CATALOGO_MINIMO.items()}
+    categorias = list(catalogo)
+    existentes = sum(len(cuentas) for cuentas in catalogo.values())
+    for i in range(max(0, num_cuentas - existentes)):
+        catalogo[categorias[i % len(categorias)]][f"CUENTA {i:06d}"] = 0.0
+    return catalogo
+
+
+def preparar(almacenamiento: str, num_cuentas: int, num_asientos: int) -> BalanceController:
+    """
+    Controlador con un catálogo sintético y un diario de num_asientos
+    asientos de traspaso (CAJA <-> BANCO) repartidos en un año
+    """
+    controller = BalanceController(almacenamiento=almacenamiento)
+    modelo = controller.modelo
+    modelo.cargar_estado(catalogo_sintetico(num_cuentas))
+
+    inicio = date.today() - timedelta(days=365)
+    por_dia = max(1, num_asientos // 365)
+    ida = [('ACTIVO_CIRCULANTE', 'BANCO', -1.0), ('ACTIVO_CIRCULANTE', 'CAJA', 1.0)]
+    vuelta = [('ACTIVO_CIRCULANTE', 'CAJA', -1.0), ('ACTIVO_CIRCULANTE', 'BANCO', 1.0)]
+    for i in range(num_asientos):
+        modelo.aplicar_ajuste('TRASPASO', vuelta if i % 2 else ida,
+                              inicio + timedelta(days=min(i // por_dia, 365)))
+    return controller
+
+
+def _lote(num_operaciones: int) -> Dict:
+    return {
+        'tipo_activo': ['ACTIVO_CIRCULANTE'] * num_operaciones,
+        'cuenta': ['PAPELERIA'] * num_operaciones,
+        'total': [100.0 + i % 100 for i in range(num_operaciones)],
+        'tipo_pasivo': ['PASIVO_CORTO_PLAZO'] * num_operaciones,
+        'cuenta_pasivo': ['PROVEEDORES'] * num_operaciones
+    }
+
+
+def casos(controller: BalanceController) -> List[Tuple[str, Callable[[], object], int]]:
+    """
+    Casos a medir: (nombre, función, operaciones por llamada)
+
+    reiniciar va al final porque descarta el diario precargado.
+    """
+    lote = _lote(TAMANO_LOTE)
+    mitad_del_anio = date.today() - timedelta(days=182)
+    return [
+        ('realizar_compra_efectivo', lambda: controller.realizar_compra_efectivo(
+            'CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 116.0, forzar=True), 1),
+        ('realizar_compra_credito', lambda: controller.realizar_compra_credito(
+            [('ACTIVO_CIRCULANTE', 'PAPELERIA', 116.0)],
+            'PASIVO_CORTO_PLAZO', 'PROVEEDORES'), 1),
+        ('realizar_compra_combinada', lambda: controller.realizar_compra_combinada(
+            'CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 'PASIVO_CORTO_PLAZO',
+            'PROVEEDORES', 116.0, 0.3, forzar=True), 1),
+        ('realizar_anticipo_clientes', lambda: controller.realizar_anticipo_clientes(
+            'BANCO', 116.0, 0.5), 1),
+        ('realizar_lote', lambda: controller.realizar_lote(
+            'COMPRA CREDITO', lote, forzar=True), TAMANO_LOTE),
+        ('calcular_totales', controller.calcular_totales, 1),
+        ('balance_al', lambda: controller.balance_al(mitad_del_anio), 1),
+        ('copiar_catalogo', controller.modelo._copiar_catalogo, 1),
+        ('exportar_estado', controller.exportar_estado_completo, 1),
+        ('reiniciar', controller.modelo.reiniciar, 1),
+    ]
+
+
+# === MEDICIÓN ===
+
+def percentil(ordenados: Sequence[float], p: float) -> float:
+    """Percentil p (0 a 100) de una lista ordenada (el más cercano)"""
+    return ordenados[round((len(ordenados) - 1) * p / 100)]
+
+
+def medir(funcion: Callable[[], object], operaciones_por_llamada: int = 1,
+          repeticiones: int = 1000, tiempo_max: float = 1.0,
+          calentamiento: int = 3) -> Dict:
+    """
+    Llama a la función hasta `repeticiones` veces o hasta agotar
+    `tiempo_max` segundos (al menos 5 llamadas)
+
+    Returns:
+        Dict con las llamadas, operaciones por segundo y latencias en
+        microsegundos
+    """
+    for _ in range(calentamiento):
+        funcion()
+    gc.collect()
+
+    latencias = []
+    reloj = time.perf_counter_ns
+    limite = reloj() + int(tiempo_max * 1e9)
+    while len(latencias) < repeticiones:
+        inicio = reloj()
+        funcion()
+        fin = reloj()
+        latencias.append(fin - inicio)
+        if fin > limite and len(latencias) >= 5:
+            break
+
+    total = sum(latencias)
+    latencias.sort()
+    return {
+        'llamadas': len(latencias),
+        'por_segundo': len(latencias) * operaciones_por_llamada / (total / 1e9) if total else None,
+        'media_us': total / len(latencias) / 1e3,
+        'p50_us': percentil(latencias, 50) / 1e3,
+        'p95_us': percentil(latencias, 95) / 1e3,
+        'p99_us': percentil(latencias, 99) / 1e3,
+        'max_us': latencias[-1] / 1e3
+    }
+
+
+def _commit() -> Optional[str]:
+    """Commit actual del repositorio (None si no hay git)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def ejecutar(almacenamientos: Sequence[str] = ('diccionario',),
+             cuentas: Sequence[int] = CUENTAS_POR_OMISION,
+             asientos: Sequence[int] = ASIENTOS_POR_OMISION,
+             repeticiones: int = 1000, tiempo_max: float = 1.0,
+             progreso: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Mide todos los casos en cada combinación de parámetros
+
+    Returns:
+        Dict con el entorno, los parámetros y una entrada por caso
+    """
+    resultados = []
+    for almacenamiento in almacenamientos:
+        for num_cuentas in cuentas:
+            for num_asientos in asientos:
+                inicio = time.perf_counter()
+                controller = preparar(almacenamiento, num_cuentas, num_asientos)
+                preparacion = time.perf_counter() - inicio
+                if progreso:
+                    progreso(f"{almacenamiento}, {num_cuentas:,} cuentas, "
+                             f"{num_asientos:,} asientos (preparado en {preparacion:.1f} s)")
+
+                for nombre, funcion, por_llamada in casos(controller):
+                    resultados.append({
+                        'caso': nombre,
+                        'almacenamiento': almacenamiento,
+                        'cuentas': num_cuentas,
+                        'asientos': num_asientos,
+                        **medir(funcion, por_llamada, repeticiones, tiempo_max)
+                    })
+                del controller
+                gc.collect()
+
+    return {
+        'formato': VERSION_FORMATO,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'parametros': {
+            'almacenamientos': list(almacenamientos),
+            'cuentas': list(cuentas),
+            'asientos': list(asientos),
+            'repeticiones': repeticiones,
+            'tiempo_max': tiempo_max,
+            'tamano_lote': TAMANO_LOTE
+        },
+        'resultados': resultados
+    }
+
+
+def _clave(resultado: Dict) -> Tuple:
+    return (resultado['caso'], resultado['almacenamiento'],
+            resultado['cuentas'], resultado['asientos'])
+
+
+def comparar(anterior: Dict, actual: Dict, umbral: float = 0.10) -> List[Dict]:
+    """
+    Casos cuya mediana empeoró más que el umbral (0.10 = 10%)
+
+    Solo se comparan los casos presentes en ambos resultados.
+    """
+    previos = {_clave(r): r for r in anterior['resultados']}
+    regresiones = []
+    for resultado in actual['resultados']:
+        previo = previos.get(_clave(resultado))
+        if previo is None or not previo['p50_us']:
+            continue
+        razon = resultado['p50_us'] / previo['p50_us']
+        if razon > 1 + umbral:
+            regresiones.append({
+                'caso': resultado['caso'],
+                'almacenamiento': resultado['almacenamiento'],
+                'cuentas': resultado['cuentas'],
+                'asientos': resultado['asientos'],
+                'p50_anterior_us': previo['p50_us'],
+                'p50_actual_us': resultado['p50_us'],
+                'razon': razon
+            })
+    return regresiones
+
+
+# === LÍNEA DE COMANDOS ===
+
+def _enteros(texto: str) -> List[int]:
+    try:
+        return [int(float(t)) for t in texto.split(',') if t]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"lista de enteros inválida: {texto!r}")
+
+
+def _almacenamientos(texto: str) -> List[str]:
+    nombres = [t for t in texto.split(',') if t]
+    for nombre in nombres:
+        if nombre not in ALMACENAMIENTOS:
+            raise argparse.ArgumentTypeError(
+                f"almacenamiento desconocido: {nombre!r} (use {', '.join(ALMACENAMIENTOS)})")
+    return nombres
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Define los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Mediciones de rendimiento del Balance General"
+    )
+    parser.add_argument('--almacenamiento', type=_almacenamientos, default=['diccionario'],
+                        help="Motores separados por comas")
+    parser.add_argument('--cuentas', type=_enteros, default=list(CUENTAS_POR_OMISION),
+                        help="Tamaños de catálogo separados por comas")
+    parser.add_argument('--asientos', type=_enteros,
+                        help="Tamaños del libro diario separados por comas "
+                             "(acepta 1e6)")
+    parser.add_argument('--completo', action='store_true',
+                        help="Diario de 10 a 10⁷ asientos (lento, varios GB)")
+    parser.add_argument('--repeticiones', type=int, default=1000,
+                        help="Llamadas máximas por caso")
+    parser.add_argument('--tiempo-max', type=float, default=1.0,
+                        help="Segundos máximos por caso")
+    parser.add_argument('--salida', metavar='ARCHIVO.json',
+                        help="Escribe el resultado en este archivo")
+    parser.add_argument('--comparar', metavar='ANTERIOR.json',
+                        help="Reporta los casos más lentos que en este resultado")
+    parser.add_argument('--umbral', type=float, default=0.10,
+                        help="Empeoramiento tolerado al comparar (0.10 = 10%%)")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Función principal; retorna el código de salida (1 si hay regresiones)"""
+    args = crear_parser().parse_args(argv)
+    asientos = args.asientos or (ASIENTOS_COMPLETO if args.completo else ASIENTOS_POR_OMISION)
+
+    anterior = None
+    if args.comparar:
+        try:
+            with open(args.comparar, encoding='utf-8') as archivo:
+                anterior = json.load(archivo)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo leer '{args.comparar}': {e}", file=sys.stderr)
+            return 2
+
+    resultado = ejecutar(args.almacenamiento, args.cuentas, asientos,
+                         args.repeticiones, args.tiempo_max,
+                         progreso=lambda texto: print(texto, file=sys.stderr))
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo, indent=2)
+    else:
+        json.dump(resultado, sys.stdout, indent=2)
+        print()
+
+    print(f"{'caso':<28}{'motor':<13}{'cuentas':>9}{'asientos':>11}"
+          f"{'ops/s':>13}{'p50 µs':>10}{'p99 µs':>10}", file=sys.stderr)
+    for r in resultado['resultados']:
+        print(f"{r['caso']:<28}{r['almacenamiento']:<13}{r['cuentas']:>9,}{r['asientos']:>11,}"
+              f"{r['por_segundo']:>13,.0f}{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}",
+              file=sys.stderr)
+
+    if anterior is None:
+        return 0
+    regresiones = comparar(anterior, resultado, args.umbral)
+    for r in regresiones:
+        print(f"REGRESIÓN {r['caso']} ({r['almacenamiento']}, {r['cuentas']:,} cuentas, "
+              f"{r['asientos']:,} asientos): p50 {r['p50_anterior_us']:.1f} -> "
+              f"{r['p50_actual_us']:.1f} µs (x{r['razon']:.2f})", file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
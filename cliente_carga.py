@@ -0,0 +1,169 @@
+"""
+cliente_carga.py
+Prueba de carga contra el servicio local (servidor.py)
+
+Abre varias conexiones keep-alive que envían peticiones en paralelo, con
+una proporción configurable de escrituras, y reporta peticiones por
+segundo y latencias (p50, p95, p99) de lecturas y escrituras.
+
+Uso:
+    python -m cliente_carga [--puerto 8765] [--conexiones 32] [--peticiones 10000]
+                            [--escrituras 0.2] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+LECTURAS = ('/totales', '/estado', '/cuentas/ACTIVO_CIRCULANTE')
+
+ESCRITURA = {
+    'tipo': 'COMPRA CREDITO',
+    'tipo_activo': 'ACTIVO_CIRCULANTE',
+    'cuenta': 'PAPELERIA',
+    'tipo_pasivo': 'PASIVO_CORTO_PLAZO',
+    'cuenta_pasivo': 'PROVEEDORES',
+}
+
+
+async def peticion(lector: asyncio.StreamReader, escritor: asyncio.StreamWriter,
+                   metodo: str, ruta: str, datos: Optional[Dict] = None) -> Tuple[int, Dict]:
+    """Envía una petición por una conexión abierta y lee la respuesta"""
+    cuerpo = json.dumps(datos).encode('utf-8') if datos is not None else b''
+    escritor.write(
+        f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n"
+        .encode('latin-1') + cuerpo
+    )
+    await escritor.drain()
+
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        linea = await lector.readline()
+        if linea in (b'\r\n', b'\n', b''):
+            break
+        nombre, _, valor = linea.decode('latin-1').partition(':')
+        if nombre.strip().lower() == 'content-length':
+            largo = int(valor)
+    return estado, json.loads(await lector.readexactly(largo))
+
+
+async def _conexion(host: str, puerto: int, peticiones: int, escrituras: float,
+                    azar: random.Random, latencias: Dict[str, List[float]],
+                    errores: List[str]):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        for _ in range(peticiones):
+            if azar.random() < escrituras:
+                clase, metodo, ruta = 'escritura', 'POST', '/operaciones'
+                datos = dict(ESCRITURA, total=round(azar.uniform(1, 1000), 2))
+            else:
+                clase, metodo, ruta, datos = 'lectura', 'GET', azar.choice(LECTURAS), None
+
+            inicio = time.perf_counter()
+            estado, respuesta = await peticion(lector, escritor, metodo, ruta, datos)
+            latencias[clase].append(time.perf_counter() - inicio)
+            if estado >= 400:
+                errores.append(f"{metodo} {ruta}: {estado} {respuesta.get('error')}")
+    finally:
+        escritor.close()
+
+
+def _percentiles(valores: List[float]) -> Optional[Dict[str, float]]:
+    """p50, p95, p99 y máximo en milisegundos"""
+    if not valores:
+        return None
+    valores = sorted(valores)
+    ultimo = len(valores) - 1
+    return {
+        'n': len(valores),
+        **{f"p{p}": valores[round(ultimo * p / 100)] * 1000 for p in (50, 95, 99)},
+        'max': valores[-1] * 1000
+    }
+
+
+async def ejecutar(host: str = '127.0.0.1', puerto: int = 8765, conexiones: int = 32,
+                   peticiones: int = 10000, escrituras: float = 0.2,
+                   semilla: Optional[int] = None) -> Dict:
+    """
+    Ejecuta la prueba de carga
+
+    Returns:
+        Dict con la duración, peticiones por segundo, latencias y errores
+    """
+    latencias: Dict[str, List[float]] = {'lectura': [], 'escritura': []}
+    errores: List[str] = []
+    por_conexion, sobrantes = divmod(peticiones, conexiones)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _conexion(host, puerto, por_conexion + (i < sobrantes), escrituras,
+                  random.Random(None if semilla is None else semilla + i),
+                  latencias, errores)
+        for i in range(conexiones)
+    ))
+    duracion = time.perf_counter() - inicio
+
+    total = len(latencias['lectura']) + len(latencias['escritura'])
+    return {
+        'peticiones': total,
+        'duracion': duracion,
+        'por_segundo': total / duracion if duracion else 0.0,
+        'lecturas_ms': _percentiles(latencias['lectura']),
+        'escrituras_ms': _percentiles(latencias['escritura']),
+        'errores': len(errores),
+        'primeros_errores': errores[:5]
+    }
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Define los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog='python -m cliente_carga',
+        description="Prueba de carga del servicio local del Balance General"
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--conexiones', type=int, default=32)
+    parser.add_argument('--peticiones', type=int, default=10000)
+    parser.add_argument('--escrituras', type=float, default=0.2,
+                        help="Proporción de escrituras (0 a 1)")
+    parser.add_argument('--semilla', type=int)
+    parser.add_argument('--json', action='store_true',
+                        help="Imprime el resultado en JSON")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Función principal; retorna el código de salida"""
+    args = crear_parser().parse_args(argv)
+
+    try:
+        resultado = asyncio.run(ejecutar(args.host, args.puerto, args.conexiones,
+                                         args.peticiones, args.escrituras, args.semilla))
+    except OSError as e:
+        print(f"No se pudo conectar a {args.host}:{args.puerto}: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(resultado))
+    else:
+        print(f"{resultado['peticiones']:,} peticiones en {resultado['duracion']:.2f} s "
+              f"({resultado['por_segundo']:,.0f}/s), {resultado['errores']} errores")
+        for clase in ('lecturas_ms', 'escrituras_ms'):
+            datos = resultado[clase]
+            if datos:
+                print(f"  {clase[:-3]:<11} n={datos['n']:<7,} p50={datos['p50']:.2f} "
+                      f"p95={datos['p95']:.2f} p99={datos['p99']:.2f} max={datos['max']:.2f} ms")
+        for error in resultado['primeros_errores']:
+            print(f"  {error}", file=sys.stderr)
+    return 0 if not resultado['errores'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
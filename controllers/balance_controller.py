@@ -3,15 +3,54 @@ controllers/balance_controller.py
 Controlador principal - Maneja la lógica entre el modelo y las vistas
 """
 
-from typing import Dict, List, Tuple, Optional
+from collections import deque
+from datetime import date
+from typing import Callable, Deque, Dict, Iterable, List, Tuple, Optional
+from models.arbol_cuentas import SEPARADOR, ruta_valida
 from models.balance_model import BalanceModel
+from models.libro_diario import LibroDiario, Movimiento, invertir_movimientos
+
+# Paso de deshacer/rehacer: tipo de la operación y movimientos a aplicar
+PasoDeshacer = Tuple[str, Tuple[Movimiento, ...]]
 
 
 class BalanceController:
     """Controlador que coordina el modelo y las vistas"""
     
-    def __init__(self):
-        self.modelo = BalanceModel()
+    def __init__(self, depurar_totales: bool = False,
+                 almacenamiento: str = 'diccionario',
+                 puntos_control_cada: int = 1000,
+                 limite_deshacer: int = 100,
+                 base_datos: Optional[str] = None):
+        self.modelo = BalanceModel(depurar_totales=depurar_totales,
+                                   almacenamiento=almacenamiento,
+                                   puntos_control_cada=puntos_control_cada)
+        
+        # Base SQLite (o libro binario .blib) opcional: si ya tiene datos
+        # se cargan, si no se guarda el catálogo inicial
+        self.base_datos = None
+        if base_datos and base_datos.lower().endswith('.blib'):
+            from models.libro_binario import LibroBinario
+            self.base_datos = LibroBinario(base_datos)
+        elif base_datos:
+            from models.base_datos import BaseDatos
+            self.base_datos = BaseDatos(base_datos)
+        if self.base_datos is not None:
+            if self.base_datos.esta_vacia():
+                self.base_datos.guardar_todo(self.modelo)
+            else:
+                self.base_datos.cargar(self.modelo)
+        
+        # Pilas de deshacer/rehacer; cada paso guarda solo los deltas de
+        # las cuentas que tocó la operación, no copias del estado
+        self._deshacer: Deque[PasoDeshacer] = deque(maxlen=limite_deshacer)
+        self._rehacer: Deque[PasoDeshacer] = deque(maxlen=limite_deshacer)
+        
+        # Métricas de llamadas y asientos (None mientras esté desactivada)
+        self.instrumentacion = None
+        
+        # categoría -> (versión de sus cuentas, nombres) para los diálogos
+        self._listas_cuentas: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
     
     # === OPERACIONES DE CATÁLOGO ===
     
@@ -25,10 +64,14 @@ class BalanceController:
         if not nombre:
             return False, "El nombre de la cuenta no puede estar vacío"
         
-        nombre = nombre.strip().upper()
+        # Subcuentas: 'Banco / BBVA' -> 'BANCO/BBVA'
+        nombre = SEPARADOR.join(parte.strip() for parte in nombre.upper().split(SEPARADOR))
+        
+        if not ruta_valida(nombre):
+            return False, f"La cuenta '{nombre}' tiene un nivel vacío"
         
         if self.modelo.agregar_cuenta(categoria, nombre, valor):
-            return True, f"Cuenta '{nombre}' agregada exitosamente"
+            return True, self._persistir(f"Cuenta '{nombre}' agregada exitosamente")
         else:
             return False, f"La cuenta '{nombre}' ya existe en esta categoría"
     
@@ -40,7 +83,7 @@ class BalanceController:
             Tuple (éxito, mensaje)
         """
         if self.modelo.modificar_cuenta(categoria, nombre, nuevo_valor):
-            return True, f"Cuenta '{nombre}' actualizada"
+            return True, self._persistir(f"Cuenta '{nombre}' actualizada")
         else:
             return False, f"No se pudo actualizar la cuenta '{nombre}'"
     
@@ -52,13 +95,66 @@ class BalanceController:
             Tuple (éxito, mensaje)
         """
         if self.modelo.eliminar_cuenta(categoria, nombre):
-            return True, f"Cuenta '{nombre}' eliminada"
+            # Los pasos guardados podrían mover la cuenta eliminada
+            self._limpiar_historial()
+            return True, self._persistir(f"Cuenta '{nombre}' eliminada")
         else:
             return False, f"No se puede eliminar la cuenta '{nombre}' (es una cuenta protegida)"
     
-    def obtener_cuentas(self, categoria: str) -> List[str]:
-        """Obtiene lista de cuentas de una categoría"""
-        return self.modelo.obtener_cuentas(categoria)
+    def obtener_cuentas(self, categoria: str) -> Tuple[str, ...]:
+        """
+        Obtiene las cuentas de una categoría (en el orden del catálogo)
+        
+        La tupla se guarda con la versión de las cuentas de la categoría,
+        que solo cambia con altas y bajas: mientras tanto cada llamada (p. ej.
+        al cambiar el tipo en un diálogo) retorna la misma tupla sin
+        recorrer el catálogo.
+        """
+        return self._lista_cuentas(categoria, self.modelo.versiones_cuentas[categoria],
+                                   self.modelo.catalogo)
+    
+    def _lista_cuentas(self, categoria: str, version: int, catalogo) -> Tuple[str, ...]:
+        """Cuentas de un catálogo en la versión dada, del caché si la tiene"""
+        guardada = self._listas_cuentas.get(categoria)
+        if guardada is None or guardada[0] != version:
+            guardada = (version, tuple(catalogo[categoria]))
+            self._listas_cuentas[categoria] = guardada
+        return guardada[1]
+    
+    def buscar_cuentas(self, texto: str, categoria: Optional[str] = None,
+                       limite: int = 50) -> List[Tuple[str, str]]:
+        """
+        Busca cuentas por nombre para autocompletar (prefijo, palabra o
+        parecido; sin distinguir mayúsculas ni acentos)
+        
+        Returns:
+            Lista de (categoría, cuenta)
+        """
+        return self.modelo.buscar_cuentas(texto, categoria, limite)
+    
+    def ubicar_cuenta(self, nombre: str) -> List[str]:
+        """Categorías en las que existe una cuenta con ese nombre"""
+        return self.modelo.ubicar_cuenta(nombre.strip().upper())
+    
+    def total_cuenta(self, categoria: str, ruta: Optional[str] = None) -> float:
+        """
+        Saldo de una cuenta o total de un nivel de subcuentas (sin ruta,
+        el de la categoría)
+        
+        Raises:
+            KeyError: Si la ruta no existe en la categoría
+        """
+        return self.modelo.total_cuenta(categoria, ruta)
+    
+    def obtener_subcuentas(self, categoria: str,
+                           ruta: Optional[str] = None) -> List[Tuple[str, float, bool]]:
+        """
+        Niveles directamente debajo de una ruta para recorrer el árbol
+        
+        Returns:
+            Lista de (ruta, total, tiene_subcuentas)
+        """
+        return self.modelo.obtener_subcuentas(categoria, ruta)
     
     def obtener_catalogo_completo(self) -> Dict:
         """Obtiene el catálogo completo"""
@@ -68,6 +164,169 @@ class BalanceController:
         """Obtiene el estado actual de todas las cuentas"""
         return self.modelo.estado_actual
     
+    # === EVENTOS ===
+    
+    @property
+    def eventos(self):
+        """
+        Bus de cambios del modelo (BusEventos)
+        
+        Se conserva aunque cargar_estado cambie de modelo, así que las
+        vistas se suscriben una sola vez.
+        """
+        return self.modelo.eventos
+    
+    # === LIBRO DIARIO ===
+    
+    def obtener_diario(self) -> LibroDiario:
+        """Obtiene el libro diario con los asientos de la sesión"""
+        return self.modelo.diario
+    
+    def reconstruir_estado(self) -> Dict:
+        """Reconstruye el estado actual reproduciendo el libro diario"""
+        return self.modelo.reconstruir_estado()
+    
+    def balance_al(self, fecha: date) -> Dict:
+        """
+        Balance general a una fecha (asientos con fecha menor o igual)
+        
+        Returns:
+            Dict con 'fecha', 'asientos', 'estado' y 'totales'
+        
+        Raises:
+            ValueError: Si la fecha es anterior a la apertura del diario y
+                        no hay saldos guardados de esa fecha
+        """
+        return self.modelo.balance_al(fecha)
+    
+    # === INSTANTÁNEAS ===
+    
+    def tomar_instantanea(self, nombre: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Guarda una instantánea del estado actual
+        
+        Returns:
+            Tuple (éxito, mensaje)
+        """
+        instantanea = self.modelo.tomar_instantanea(nombre.strip() if nombre else None)
+        return True, f"Instantánea '{instantanea.nombre}' guardada"
+    
+    def listar_instantaneas(self) -> List[Dict]:
+        """Lista las instantáneas guardadas (nombre, fecha, secuencia)"""
+        return [inst.resumen() for inst in self.modelo.listar_instantaneas()]
+    
+    def restaurar_instantanea(self, nombre: str) -> Tuple[bool, Dict, str]:
+        """
+        Restaura el estado actual desde una instantánea
+        
+        Returns:
+            Tuple (éxito, detalles, mensaje)
+        """
+        try:
+            detalles = self.modelo.restaurar_instantanea(nombre)
+        except KeyError:
+            return False, {}, f"No existe la instantánea '{nombre}'"
+        except Exception as e:
+            return False, {}, f"Error al restaurar: {e}"
+        
+        return True, detalles, self._operacion_registrada(
+            detalles, f"Estado restaurado desde '{nombre}'")
+    
+    def eliminar_instantanea(self, nombre: str) -> Tuple[bool, str]:
+        """
+        Descarta una instantánea
+        
+        Returns:
+            Tuple (éxito, mensaje)
+        """
+        if self.modelo.eliminar_instantanea(nombre):
+            return True, f"Instantánea '{nombre}' eliminada"
+        return False, f"No existe la instantánea '{nombre}'"
+    
+    # === DESHACER / REHACER ===
+    
+    def _operacion_registrada(self, detalles: Dict, mensaje: str) -> str:
+        """
+        Guarda el inverso del último asiento registrado y lo persiste
+        
+        Returns:
+            El mensaje de éxito (con el aviso de _persistir si falló la base)
+        """
+        if detalles.get('secuencia') is None:
+            return mensaje
+        
+        asiento = self.modelo.diario.ultimo
+        self._deshacer.append((asiento.tipo, invertir_movimientos(asiento.movimientos)))
+        self._rehacer.clear()
+        return self._persistir(mensaje)
+    
+    def _persistir(self, mensaje: str) -> str:
+        """
+        Envía a la base de datos (si hay) los cambios del modelo
+        
+        Se llama cuando la operación ya quedó en el modelo: un error de la
+        base no la deshace, solo se agrega como aviso al mensaje de éxito.
+        
+        Returns:
+            El mensaje, con el aviso si no se pudo guardar
+        """
+        if self.base_datos is not None:
+            try:
+                self.base_datos.sincronizar(self.modelo)
+            except Exception as e:
+                return f"{mensaje} (aviso: no se guardó en la base de datos: {e})"
+        return mensaje
+    
+    def _limpiar_historial(self):
+        """Descarta las pilas de deshacer y rehacer"""
+        self._deshacer.clear()
+        self._rehacer.clear()
+    
+    def _aplicar_paso(self, origen: Deque[PasoDeshacer], destino: Deque[PasoDeshacer],
+                      prefijo: str) -> Tuple[bool, Dict, str]:
+        """Aplica el paso más reciente de una pila y apila su inverso en la otra"""
+        if not origen:
+            return False, {}, f"No hay operaciones para {prefijo.lower()}"
+        
+        tipo, movimientos = origen[-1]
+        try:
+            detalles = self.modelo.aplicar_ajuste(f"{prefijo} {tipo}", movimientos)
+        except KeyError as e:
+            return False, {}, f"Cuenta no encontrada: {e}"
+        except Exception as e:
+            return False, {}, f"Error al {prefijo.lower()}: {e}"
+        
+        origen.pop()
+        destino.append((tipo, invertir_movimientos(movimientos)))
+        return True, detalles, self._persistir(f"{tipo}: {prefijo.lower()} realizado")
+    
+    def deshacer(self) -> Tuple[bool, Dict, str]:
+        """
+        Anula la última operación registrando su asiento inverso
+        
+        Returns:
+            Tuple (éxito, detalles, mensaje); detalles['cuentas'] lista las
+            (categoria, cuenta) modificadas
+        """
+        return self._aplicar_paso(self._deshacer, self._rehacer, 'DESHACER')
+    
+    def rehacer(self) -> Tuple[bool, Dict, str]:
+        """
+        Vuelve a aplicar la última operación deshecha
+        
+        Returns:
+            Tuple (éxito, detalles, mensaje)
+        """
+        return self._aplicar_paso(self._rehacer, self._deshacer, 'REHACER')
+    
+    def puede_deshacer(self) -> bool:
+        """Indica si hay operaciones para deshacer"""
+        return bool(self._deshacer)
+    
+    def puede_rehacer(self) -> bool:
+        """Indica si hay operaciones para rehacer"""
+        return bool(self._rehacer)
+    
     # === CÁLCULOS ===
     
     def calcular_totales(self) -> Dict[str, float]:
@@ -109,7 +368,8 @@ class BalanceController:
     
     def realizar_compra_efectivo(self, cuenta_pago: str, tipo_destino: str,
                                 cuenta_destino: str, total: float,
-                                forzar: bool = False) -> Tuple[bool, Dict, str]:
+                                forzar: bool = False,
+                                fecha: Optional[date] = None) -> Tuple[bool, Dict, str]:
         """
         Realiza una compra en efectivo
         
@@ -125,17 +385,19 @@ class BalanceController:
             
             # Realizar transacción
             detalles = self.modelo.compra_efectivo(cuenta_pago, tipo_destino, 
-                                                   cuenta_destino, total)
-            
-            return True, detalles, "Transacción realizada exitosamente"
+                                                   cuenta_destino, total, fecha)
             
         except KeyError as e:
             return False, {}, f"Cuenta no encontrada: {e}"
         except Exception as e:
             return False, {}, f"Error al realizar la transacción: {e}"
+        
+        return True, detalles, self._operacion_registrada(
+            detalles, "Transacción realizada exitosamente")
     
     def realizar_compra_credito(self, compras: List[Tuple[str, str, float]],
-                               tipo_pasivo: str, cuenta_pasivo: str) -> Tuple[bool, Dict, str]:
+                               tipo_pasivo: str, cuenta_pasivo: str,
+                               fecha: Optional[date] = None) -> Tuple[bool, Dict, str]:
         """
         Realiza una compra a crédito
         
@@ -147,20 +409,22 @@ class BalanceController:
                 return False, {}, "Debe agregar al menos un concepto"
             
             # Realizar transacción
-            detalles = self.modelo.compra_credito(compras, tipo_pasivo, cuenta_pasivo)
-            
-            return True, detalles, "Compra a crédito realizada exitosamente"
+            detalles = self.modelo.compra_credito(compras, tipo_pasivo, cuenta_pasivo, fecha)
             
         except KeyError as e:
             return False, {}, f"Cuenta no encontrada: {e}"
         except Exception as e:
             return False, {}, f"Error al realizar la transacción: {e}"
+        
+        return True, detalles, self._operacion_registrada(
+            detalles, "Compra a crédito realizada exitosamente")
     
     def realizar_compra_combinada(self, cuenta_pago: str, tipo_destino: str,
                                  cuenta_destino: str, tipo_pasivo: str,
                                  cuenta_pasivo: str, total: float,
                                  porcentaje_anticipo: float,
-                                 forzar: bool = False) -> Tuple[bool, Dict, str]:
+                                 forzar: bool = False,
+                                 fecha: Optional[date] = None) -> Tuple[bool, Dict, str]:
         """
         Realiza una compra combinada
         
@@ -179,18 +443,20 @@ class BalanceController:
             # Realizar transacción
             detalles = self.modelo.compra_combinada(
                 cuenta_pago, tipo_destino, cuenta_destino,
-                tipo_pasivo, cuenta_pasivo, total, porcentaje_anticipo
+                tipo_pasivo, cuenta_pasivo, total, porcentaje_anticipo, fecha
             )
             
-            return True, detalles, "Compra combinada realizada exitosamente"
-            
         except KeyError as e:
             return False, {}, f"Cuenta no encontrada: {e}"
         except Exception as e:
             return False, {}, f"Error al realizar la transacción: {e}"
+        
+        return True, detalles, self._operacion_registrada(
+            detalles, "Compra combinada realizada exitosamente")
     
     def realizar_anticipo_clientes(self, cuenta_recibe: str, total_venta: float,
-                                  porcentaje_anticipo: float) -> Tuple[bool, Dict, str]:
+                                  porcentaje_anticipo: float,
+                                  fecha: Optional[date] = None) -> Tuple[bool, Dict, str]:
         """
         Registra un anticipo de clientes
         
@@ -200,15 +466,193 @@ class BalanceController:
         try:
             # Realizar transacción
             detalles = self.modelo.anticipo_clientes(
-                cuenta_recibe, total_venta, porcentaje_anticipo
+                cuenta_recibe, total_venta, porcentaje_anticipo, fecha
             )
             
-            return True, detalles, "Anticipo de clientes registrado exitosamente"
-            
         except KeyError as e:
             return False, {}, f"Cuenta no encontrada: {e}"
         except Exception as e:
             return False, {}, f"Error al realizar la transacción: {e}"
+        
+        return True, detalles, self._operacion_registrada(
+            detalles, "Anticipo de clientes registrado exitosamente")
+    
+    def realizar_lote(self, tipo: str, columnas: Dict,
+                      forzar: bool = False,
+                      fecha: Optional[date] = None) -> Tuple[bool, Dict, str]:
+        """
+        Realiza un lote de transacciones del mismo tipo en una sola llamada
+        
+        Args:
+            tipo: Tipo de transacción del lote (p. ej. 'COMPRA CREDITO')
+            columnas: Arreglos columnares con los parámetros de cada operación
+            forzar: Si es True, no valida fondos de las cuentas de pago
+            fecha: Fecha del asiento del lote (hoy si no se indica)
+        
+        Returns:
+            Tuple (éxito, detalles, mensaje)
+        """
+        try:
+            from models.lotes import retiros_por_cuenta
+            
+            # Validar fondos con el retiro acumulado de cada cuenta de pago
+            if not forzar:
+                for cuenta, retiro in retiros_por_cuenta(tipo, columnas).items():
+                    tiene_fondos, msg_fondos = self.validar_fondos(cuenta, retiro)
+                    if not tiene_fondos:
+                        return False, {}, f"{cuenta}: {msg_fondos}"
+            
+            # Realizar transacción (un solo evento aunque cree cuentas)
+            with self.modelo.eventos.agrupados():
+                detalles = self.modelo.aplicar_lote(tipo, columnas, fecha)
+            if detalles['secuencia'] is None:
+                return True, detalles, "El lote no tiene operaciones"
+            
+        except KeyError as e:
+            return False, {}, f"Cuenta no encontrada: {e}"
+        except Exception as e:
+            return False, {}, f"Error al realizar el lote: {e}"
+        
+        return True, detalles, self._operacion_registrada(
+            detalles, f"Lote de {detalles['operaciones']} operaciones realizado exitosamente")
+    
+    # === IMPORTACIÓN ===
+    
+    def importar_operaciones(self, ruta: str, formato: Optional[str] = None,
+                             tamano_bloque: int = 5000, forzar: bool = False,
+                             max_errores: int = 1000,
+                             progreso: Optional[Callable[[Dict], None]] = None) -> Tuple[bool, Dict, str]:
+        """
+        Importa operaciones desde un archivo CSV o JSONL sin cargarlo completo
+        
+        Los registros válidos de una misma fecha se agrupan por tipo y cada
+        bloque se registra con realizar_lote (al llenarse o al cambiar la
+        fecha). Si un bloque se rechaza (p. ej. fondos insuficientes), sus
+        registros se aplican uno a uno para reportar exactamente cuáles
+        fallan.
+        
+        Args:
+            ruta: Archivo a importar
+            formato: 'csv' o 'jsonl' (por omisión según la extensión)
+            tamano_bloque: Registros por lote
+            forzar: Si es True, no valida fondos
+            max_errores: Errores que se conservan en el detalle (se cuentan todos)
+            progreso: Se llama con el resumen parcial después de cada bloque;
+                      si lanza una excepción (p. ej. Tarea.avanzar al
+                      cancelar) la importación se detiene ahí y los bloques
+                      ya registrados se conservan
+        
+        Returns:
+            Tuple (éxito, detalles, mensaje); detalles incluye 'registros',
+            'importados', 'lotes', 'rechazados' y 'errores' (ErrorRegistro)
+        """
+        from models.importador import Bloque, ErrorRegistro, leer_registros, validar_registro
+        
+        estado = self.modelo.estado_actual
+        resumen = {'registros': 0, 'importados': 0, 'lotes': 0, 'rechazados': 0, 'errores': []}
+        
+        def existe_cuenta(categoria: str, cuenta: str) -> bool:
+            return categoria in estado and cuenta in estado[categoria]
+        
+        def rechazar(linea: int, mensaje: str):
+            resumen['rechazados'] += 1
+            if len(resumen['errores']) < max_errores:
+                resumen['errores'].append(ErrorRegistro(linea, mensaje))
+        
+        def aplicar(bloque: Bloque):
+            exito, _, _ = self.realizar_lote(bloque.tipo, bloque.columnas, forzar, bloque.fecha)
+            if exito:
+                resumen['importados'] += len(bloque)
+                resumen['lotes'] += 1
+            else:
+                for linea, registro in zip(bloque.lineas, bloque.registros):
+                    exito, _, mensaje = self.realizar_operacion(bloque.tipo, registro,
+                                                                forzar, bloque.fecha)
+                    if exito:
+                        resumen['importados'] += 1
+                    else:
+                        rechazar(linea, mensaje)
+            
+            if progreso is not None:
+                progreso(resumen)
+        
+        bloques: Dict[str, Bloque] = {}
+        fecha_bloques = None
+        ultima_fecha = self.modelo.diario.ultimo.fecha if self.modelo.diario.ultimo else None
+        
+        try:
+            for linea, registro, error in leer_registros(ruta, formato):
+                resumen['registros'] += 1
+                if error:
+                    rechazar(linea, error)
+                    continue
+                
+                try:
+                    tipo, parametros, fecha = validar_registro(registro, existe_cuenta)
+                except ValueError as e:
+                    rechazar(linea, str(e))
+                    continue
+                
+                if fecha is not None:
+                    if ultima_fecha is not None and fecha < ultima_fecha:
+                        rechazar(linea, f"Fecha {fecha.isoformat()} anterior a "
+                                        f"{ultima_fecha.isoformat()}")
+                        continue
+                    ultima_fecha = fecha
+                
+                if fecha != fecha_bloques:
+                    for bloque in bloques.values():
+                        aplicar(bloque)
+                    bloques = {}
+                    fecha_bloques = fecha
+                
+                bloque = bloques.get(tipo)
+                if bloque is None:
+                    bloque = bloques[tipo] = Bloque(tipo, fecha)
+                bloque.agregar(linea, parametros)
+                
+                if len(bloque) >= tamano_bloque:
+                    aplicar(bloques.pop(tipo))
+            
+            for bloque in bloques.values():
+                aplicar(bloque)
+        except (OSError, ValueError) as e:
+            return False, resumen, f"Error al leer '{ruta}': {e}"
+        
+        mensaje = (f"{resumen['importados']:,} de {resumen['registros']:,} operaciones "
+                   f"importadas en {resumen['lotes']:,} lotes")
+        if resumen['rechazados']:
+            mensaje += f"; {resumen['rechazados']:,} rechazadas"
+        return resumen['rechazados'] == 0, resumen, mensaje
+    
+    def realizar_operacion(self, tipo: str, registro: Dict, forzar: bool = False,
+                           fecha: Optional[date] = None) -> Tuple[bool, Dict, str]:
+        """
+        Realiza una transacción individual a partir de sus parámetros por nombre
+        
+        Args:
+            tipo: Tipo de transacción (ver models.operaciones.COLUMNAS_LOTE)
+            registro: Parámetros validados con models.importador.validar_registro
+        
+        Returns:
+            Tuple (éxito, detalles, mensaje)
+        """
+        if tipo == 'COMPRA EFECTIVO':
+            return self.realizar_compra_efectivo(
+                registro['cuenta_pago'], registro['tipo_destino'],
+                registro['cuenta_destino'], registro['total'], forzar, fecha)
+        if tipo == 'COMPRA CREDITO':
+            return self.realizar_compra_credito(
+                [(registro['tipo_activo'], registro['cuenta'], registro['total'])],
+                registro['tipo_pasivo'], registro['cuenta_pasivo'], fecha)
+        if tipo == 'COMPRA COMBINADA':
+            return self.realizar_compra_combinada(
+                registro['cuenta_pago'], registro['tipo_destino'], registro['cuenta_destino'],
+                registro['tipo_pasivo'], registro['cuenta_pasivo'], registro['total'],
+                registro['porcentaje_anticipo'], forzar, fecha)
+        return self.realizar_anticipo_clientes(
+            registro['cuenta_recibe'], registro['total_venta'],
+            registro['porcentaje_anticipo'], fecha)
     
     def reiniciar_sistema(self) -> Tuple[bool, str]:
         """
@@ -219,12 +663,168 @@ class BalanceController:
         """
         try:
             self.modelo.reiniciar()
-            return True, "Sistema reiniciado al estado inicial"
         except Exception as e:
             return False, f"Error al reiniciar: {e}"
+        
+        self._limpiar_historial()
+        return True, self._persistir("Sistema reiniciado al estado inicial")
+    
+    # === SIMULACIÓN ===
+    
+    def simular_escenarios(self, escenarios: Iterable, procesos: Optional[int] = None,
+                           forzar: bool = False) -> Tuple[bool, Dict, str]:
+        """
+        Simula escenarios hipotéticos sobre el estado actual sin modificarlo
+        
+        Args:
+            escenarios: models.simulacion.Escenario (p. ej. generados con
+                        escenarios_anticipo o escenarios_montecarlo)
+            procesos: Procesos del pool (por omisión uno por núcleo)
+            forzar: Aplica las operaciones aunque no haya fondos
+        
+        Returns:
+            Tuple (éxito, resultado, mensaje)
+        """
+        from models.simulacion import simular
+        
+        try:
+            resultado = simular(self.modelo, escenarios, procesos, forzar)
+        except Exception as e:
+            return False, {}, f"Error al simular: {e}"
+        
+        resumen = resultado['resumen']['balance_cuadra']
+        return True, resultado, (
+            f"{len(resultado['escenarios']):,} escenarios simulados; "
+            f"{resumen['si']:,} cuadran"
+        )
+    
+    # === INSTRUMENTACIÓN ===
+    
+    def activar_instrumentacion(self, muestras: Optional[int] = None):
+        """
+        Empieza a medir llamadas, tiempos y asientos del controlador y del
+        modelo (si ya estaba activa la retorna sin reiniciarla)
+        
+        Returns:
+            Instrumentacion con las métricas acumuladas
+        """
+        from utils.instrumentacion import MUESTRAS_POR_METODO, Instrumentacion
+        
+        if self.instrumentacion is None:
+            self.instrumentacion = Instrumentacion(muestras or MUESTRAS_POR_METODO)
+            self.instrumentacion.instrumentar_controlador(self)
+        return self.instrumentacion
+    
+    def desactivar_instrumentacion(self):
+        """
+        Deja de medir (sin costo desde aquí)
+        
+        Returns:
+            La Instrumentacion con las métricas hasta ahora, o None
+        """
+        instrumentacion, self.instrumentacion = self.instrumentacion, None
+        if instrumentacion is not None:
+            instrumentacion.quitar()
+        return instrumentacion
+    
+    def metricas(self, formato: str = 'json') -> Optional[str]:
+        """
+        Métricas acumuladas en 'json' o 'prometheus' (None si la
+        instrumentación está desactivada)
+        """
+        if self.instrumentacion is None:
+            return None
+        if formato == 'prometheus':
+            return self.instrumentacion.a_prometheus()
+        if formato == 'json':
+            return self.instrumentacion.a_json()
+        raise ValueError(f"Formato desconocido: {formato}")
+    
+    def perfilar(self, cpu: bool = True, memoria: bool = False):
+        """
+        Context manager que captura cProfile/tracemalloc alrededor de un
+        bloque (ver utils.instrumentacion.perfilar)
+        """
+        from utils.instrumentacion import perfilar
+        return perfilar(cpu, memoria)
     
     # === EXPORTACIÓN ===
     
+    def confirmar(self):
+        """Escribe ya en la base de datos (si hay) los cambios pendientes"""
+        if self.base_datos is not None:
+            self.base_datos.sincronizar(self.modelo)
+            self.base_datos.confirmar(self.modelo)
+    
+    def confirmar_vencido(self) -> bool:
+        """
+        Escribe en la base de datos lo pendiente si ya pasó su plazo
+        
+        Las escrituras solo revisan el plazo al llegar la siguiente; la
+        interfaz llama a este método periódicamente para que una sesión
+        inactiva no deje asientos sin guardar.
+        
+        Returns:
+            True si escribió algo
+        """
+        if self.base_datos is None:
+            return False
+        return self.base_datos.confirmar_vencido(self.modelo)
+    
+    def cerrar(self):
+        """Escribe los cambios pendientes y cierra la base de datos"""
+        if self.base_datos is not None:
+            self.base_datos.cerrar(self.modelo)
+            self.base_datos = None
+    
+    def guardar_estado(self, ruta: str) -> Tuple[bool, str]:
+        """
+        Guarda el catálogo y el libro diario en un archivo JSON
+        
+        Returns:
+            Tuple (éxito, mensaje)
+        """
+        from models.persistencia import guardar_json
+        
+        try:
+            guardar_json(self.modelo, ruta)
+            return True, f"Estado guardado en '{ruta}'"
+        except OSError as e:
+            return False, f"Error al guardar: {e}"
+    
+    def cargar_estado(self, ruta: str) -> Tuple[bool, str]:
+        """
+        Carga un archivo guardado con guardar_estado
+        
+        El archivo se carga en un modelo nuevo, de modo que un error no
+        deja a medias el modelo en uso.
+        
+        Returns:
+            Tuple (éxito, mensaje)
+        """
+        from models.persistencia import cargar_json
+        
+        modelo = BalanceModel(depurar_totales=self.modelo.depurar_totales,
+                              almacenamiento=self.modelo.almacenamiento,
+                              puntos_control_cada=self.modelo.puntos_control.cada_asientos)
+        try:
+            cargar_json(modelo, ruta)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return False, f"Error al cargar '{ruta}': {e}"
+        
+        # Los suscriptores siguen en el bus del modelo nuevo
+        modelo.eventos = self.modelo.eventos
+        self.modelo = modelo
+        self._limpiar_historial()
+        mensaje = f"Estado cargado desde '{ruta}' ({len(modelo.diario):,} asientos)"
+        if self.base_datos is not None:
+            try:
+                self.base_datos.guardar_todo(modelo)
+            except Exception as e:
+                mensaje += f" (aviso: no se guardó en la base de datos: {e})"
+        modelo.notificar_reemplazo()
+        return True, mensaje
+    
     def exportar_estado_completo(self) -> Dict:
         """Exporta el estado completo del sistema"""
         return self.modelo.exportar_estado()
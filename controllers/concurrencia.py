@@ -0,0 +1,361 @@
+"""
+controllers/concurrencia.py
+Controlador para usar desde varios hilos
+
+BalanceControllerConcurrente serializa las escrituras con un candado de
+lectura/escritura y lleva un contador de versión del estado. Después de
+cada escritura las lecturas frecuentes (totales, estado, catálogo,
+niveles de subcuentas) se sirven de una publicación: instantánea con
+escritura diferida del estado de una versión, que ya no cambia. Leerla no
+toma ningún candado, así los hilos de reportes (y la interfaz mientras
+una tarea escribe) no esperan a los escritores y nunca ven una operación
+aplicada a medias.
+"""
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from controllers.balance_controller import BalanceController
+from models.almacenamiento import instantaneas_separadas
+from models.balance_model import BalanceModel
+
+
+class CandadoLecturaEscritura:
+    """
+    Candado de varios lectores o un escritor, con preferencia al escritor
+
+    Es reentrante: el hilo que escribe puede volver a escribir o leer, y
+    el que lee puede volver a leer aunque haya escritores esperando. Pasar
+    de lectura a escritura no está permitido (se bloquearía).
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritores_esperando = 0
+        self._escritor: Optional[int] = None
+        self._profundidad = 0
+        self._local = threading.local()
+
+    def es_escritor(self) -> bool:
+        """Indica si el hilo actual tiene el candado de escritura"""
+        return self._escritor == threading.get_ident()
+
+    @contextmanager
+    def lectura(self, esperar: bool = True) -> Iterator[bool]:
+        """
+        Candado compartido
+
+        Con esperar=False no se bloquea: produce False si hay un escritor
+        activo o esperando (y entonces no se tomó el candado).
+        """
+        lecturas = getattr(self._local, 'lecturas', 0)
+        if self.es_escritor() or lecturas:
+            self._local.lecturas = lecturas + 1
+            try:
+                yield True
+            finally:
+                self._local.lecturas -= 1
+            return
+
+        with self._condicion:
+            libre = self._escritor is None and not self._escritores_esperando
+            if not libre and esperar:
+                self._condicion.wait_for(
+                    lambda: self._escritor is None and not self._escritores_esperando
+                )
+                libre = True
+            if libre:
+                self._lectores += 1
+
+        if not libre:
+            yield False
+            return
+
+        self._local.lecturas = 1
+        try:
+            yield True
+        finally:
+            self._local.lecturas = 0
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    @contextmanager
+    def escritura(self) -> Iterator[bool]:
+        """
+        Candado exclusivo
+
+        Produce True en la escritura exterior y False si el hilo ya tenía
+        el candado.
+        """
+        if self.es_escritor():
+            self._profundidad += 1
+            try:
+                yield False
+            finally:
+                self._profundidad -= 1
+            return
+
+        if getattr(self._local, 'lecturas', 0):
+            raise RuntimeError("No se puede escribir mientras se tiene el candado de lectura")
+
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                self._condicion.wait_for(lambda: self._escritor is None and not self._lectores)
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = threading.get_ident()
+            self._profundidad = 1
+
+        try:
+            yield True
+        finally:
+            with self._condicion:
+                self._profundidad = 0
+                self._escritor = None
+                self._condicion.notify_all()
+
+
+class Publicacion(NamedTuple):
+    """Estado de una versión (no cambia: las escrituras copian lo que tocan)"""
+    version: int
+    estado: Any
+    subtotales: Dict[str, float]
+    catalogo: Any
+    versiones_cuentas: Dict[str, int]
+    niveles: Dict[Tuple[str, str], Any]
+
+
+# Métodos que modifican el modelo, el historial o la base de datos
+METODOS_ESCRITURA = (
+    'agregar_cuenta', 'modificar_cuenta', 'eliminar_cuenta',
+    'tomar_instantanea', 'restaurar_instantanea', 'eliminar_instantanea',
+    'deshacer', 'rehacer',
+    'realizar_compra_efectivo', 'realizar_compra_credito', 'realizar_compra_combinada',
+    'realizar_anticipo_clientes', 'realizar_lote', 'realizar_operacion',
+    'importar_operaciones', 'reiniciar_sistema', 'cargar_estado',
+    'confirmar', 'cerrar',
+)
+
+# Lecturas que recorren el modelo vivo (diario, instantáneas, índice de
+# búsqueda, árbol de subcuentas): toman el candado compartido en lugar de
+# usar la publicación. El índice y el árbol ya están creados (los crea el
+# escritor), así los lectores simultáneos no los modifican
+METODOS_LECTURA = (
+    'reconstruir_estado', 'balance_al', 'listar_instantaneas',
+    'buscar_cuentas', 'ubicar_cuenta', 'obtener_subcuentas',
+    'simular_escenarios', 'guardar_estado', 'exportar_estado_completo',
+)
+
+# Escriben en la base de datos sin cambiar el modelo: toman el candado
+# exclusivo pero no cambian la versión, así la interfaz puede llamarlos
+# periódicamente sin invalidar la publicación
+METODOS_MANTENIMIENTO = ('confirmar_vencido',)
+
+
+def _con_escritura(metodo: Callable) -> Callable:
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado.escritura() as exterior:
+            try:
+                return metodo(self, *args, **kwargs)
+            finally:
+                if exterior:
+                    self._escritura_terminada()
+    return envoltura
+
+
+def _con_exclusivo(metodo: Callable) -> Callable:
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado.escritura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _con_lectura(metodo: Callable) -> Callable:
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+class BalanceControllerConcurrente(BalanceController):
+    """
+    BalanceController que se puede compartir entre hilos
+
+    Cada método que escribe toma el candado exclusivo e incrementa
+    `version` al terminar (aunque la operación se rechace). Las lecturas
+    de totales, estado, catálogo, cuentas y niveles usan la publicación sin
+    bloquearse; si hay una escritura en curso obtienen la versión anterior,
+    que es consistente, y el escritor publica la nueva al terminar.
+
+    Para el patrón optimista (leer, calcular, escribir si nada cambió) se
+    lee la versión con obtener_publicacion() y se escribe con
+    aplicar_si_version().
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._candado = CandadoLecturaEscritura()
+        self._mutex_publicacion = threading.Lock()
+        self._publicacion_pedida = False
+        self.version = 0
+        super().__init__(*args, **kwargs)
+        self.modelo.preparar_indices()
+        self._publicada = self._publicar()
+
+    # === PUBLICACIÓN ===
+
+    def _publicar(self) -> Publicacion:
+        """Instantánea del estado vivo (con el candado tomado)"""
+        modelo = self.modelo
+
+        # Con índice de cuentas propio: las altas y bajas posteriores no
+        # cambian las cuentas que recorre un lector de esta versión
+        estado, catalogo = instantaneas_separadas(modelo.estado_actual, modelo.catalogo)
+        return Publicacion(self.version, estado, dict(modelo._subtotales), catalogo,
+                           dict(modelo.versiones_cuentas), modelo.arbol.totales())
+
+    def _escritura_terminada(self):
+        # Aún con el candado exclusivo: el modelo pudo cambiar (cargar_estado)
+        # o descartar sus índices (reiniciar)
+        self.modelo.preparar_indices()
+        self.version += 1
+        if self._publicacion_pedida:
+            self._publicacion_pedida = False
+            self._publicada = self._publicar()
+
+    def obtener_publicacion(self) -> Publicacion:
+        """
+        Estado publicado más reciente (sin bloquearse)
+
+        Si la publicación quedó atrás y no hay escritores se publica la
+        versión vigente; si hay un escritor se retorna la anterior y se le
+        pide publicar al terminar.
+        """
+        publicada = self._publicada
+        if publicada.version == self.version:
+            return publicada
+
+        with self._candado.lectura(esperar=False) as adquirido:
+            if adquirido:
+                with self._mutex_publicacion:
+                    if self._publicada.version != self.version:
+                        self._publicada = self._publicar()
+                    return self._publicada
+
+        self._publicacion_pedida = True
+        return publicada
+
+    def aplicar_si_version(self, version: int,
+                           operacion: Callable[[BalanceController], Tuple]) -> Optional[Tuple]:
+        """
+        Escritura optimista: ejecuta operacion(self) solo si el estado sigue
+        en la versión dada
+
+        Returns:
+            Lo que retorne la operación, o None si la versión cambió (el
+            llamador vuelve a leer y reintenta)
+        """
+        with self._candado.escritura() as exterior:
+            if self.version != version:
+                return None
+            try:
+                return operacion(self)
+            finally:
+                if exterior:
+                    self._escritura_terminada()
+
+    # === LECTURAS SIN CANDADO ===
+
+    def obtener_cuentas(self, categoria: str) -> Tuple[str, ...]:
+        """Obtiene las cuentas de una categoría (en el orden del catálogo)"""
+        if self._candado.es_escritor():
+            return super().obtener_cuentas(categoria)
+        publicacion = self.obtener_publicacion()
+        return self._lista_cuentas(categoria, publicacion.versiones_cuentas[categoria],
+                                   publicacion.catalogo)
+
+    def obtener_catalogo_completo(self) -> Dict:
+        """Obtiene el catálogo completo"""
+        if self._candado.es_escritor():
+            return super().obtener_catalogo_completo()
+        return self.obtener_publicacion().catalogo
+
+    def obtener_estado_actual(self) -> Dict:
+        """Obtiene el estado actual de todas las cuentas"""
+        if self._candado.es_escritor():
+            return super().obtener_estado_actual()
+        return self.obtener_publicacion().estado
+
+    def calcular_totales(self) -> Dict[str, float]:
+        """Calcula los totales del balance"""
+        if self._candado.es_escritor():
+            return super().calcular_totales()
+        publicacion = self.obtener_publicacion()
+        return BalanceModel._totales(publicacion.subtotales, publicacion.estado)
+
+    def verificar_balance_cuadrado(self) -> Tuple[bool, float]:
+        """
+        Verifica si el balance está cuadrado
+
+        Returns:
+            Tuple (cuadra, diferencia)
+        """
+        totales = self.calcular_totales()
+        return totales['balance_cuadra'], totales['diferencia']
+
+    def total_cuenta(self, categoria: str, ruta: Optional[str] = None) -> float:
+        """
+        Saldo de una cuenta o total de un nivel de subcuentas (sin ruta,
+        el de la categoría)
+
+        Raises:
+            KeyError: Si la ruta no existe en la categoría
+        """
+        if self._candado.es_escritor():
+            return super().total_cuenta(categoria, ruta)
+
+        publicacion = self.obtener_publicacion()
+        estado = publicacion.estado
+        if ruta is None:
+            return estado.de_unidad(publicacion.subtotales[categoria])
+        total = publicacion.niveles.get((categoria, ruta))
+        if total is None:
+            return estado[categoria][ruta]
+        return estado.de_unidad(total)
+
+    def validar_fondos(self, cuenta: str, monto: float) -> Tuple[bool, str]:
+        """
+        Valida si una cuenta tiene fondos suficientes
+
+        Dentro de una escritura se valida contra el estado vivo.
+
+        Returns:
+            Tuple (tiene_fondos, mensaje)
+        """
+        if self._candado.es_escritor():
+            return super().validar_fondos(cuenta, monto)
+
+        fondos = self.obtener_publicacion().estado['ACTIVO_CIRCULANTE'][cuenta]
+        if fondos >= monto:
+            return True, "Fondos suficientes"
+        return False, f"Fondos insuficientes. Faltan: ${monto - fondos:,.2f}"
+
+
+for _nombre in METODOS_ESCRITURA:
+    setattr(BalanceControllerConcurrente, _nombre,
+            _con_escritura(getattr(BalanceController, _nombre)))
+for _nombre in METODOS_MANTENIMIENTO:
+    setattr(BalanceControllerConcurrente, _nombre,
+            _con_exclusivo(getattr(BalanceController, _nombre)))
+for _nombre in METODOS_LECTURA:
+    setattr(BalanceControllerConcurrente, _nombre,
+            _con_lectura(getattr(BalanceController, _nombre)))
+del _nombre
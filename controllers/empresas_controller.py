@@ -0,0 +1,142 @@
+"""
+controllers/empresas_controller.py
+Registro de varias empresas - Un BalanceController por empresa y su consolidación
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from controllers.balance_controller import BalanceController
+
+
+class RegistroEmpresas:
+    """Empresas con nombre, cada una con su propio controlador y modelo"""
+    
+    def __init__(self, almacenamiento: str = 'diccionario',
+                 depurar_totales: bool = False,
+                 puntos_control_cada: int = 1000,
+                 limite_deshacer: int = 100):
+        self.almacenamiento = almacenamiento
+        self._opciones = {
+            'almacenamiento': almacenamiento,
+            'depurar_totales': depurar_totales,
+            'puntos_control_cada': puntos_control_cada,
+            'limite_deshacer': limite_deshacer
+        }
+        
+        # Nombre -> controlador (en orden de alta)
+        self._empresas: Dict[str, BalanceController] = {}
+    
+    # === REGISTRO ===
+    
+    def agregar_empresa(self, nombre: str,
+                        base_datos: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Da de alta una empresa con el catálogo inicial
+        
+        Args:
+            nombre: Nombre de la empresa
+            base_datos: Base SQLite o libro binario propio de la empresa
+        
+        Returns:
+            Tuple (éxito, mensaje)
+        """
+        nombre = nombre.strip()
+        if not nombre:
+            return False, "El nombre de la empresa no puede estar vacío"
+        if nombre in self._empresas:
+            return False, f"La empresa '{nombre}' ya existe"
+        
+        try:
+            self._empresas[nombre] = BalanceController(base_datos=base_datos,
+                                                       **self._opciones)
+            return True, f"Empresa '{nombre}' agregada"
+        except Exception as e:
+            return False, f"Error al agregar la empresa: {e}"
+    
+    def eliminar_empresa(self, nombre: str) -> Tuple[bool, str]:
+        """Da de baja una empresa (escribe lo pendiente de su base)"""
+        controller = self._empresas.pop(nombre, None)
+        if controller is None:
+            return False, f"La empresa '{nombre}' no existe"
+        
+        controller.cerrar()
+        return True, f"Empresa '{nombre}' eliminada"
+    
+    def obtener_empresa(self, nombre: str) -> BalanceController:
+        """
+        Controlador de una empresa
+        
+        Raises:
+            KeyError: Si la empresa no existe
+        """
+        if nombre not in self._empresas:
+            raise KeyError(f"La empresa '{nombre}' no existe")
+        return self._empresas[nombre]
+    
+    def obtener_nombres(self) -> List[str]:
+        """Nombres de las empresas en orden de alta"""
+        return list(self._empresas)
+    
+    def __len__(self) -> int:
+        return len(self._empresas)
+    
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self._empresas
+    
+    # === CONSOLIDACIÓN ===
+    
+    def consolidar(self, eliminaciones: Iterable = (),
+                   procesos: Optional[int] = None,
+                   nombres: Optional[Iterable[str]] = None) -> Tuple[bool, Dict, str]:
+        """
+        Balance general consolidado
+        
+        Los totales de cada empresa y la suma de cuentas iguales se calculan
+        en un pool de procesos (ver models/consolidacion.py). Si se usa el
+        pool, las empresas con base de datos la confirman y se envían por
+        ruta: cada proceso lee sus saldos en lugar de recibirlos copiados.
+        
+        Args:
+            eliminaciones: models.consolidacion.Eliminacion entre compañías
+            procesos: Procesos del pool (por omisión uno por núcleo)
+            nombres: Empresas a consolidar (por omisión todas)
+        
+        Returns:
+            Tuple (éxito, resultado, mensaje)
+        """
+        from models.consolidacion import consolidar, procesos_para
+        
+        nombres = list(self._empresas) if nombres is None else list(nombres)
+        faltantes = [n for n in nombres if n not in self._empresas]
+        if faltantes:
+            return False, {}, f"Empresas no encontradas: {', '.join(faltantes)}"
+        if not nombres:
+            return False, {}, "No hay empresas para consolidar"
+        
+        try:
+            en_pool = procesos_para(len(nombres), procesos) > 1
+            estados = {}
+            for nombre in nombres:
+                controller = self._empresas[nombre]
+                if en_pool and controller.base_datos is not None:
+                    controller.confirmar()
+                    estados[nombre] = controller.base_datos.ruta
+                else:
+                    estados[nombre] = {
+                        categoria: dict(cuentas)
+                        for categoria, cuentas in controller.obtener_estado_actual().items()
+                    }
+            
+            resultado = consolidar(estados, self.almacenamiento, eliminaciones, procesos)
+        except KeyError as e:
+            return False, {}, str(e.args[0])
+        except Exception as e:
+            return False, {}, f"Error al consolidar: {e}"
+        
+        mensaje = (f"{resultado['empresas']} empresas consolidadas, "
+                   f"{len(resultado['eliminaciones'])} eliminaciones")
+        return True, resultado, mensaje
+    
+    def cerrar(self):
+        """Cierra las bases de todas las empresas"""
+        for controller in self._empresas.values():
+            controller.cerrar()
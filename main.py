@@ -11,11 +11,18 @@ import os
 # Agregar el directorio actual al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from controllers.balance_controller import BalanceController
+from controllers.concurrencia import BalanceControllerConcurrente
 from views.balance_view import BalanceView
 from views.components.base_components import BotonAccion
 from utils.helpers import COLORES
 
+# Cada cuánto se entregan a las vistas los cambios del modelo (combinados)
+INTERVALO_EVENTOS_MS = 50
+
+# Cada cuánto se escriben en la base de datos los asientos que esperan su
+# plazo aunque no lleguen más
+INTERVALO_CONFIRMAR_MS = 1000
+
 
 class BalanceApp:
     """Aplicación principal del Sistema de Balance General"""
@@ -25,14 +32,26 @@ class BalanceApp:
         self.root.title("Sistema de Balance General - LAVA TECH S.A de C.V")
         self.root.geometry("1400x900")
         
-        # Inicializar controlador
-        self.controller = BalanceController()
+        # Inicializar controlador (con BALANCE_BD=archivo.sqlite el estado
+        # se guarda y se recupera al volver a abrir). Es el concurrente
+        # porque el trabajo pesado corre en un hilo aparte
+        self.controller = BalanceControllerConcurrente(base_datos=os.environ.get('BALANCE_BD'))
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self._trabajando = False
+        
+        # Los cambios del modelo se acumulan y se entregan desde el ciclo de
+        # Tk: una ráfaga de asientos produce un solo redibujado
+        self.controller.eventos.diferido = True
         
         # Configurar interfaz
         self.setup_ui()
+        self.balance_view.conectar(self.controller.eventos,
+                                   self.controller.obtener_estado_actual)
         
         # Mostrar balance inicial
         self.mostrar_balance_inicial()
+        self._atender_eventos()
+        self._confirmar_pendientes()
     
     def setup_ui(self):
         """Configura la interfaz principal"""
@@ -54,7 +73,12 @@ class BalanceApp:
         self.balance_frame.pack(fill=tk.BOTH, expand=True)
         
         # Crear vista del balance
-        self.balance_view = BalanceView(self.balance_frame)
+        self.balance_view = BalanceView(self.balance_frame,
+                                        total_cuenta=self.controller.total_cuenta)
+        
+        # Atajos de deshacer/rehacer
+        self.root.bind('<Control-z>', lambda e: self.deshacer())
+        self.root.bind('<Control-y>', lambda e: self.rehacer())
     
     def _crear_titulo(self, parent):
         """Crea el título de la aplicación"""
@@ -100,6 +124,9 @@ class BalanceApp:
             ("📋 Ver Catálogo", self.mostrar_catalogo, 'dark'),
             ("✏️ Editar Catálogo", self.editar_catalogo, 'info'),
             ("➕ Nueva Cuenta", self.agregar_cuenta, 'dark'),
+            ("📥 Importar", self.importar_operaciones, 'success'),
+            ("↶ Deshacer", self.deshacer, 'primary'),
+            ("↷ Rehacer", self.rehacer, 'primary'),
             ("🔄 Reiniciar", self.reiniciar, 'danger')
         ]
         
@@ -108,9 +135,21 @@ class BalanceApp:
                           bg=COLORES[color], fg='white', font=('Arial', 9, 'bold'),
                           padx=8, pady=5, cursor='hand2')
             btn.pack(side=tk.LEFT, padx=2)
+        
+        # Nivel de subcuentas a mostrar ('BANCO/BBVA/...')
+        tk.Label(admin_frame, text="Detalle:",
+                font=('Arial', 10, 'bold')).pack(side=tk.LEFT, padx=(10, 2))
+        self.nivel_var = tk.StringVar(value='Todo')
+        tk.OptionMenu(admin_frame, self.nivel_var, 'Todo', '1', '2', '3',
+                      command=self.cambiar_nivel).pack(side=tk.LEFT)
     
     # === MÉTODOS DE VISUALIZACIÓN ===
     
+    def cambiar_nivel(self, valor: str):
+        """Agrupa las subcuentas del balance al nivel elegido"""
+        self.balance_view.nivel = None if valor == 'Todo' else int(valor)
+        self.mostrar_balance_inicial()
+    
     def mostrar_balance_inicial(self):
         """Muestra el balance general inicial"""
         estado = self.controller.obtener_estado_actual()
@@ -123,21 +162,55 @@ class BalanceApp:
             None
         )
     
+    def _atender_eventos(self):
+        """Entrega los cambios pendientes del modelo y se vuelve a programar"""
+        self.controller.eventos.despachar()
+        self.root.after(INTERVALO_EVENTOS_MS, self._atender_eventos)
+    
+    def _confirmar_pendientes(self):
+        """
+        Guarda los asientos cuyo plazo ya pasó y se vuelve a programar
+        
+        Mientras corre una tarea en segundo plano no se llama: esperaría el
+        candado y bloquearía la interfaz (la tarea guarda al escribir).
+        """
+        if not self._trabajando:
+            self.controller.confirmar_vencido()
+        self.root.after(INTERVALO_CONFIRMAR_MS, self._confirmar_pendientes)
+    
+    def _mostrar_cambios(self, titulo: str = "BALANCE GENERAL",
+                         descripcion: str = None, desglose: dict = None):
+        """
+        Aplica ya los cambios pendientes (solo las cuentas que tocaron) y
+        actualiza el encabezado
+        """
+        self.controller.eventos.despachar()
+        self.balance_view.mostrar_encabezado(titulo, descripcion, desglose)
+    
+    def _en_segundo_plano(self, titulo: str, funcion, describir=None,
+                          cancelable: bool = True):
+        """
+        Ejecuta trabajo del controlador en un hilo mientras la ventana sigue
+        respondiendo (con un diálogo de avance si tarda más de un cuadro)
+        
+        Returns:
+            La Tarea terminada
+        """
+        from views.dialogs.tarea_dialogs import ejecutar_en_segundo_plano
+        
+        self._trabajando = True
+        try:
+            return ejecutar_en_segundo_plano(self.root, titulo, funcion, describir,
+                                             cancelable, self.controller.eventos)
+        finally:
+            self._trabajando = False
+    
     def mostrar_balance_con_transaccion(self, detalles: dict):
         """Muestra el balance después de una transacción"""
-        estado = self.controller.obtener_estado_actual()
-        totales = self.controller.calcular_totales()
-        
         tipo = detalles.get('tipo', '')
         descripcion = self._generar_descripcion_transaccion(detalles)
         
-        self.balance_view.mostrar_balance(
-            estado,
-            totales,
-            f"BALANCE GENERAL - {tipo}",
-            descripcion,
-            detalles
-        )
+        self._mostrar_cambios(f"BALANCE GENERAL - {tipo}", descripcion, detalles)
     
     def _generar_descripcion_transaccion(self, detalles: dict) -> str:
         """Genera descripción de la transacción"""
@@ -233,7 +306,7 @@ class BalanceApp:
         
         # Actualizar vista si hubo cambios
         if dialog.cambios_realizados:
-            self.mostrar_balance_inicial()
+            self._mostrar_cambios()
     
     def agregar_cuenta(self):
         """Abre diálogo para agregar cuenta"""
@@ -243,16 +316,93 @@ class BalanceApp:
         self.root.wait_window(dialog)
         
         if dialog.cuenta_agregada:
-            self.mostrar_balance_inicial()
+            self._mostrar_cambios()
+    
+    def importar_operaciones(self):
+        """Importa operaciones desde un archivo CSV o JSONL"""
+        from tkinter import filedialog
+        
+        ruta = filedialog.askopenfilename(
+            title="Importar operaciones",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl *.ndjson"),
+                       ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        tarea = self._en_segundo_plano(
+            "Importar operaciones",
+            lambda tarea: self.controller.importar_operaciones(
+                ruta, progreso=lambda resumen: tarea.avanzar(dict(resumen))
+            ),
+            lambda resumen: (f"{resumen['registros']:,} registros leídos, "
+                             f"{resumen['importados']:,} importados")
+        )
+        if tarea.cancelada:
+            importados = tarea.progreso['importados'] if tarea.progreso else 0
+            messagebox.showinfo("Importar", f"Importación cancelada; se conservan "
+                                            f"{importados:,} operaciones importadas")
+            if importados:
+                self._mostrar_cambios()
+            return
+        
+        exito, detalles, mensaje = tarea.resultado()
+        
+        errores = detalles.get('errores', [])
+        if errores:
+            mensaje += "\n\n" + "\n".join(
+                f"Línea {e.linea}: {e.mensaje}" for e in errores[:10]
+            )
+            if detalles['rechazados'] > 10:
+                mensaje += f"\n... y {detalles['rechazados'] - 10:,} más"
+        
+        if exito:
+            messagebox.showinfo("Importar", mensaje)
+        else:
+            messagebox.showwarning("Importar", mensaje)
+        
+        if detalles.get('importados'):
+            self._mostrar_cambios()
+    
+    # === DESHACER / REHACER ===
+    
+    def deshacer(self):
+        """Anula la última operación"""
+        self._aplicar_historial(*self.controller.deshacer())
+    
+    def rehacer(self):
+        """Vuelve a aplicar la última operación deshecha"""
+        self._aplicar_historial(*self.controller.rehacer())
+    
+    def _aplicar_historial(self, exito: bool, detalles: dict, mensaje: str):
+        """Redibuja solo las cuentas afectadas por un deshacer/rehacer"""
+        if not exito:
+            messagebox.showwarning("Historial", mensaje)
+            return
+        
+        self._mostrar_cambios("BALANCE GENERAL", mensaje)
+    
+    def cerrar(self):
+        """Guarda los cambios pendientes y cierra la aplicación"""
+        if self._trabajando:
+            messagebox.showwarning("Cerrar", "Espere a que termine (o cancele) la operación en curso")
+            return
+        self.controller.cerrar()
+        self.root.destroy()
     
     def reiniciar(self):
         """Reinicia el sistema"""
         if messagebox.askyesno("Confirmar", "¿Desea reiniciar el sistema al estado inicial?"):
-            exito, mensaje = self.controller.reiniciar_sistema()
+            tarea = self._en_segundo_plano(
+                "Reiniciar",
+                lambda tarea: self.controller.reiniciar_sistema(),
+                cancelable=False
+            )
+            exito, mensaje = tarea.resultado()
             
             if exito:
                 messagebox.showinfo("Reiniciar", mensaje)
-                self.mostrar_balance_inicial()
+                self._mostrar_cambios()
             else:
                 messagebox.showerror("Error", mensaje)
 
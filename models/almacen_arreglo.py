@@ -0,0 +1,256 @@
+"""
+models/almacen_arreglo.py
+Motor de almacenamiento en arreglo contiguo (NumPy)
+
+Cada cuenta ocupa un slot de IndiceCuentas y su saldo vive en un arreglo
+float64 (o int64 en centavos). Copiar un estado es copiar un bloque de
+memoria y sumar las categorías es una sola reducción vectorizada.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models.centavos import a_centavos, de_centavos
+from models.indice_cuentas import IndiceCuentas
+
+
+class CuentasArreglo(MutableMapping):
+    """Vista tipo diccionario de las cuentas de una categoría"""
+
+    def __init__(self, estado: 'EstadoArreglo', categoria: str):
+        self._estado = estado
+        self._categoria = categoria
+
+    @property
+    def _slots(self) -> Mapping[str, int]:
+        # El índice reemplaza el diccionario en cada alta o baja
+        return self._estado.indice.cuentas(self._categoria)
+
+    def __getitem__(self, nombre: str) -> float:
+        return self._estado.leer(self._slots[nombre])
+
+    def __setitem__(self, nombre: str, valor: float):
+        slot = self._slots.get(nombre)
+        if slot is None:
+            slot = self._estado.indice.agregar(self._categoria, nombre)
+        self._estado.escribir(slot, valor)
+
+    def __delitem__(self, nombre: str):
+        self._estado.indice.eliminar(self._categoria, nombre)
+
+    def __contains__(self, nombre) -> bool:
+        return nombre in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class EstadoArreglo(Mapping):
+    """
+    Estado con los saldos en un arreglo contiguo indexado por slot
+
+    Varios estados pueden compartir el mismo índice (catálogo, inicial y
+    actual): dar de alta o baja una cuenta en uno la afecta en todos, y
+    cada estado amplía su arreglo al leer o escribir un slot nuevo.
+    """
+
+    dtype = np.float64
+    tolerancia = 0.01
+
+    def __init__(self, indice: IndiceCuentas, saldos: Optional[np.ndarray] = None):
+        self.indice = indice
+        self._saldos = saldos if saldos is not None else np.zeros(len(indice), dtype=self.dtype)
+        self._vistas = {c: CuentasArreglo(self, c) for c in indice.categorias}
+        self._codigos = None
+        self._version_codigos = -1
+
+        # True si el arreglo de saldos se comparte con una instantánea
+        self._compartido = False
+
+        # En una instantánea, slots existentes al tomarla (los demás valen 0)
+        self._limite = None
+
+    @classmethod
+    def desde_dict(cls, catalogo: Dict[str, Dict[str, float]]) -> 'EstadoArreglo':
+        """Crea el índice y el arreglo a partir de un catálogo en diccionarios"""
+        indice = IndiceCuentas.desde_catalogo(catalogo)
+        valores = [valor for cuentas in catalogo.values() for valor in cuentas.values()]
+
+        estado = cls(indice, np.zeros(len(indice), dtype=cls.dtype))
+        estado._saldos[:] = [estado.a_unidad(v) for v in valores]
+        return estado
+
+    # === ACCESO POR SLOT ===
+
+    @staticmethod
+    def a_unidad(importe: float) -> float:
+        """Convierte un importe en pesos a la unidad del arreglo"""
+        return importe
+
+    @staticmethod
+    def de_unidad(valor) -> float:
+        """Convierte un valor del arreglo a pesos"""
+        return float(valor)
+
+    def _asegurar_capacidad(self, slot: int):
+        """Amplía el arreglo (al doble) si el slot aún no cabe"""
+        if slot >= len(self._saldos):
+            nuevos = np.zeros(max(len(self.indice), 2 * len(self._saldos)), dtype=self.dtype)
+            nuevos[:len(self._saldos)] = self._saldos
+            self._saldos = nuevos
+            self._compartido = False
+
+    def _preparar_escritura(self, slot: int):
+        """Copia el arreglo si está compartido y garantiza que el slot quepa"""
+        if self._compartido:
+            self._saldos = self._saldos.copy()
+            self._compartido = False
+        self._limite = None
+        self._asegurar_capacidad(slot)
+
+    def leer(self, slot: int) -> float:
+        """Saldo de un slot"""
+        if slot >= len(self._saldos) or (self._limite is not None and slot >= self._limite):
+            return self.de_unidad(0)
+        return self.de_unidad(self._saldos[slot])
+
+    def escribir(self, slot: int, valor: float):
+        """Asigna el saldo de un slot"""
+        self._preparar_escritura(slot)
+        self._saldos[slot] = self.a_unidad(valor)
+
+    def acumular(self, categoria: str, cuenta: str, importe: float):
+        """Suma un importe a una cuenta existente; retorna el delta en unidades"""
+        slot = self.indice.slot(categoria, cuenta)
+        delta = self.a_unidad(importe)
+        self._preparar_escritura(slot)
+        self._saldos[slot] += delta
+        return delta
+
+    @property
+    def saldos(self) -> np.ndarray:
+        """Arreglo de saldos indexado por slot (sin copiar)"""
+        return self._saldos[:len(self.indice)]
+
+    # === INTERFAZ DE ESTADO ===
+
+    def __getitem__(self, categoria: str) -> CuentasArreglo:
+        return self._vistas[categoria]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.indice.categorias)
+
+    def __len__(self) -> int:
+        return len(self.indice.categorias)
+
+    def escribible(self, categoria: str) -> CuentasArreglo:
+        """Las escrituras por la vista ya copian el arreglo si hace falta"""
+        return self._vistas[categoria]
+
+    def copiar(self) -> 'EstadoArreglo':
+        """Copia el arreglo de saldos (un solo bloque de memoria)"""
+        return type(self)(self.indice, self._saldos.copy())
+
+    def instantanea(self, indice: Optional[IndiceCuentas] = None) -> 'EstadoArreglo':
+        """
+        Copia con escritura diferida
+
+        Ambos estados comparten el arreglo; el primero que escriba lo copia.
+        Por omisión la instantánea usa el índice vigente: una cuenta dada
+        de alta después se ve en cero y una dada de baja deja de verse.
+
+        Args:
+            indice: Copia del índice (IndiceCuentas.copiar) para que las
+                    altas y bajas de uno no afecten al otro
+        """
+        copia = type(self)(indice if indice is not None else self.indice, self._saldos)
+        copia._limite = len(self.indice)
+        self._compartido = True
+        copia._compartido = True
+        return copia
+
+    def diferencias(self, otro: 'EstadoArreglo') -> List[Tuple[str, str, float]]:
+        """Movimientos que llevan este estado a los saldos de otro (vectorizado)"""
+        if otro._saldos is self._saldos:
+            return []
+
+        n = min(len(self.indice), len(self._saldos), len(otro._saldos))
+        if otro._limite is not None:
+            n = min(n, otro._limite)
+        deltas = otro._saldos[:n] - self._saldos[:n]
+        vivos = self._codigos_categoria()[:n] < len(self.indice.categorias)
+        slots = np.nonzero((deltas != 0) & vivos)[0]
+
+        return [
+            (self.indice.categoria_de(slot), self.indice.nombre_de(slot),
+             self.de_unidad(deltas[slot]))
+            for slot in slots.tolist()
+        ]
+
+    def _codigos_categoria(self) -> np.ndarray:
+        """Código de categoría por slot; los slots libres van a una cubeta extra"""
+        if self._version_codigos != self.indice.version:
+            codigos = np.array(self.indice.codigos_categoria, dtype=np.int64)
+            codigos[codigos == IndiceCuentas.LIBRE] = len(self.indice.categorias)
+            self._codigos = codigos
+            self._version_codigos = self.indice.version
+        return self._codigos
+
+    def sumar_categorias(self) -> Dict[str, float]:
+        """Suma de todas las categorías en una reducción agrupada"""
+        n = len(self.indice)
+        self._asegurar_capacidad(n - 1)
+        sumas = np.bincount(self._codigos_categoria(), weights=self._saldos[:n],
+                            minlength=len(self.indice.categorias) + 1)
+        return {
+            categoria: float(sumas[i])
+            for i, categoria in enumerate(self.indice.categorias)
+        }
+
+    def a_dict(self) -> Dict[str, Dict[str, float]]:
+        """Materializa el estado en diccionarios simples"""
+        return {
+            categoria: dict(cuentas.items())
+            for categoria, cuentas in self._vistas.items()
+        }
+
+
+class EstadoCentavos(EstadoArreglo):
+    """
+    Estado con los saldos en centavos enteros (int64)
+
+    Todas las sumas son enteras y exactas; un balance cuadra solo si la
+    diferencia es cero.
+    """
+
+    dtype = np.int64
+    tolerancia = 0
+
+    @staticmethod
+    def a_unidad(importe: float) -> int:
+        """Convierte un importe en pesos a centavos"""
+        return a_centavos(importe)
+
+    @staticmethod
+    def de_unidad(valor) -> float:
+        """Convierte centavos a pesos"""
+        return de_centavos(int(valor))
+
+    def sumar_categorias(self) -> Dict[str, int]:
+        """Suma entera exacta de cada categoría (en centavos)"""
+        n = len(self.indice)
+        self._asegurar_capacidad(n - 1)
+        codigos = self._codigos_categoria()
+        saldos = self._saldos[:n]
+        return {
+            categoria: int(saldos[codigos == i].sum())
+            for i, categoria in enumerate(self.indice.categorias)
+        }
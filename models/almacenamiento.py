@@ -0,0 +1,146 @@
+"""
+models/almacenamiento.py
+Motores de almacenamiento de saldos
+
+Todos los estados (catálogo, estado inicial y estado actual) se ven como un
+diccionario categoría -> {cuenta: saldo}. Además exponen:
+
+- copiar(): copia independiente del estado
+- instantanea(): copia O(1) que comparte memoria hasta la siguiente escritura
+  (instantaneas_separadas() además separa el catálogo de cuentas)
+- escribible(): cuentas de una categoría listas para modificarse
+- diferencias(): movimientos que llevan este estado a una instantánea
+- acumular(): suma un importe a una cuenta y retorna el delta en unidades
+- sumar_categorias(): suma completa por categoría, en unidades del motor
+- a_unidad() / de_unidad(): conversión entre pesos y unidades del motor
+- tolerancia: diferencia máxima (en unidades) para considerar que cuadra
+- a_dict(): vista en diccionarios simples (para exportar)
+"""
+
+from typing import Dict, List, Tuple
+
+ALMACENAMIENTOS = ('diccionario', 'arreglo', 'centavos')
+
+
+class EstadoDiccionario(dict):
+    """Estado guardado en diccionarios anidados (motor por omisión)"""
+
+    tolerancia = 0.01
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Categorías cuyo diccionario comparte con otra instantánea
+        self._compartidas = set()
+
+    @staticmethod
+    def a_unidad(importe: float) -> float:
+        """Los saldos se guardan directamente en pesos"""
+        return importe
+
+    @staticmethod
+    def de_unidad(valor: float) -> float:
+        """Los saldos se guardan directamente en pesos"""
+        return valor
+
+    def acumular(self, categoria: str, cuenta: str, importe: float) -> float:
+        """Suma un importe al saldo de una cuenta existente"""
+        self.escribible(categoria)[cuenta] += importe
+        return importe
+
+    def escribible(self, categoria: str) -> Dict[str, float]:
+        """Cuentas de una categoría; si están compartidas se copian antes"""
+        if categoria in self._compartidas:
+            self[categoria] = dict(self[categoria])
+            self._compartidas.discard(categoria)
+        return self[categoria]
+
+    def instantanea(self) -> 'EstadoDiccionario':
+        """
+        Copia con escritura diferida
+
+        Ambos estados comparten los diccionarios de cada categoría; el
+        primero que escriba en una categoría la copia, las demás se siguen
+        compartiendo.
+        """
+        copia = EstadoDiccionario(self)
+        self._compartidas = set(self)
+        copia._compartidas = set(copia)
+        return copia
+
+    def diferencias(self, otro: 'EstadoDiccionario') -> List[Tuple[str, str, float]]:
+        """
+        Movimientos que llevan este estado a los saldos de otro
+
+        Solo se recorren las categorías que ya no comparten diccionario y
+        solo las cuentas presentes en ambos estados.
+        """
+        movimientos = []
+        for categoria, cuentas in self.items():
+            cuentas_otro = otro.get(categoria)
+            if cuentas_otro is None or cuentas_otro is cuentas:
+                continue
+            for cuenta, valor in cuentas.items():
+                if cuenta in cuentas_otro and cuentas_otro[cuenta] != valor:
+                    movimientos.append((categoria, cuenta, cuentas_otro[cuenta] - valor))
+        return movimientos
+
+    def copiar(self) -> 'EstadoDiccionario':
+        """Copia cada categoría en un diccionario nuevo"""
+        return EstadoDiccionario(
+            (categoria, dict(cuentas)) for categoria, cuentas in self.items()
+        )
+
+    def sumar_categorias(self) -> Dict[str, float]:
+        """Suma completa de cada categoría"""
+        return {
+            categoria: sum(cuentas.values())
+            for categoria, cuentas in self.items()
+        }
+
+    def a_dict(self) -> Dict:
+        """El propio estado ya es un diccionario"""
+        return self
+
+
+def instantaneas_separadas(*estados) -> tuple:
+    """
+    Instantáneas de estados que comparten catálogo de cuentas (catálogo,
+    inicial y actual de un modelo) con un catálogo propio, común a todas
+
+    Las altas y bajas en las copias no afectan a los originales ni al
+    revés. En diccionarios cada instantánea ya es independiente; en
+    arreglo las copias comparten una copia del índice de cuentas.
+    """
+    indice = getattr(estados[0], 'indice', None)
+    if indice is None:
+        return tuple(estado.instantanea() for estado in estados)
+    copia = indice.copiar()
+    return tuple(estado.instantanea(copia) for estado in estados)
+
+
+def crear_estado(almacenamiento: str, catalogo: Dict[str, Dict[str, float]]):
+    """
+    Crea un estado con el motor indicado a partir de un catálogo en diccionarios
+
+    Args:
+        almacenamiento: 'diccionario', 'arreglo' o 'centavos' (los dos
+                        últimos requieren numpy)
+        catalogo: Catálogo categoría -> {cuenta: saldo}
+    """
+    if almacenamiento == 'diccionario':
+        return EstadoDiccionario(
+            (categoria, dict(cuentas)) for categoria, cuentas in catalogo.items()
+        )
+
+    if almacenamiento == 'arreglo':
+        from models.almacen_arreglo import EstadoArreglo
+        return EstadoArreglo.desde_dict(catalogo)
+
+    if almacenamiento == 'centavos':
+        from models.almacen_arreglo import EstadoCentavos
+        return EstadoCentavos.desde_dict(catalogo)
+
+    raise ValueError(
+        f"Almacenamiento desconocido: {almacenamiento} "
+        f"(opciones: {', '.join(ALMACENAMIENTOS)})"
+    )
@@ -0,0 +1,171 @@
+"""
+models/arbol_cuentas.py
+Subcuentas jerárquicas con totales acumulados por nodo
+
+Una cuenta cuyo nombre tiene SEPARADOR (p. ej. 'BANCO/BBVA/CTA 1234') es
+una subcuenta: sigue siendo una cuenta normal del estado, y el árbol
+agrega un nodo por cada prefijo ('BANCO', 'BANCO/BBVA') con la suma de
+todo lo que cuelga de él. Cada movimiento suma su delta solo a la cadena
+de nodos de su cuenta, así que registrar cuesta O(profundidad) y el total
+de cualquier nivel se lee en O(1).
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+SEPARADOR = '/'
+
+
+def ruta_valida(cuenta: str) -> bool:
+    """Sin niveles vacíos ('A//B', '/A', 'A/')"""
+    return all(parte.strip() for parte in cuenta.split(SEPARADOR))
+
+
+class NodoCuenta:
+    """Nivel del árbol; `total` en las unidades del motor de almacenamiento"""
+
+    __slots__ = ('ruta', 'total', 'hijos', 'padre', 'es_cuenta')
+
+    def __init__(self, ruta: str, padre: Optional['NodoCuenta']):
+        self.ruta = ruta
+        self.total = 0
+        self.hijos: Dict[str, 'NodoCuenta'] = {}
+        self.padre = padre
+
+        # True si además de agrupar es una cuenta con saldo propio
+        self.es_cuenta = False
+
+
+class ArbolCuentas:
+    """
+    Árbol de subcuentas de un estado
+
+    Solo tiene nodos para las cuentas con subniveles y sus prefijos; las
+    cuentas planas sin subcuentas no ocupan nada. El modelo lo mantiene
+    con agregar, eliminar y acumular (cada delta que aplica al estado).
+    """
+
+    def __init__(self, estado):
+        self._estado = estado
+        self._nodos: Dict[Tuple[str, str], NodoCuenta] = {}
+
+        # (categoría, cuenta) -> nodos de la cuenta a la raíz, para las
+        # cuentas que están en el árbol
+        self._cadenas: Dict[Tuple[str, str], Tuple[NodoCuenta, ...]] = {}
+
+        for categoria in estado:
+            for cuenta in estado[categoria]:
+                if SEPARADOR in cuenta:
+                    self._nodo(categoria, cuenta)
+
+    def _nodo(self, categoria: str, ruta: str) -> NodoCuenta:
+        """Nodo de una ruta, creando los niveles que falten"""
+        nodo = self._nodos.get((categoria, ruta))
+        if nodo is not None:
+            return nodo
+
+        padre = None
+        if SEPARADOR in ruta:
+            padre = self._nodo(categoria, ruta.rsplit(SEPARADOR, 1)[0])
+        nodo = NodoCuenta(ruta, padre)
+        if padre is not None:
+            padre.hijos[ruta] = nodo
+        self._nodos[(categoria, ruta)] = nodo
+
+        # Una cuenta plana que recibe subcuentas entra al árbol con su saldo
+        cuentas = self._estado[categoria]
+        if ruta in cuentas and (categoria, ruta) not in self._cadenas:
+            self._registrar(categoria, nodo, self._estado.a_unidad(cuentas[ruta]))
+        return nodo
+
+    def _registrar(self, categoria: str, nodo: NodoCuenta, unidades):
+        cadena = []
+        actual = nodo
+        while actual is not None:
+            actual.total += unidades
+            cadena.append(actual)
+            actual = actual.padre
+        nodo.es_cuenta = True
+        self._cadenas[(categoria, nodo.ruta)] = tuple(cadena)
+
+    # === MANTENIMIENTO ===
+
+    def agregar(self, categoria: str, cuenta: str):
+        """Alta de una cuenta que ya está en el estado (toma su saldo de ahí)"""
+        if SEPARADOR not in cuenta and (categoria, cuenta) not in self._nodos:
+            return
+        nodo = self._nodo(categoria, cuenta)
+        if (categoria, cuenta) not in self._cadenas:
+            # Ya era un nivel (por sus subcuentas) y ahora también es cuenta
+            self._registrar(categoria, nodo,
+                            self._estado.a_unidad(self._estado[categoria][cuenta]))
+
+    def eliminar(self, categoria: str, cuenta: str):
+        """Baja de una cuenta; se llama antes de quitarla del estado"""
+        cadena = self._cadenas.pop((categoria, cuenta), None)
+        if cadena is None:
+            return
+        unidades = self._estado.a_unidad(self._estado[categoria][cuenta])
+        for nodo in cadena:
+            nodo.total -= unidades
+        nodo = cadena[0]
+        nodo.es_cuenta = False
+
+        # Quitar los niveles que quedaron vacíos
+        while nodo is not None and not nodo.hijos and not nodo.es_cuenta:
+            del self._nodos[(categoria, nodo.ruta)]
+            if nodo.padre is not None:
+                del nodo.padre.hijos[nodo.ruta]
+            nodo = nodo.padre
+
+    def acumular(self, categoria: str, cuenta: str, delta):
+        """Suma un movimiento (en unidades) a los niveles de la cuenta"""
+        cadena = self._cadenas.get((categoria, cuenta))
+        if cadena is not None:
+            for nodo in cadena:
+                nodo.total += delta
+
+    # === CONSULTAS ===
+
+    def total(self, categoria: str, ruta: str):
+        """
+        Total (en unidades) de un nivel o cuenta
+
+        Raises:
+            KeyError: Si no existe ni como nivel ni como cuenta
+        """
+        nodo = self._nodos.get((categoria, ruta))
+        if nodo is not None:
+            return nodo.total
+        return self._estado.a_unidad(self._estado[categoria][ruta])
+
+    def hijos(self, categoria: str, ruta: Optional[str] = None) -> List[Tuple[str, object, bool]]:
+        """
+        Niveles inmediatamente debajo de una ruta (o el primer nivel de la
+        categoría): (ruta, total en unidades, tiene_subniveles)
+
+        El primer nivel recorre las cuentas de la categoría; los demás
+        solo los hijos del nodo.
+        """
+        if ruta is not None:
+            nodo = self._nodos.get((categoria, ruta))
+            if nodo is None:
+                self.total(categoria, ruta)
+                return []
+            return [(h.ruta, h.total, bool(h.hijos)) for h in nodo.hijos.values()]
+
+        resultado = []
+        vistos = set()
+        for cuenta in self._estado[categoria]:
+            primero = cuenta.split(SEPARADOR, 1)[0]
+            if primero not in vistos:
+                vistos.add(primero)
+                nodo = self._nodos.get((categoria, primero))
+                if nodo is not None:
+                    resultado.append((primero, nodo.total, bool(nodo.hijos)))
+                else:
+                    resultado.append((primero, self.total(categoria, primero), False))
+        return resultado
+
+    def totales(self) -> Dict[Tuple[str, str], object]:
+        """(categoría, ruta) -> total en unidades de cada nivel del árbol"""
+        return {clave: nodo.total for clave, nodo in self._nodos.items()}
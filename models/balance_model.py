@@ -4,15 +4,37 @@ Modelo de datos para el Balance General - Maneja la lógica de negocio
 """
 
 import copy
-from typing import Dict, List, Tuple, Optional
+import math
+from datetime import date
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
+from models.almacenamiento import crear_estado, instantaneas_separadas
+from models.arbol_cuentas import ArbolCuentas
+from models.buscador_cuentas import BuscadorCuentas
+from models.centavos import a_centavos, de_centavos, calcular_iva_centavos, redondear
+from models.eventos import ASIENTO, CATALOGO, ESTADO, BusEventos, EventoCambio
+from models.instantaneas import Instantanea
+from models.libro_diario import Asiento, LibroDiario
+from models.puntos_control import PuntosControl
+
+# Números de versión de las listas de cuentas, únicos entre modelos: un
+# caché nunca confunde la lista de un modelo reemplazado con la del nuevo
+_VERSIONES_CUENTAS = count(1)
 
 
 class BalanceModel:
     """Modelo que contiene la lógica de negocio del Balance General"""
     
-    def __init__(self):
+    def __init__(self, depurar_totales: bool = False,
+                 almacenamiento: str = 'diccionario',
+                 puntos_control_cada: int = 1000):
+        # Motor de almacenamiento ('arreglo' guarda los saldos en un arreglo
+        # NumPy indexado por slot y 'centavos' en enteros de punto fijo;
+        # ver models/almacenamiento.py)
+        self.almacenamiento = almacenamiento
+        
         # Catálogo de cuentas editable
-        self.catalogo = {
+        self.catalogo = crear_estado(almacenamiento, {
             'ACTIVO_CIRCULANTE': {
                 'CAJA': 50000.00,
                 'BANCO': 2000000.00,
@@ -48,31 +70,152 @@ class BalanceModel:
                 'UTILIDAD': 0.00,
                 'PERDIDA': 0.00
             }
-        }
+        })
         
         self.estado_actual = self._copiar_catalogo()
         self.estado_inicial = self._copiar_catalogo()
         
+        # Libro diario con todos los asientos de la sesión
+        self.diario = LibroDiario()
+        
+        # Puntos de control para consultar el balance a una fecha
+        self.puntos_control = PuntosControl(puntos_control_cada)
+        
+        # Saldos a una fecha anterior a la apertura del diario (ver
+        # fijar_apertura)
+        self._saldos_anteriores: Optional[Callable[[date], Dict]] = None
+        
+        # Aumenta con cada alta, baja o cambio de saldo en el catálogo
+        self.version_catalogo = 0
+        
+        # Versión de las cuentas de cada categoría: cambia solo con altas y
+        # bajas (no con saldos), así los listados en caché siguen valiendo
+        self.versiones_cuentas: Dict[str, int] = {}
+        self._cuentas_modificadas()
+        
+        # Subtotales por categoría, mantenidos con el delta de cada movimiento;
+        # los del catálogo se guardan para que reiniciar no tenga que sumar
+        self._subtotales_catalogo = self.catalogo.sumar_categorias()
+        self._subtotales_iniciales = dict(self._subtotales_catalogo)
+        self._subtotales = dict(self._subtotales_catalogo)
+        
+        # Si es True, calcular_totales compara contra una suma completa
+        self.depurar_totales = depurar_totales
+        
+        # Instantáneas con nombre (en orden de creación)
+        self._instantaneas: Dict[str, Instantanea] = {}
+        
+        # Índice de búsqueda por nombre; se crea en la primera búsqueda y
+        # luego lo mantienen agregar_cuenta y eliminar_cuenta
+        self._buscador: Optional[BuscadorCuentas] = None
+        
+        # Totales por nivel de las subcuentas ('BANCO/BBVA/...') del estado
+        # actual; se crea en la primera consulta y luego cada movimiento lo
+        # actualiza
+        self._arbol: Optional[ArbolCuentas] = None
+        
+        # Cambios para las vistas; los eventos solo se arman si hay
+        # suscriptores
+        self.eventos = BusEventos()
+        
         # Tasa de IVA
         self.tasa_iva = 0.16
+        
+        # En centavos todos los importes se redondean al centavo antes de
+        # aplicarse y el IVA se reparte sin residuo
+        self.centavos = almacenamiento == 'centavos'
+    
+    def cargar_estado(self, catalogo: Dict[str, Dict[str, float]],
+                      asientos: Iterable[Dict] = (),
+                      saldos: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Reemplaza el catálogo y el diario (p. ej. al leer un archivo guardado)
+        
+        Los asientos se anexan al diario. Sin saldos, el estado actual se
+        obtiene reproduciéndolos sobre el catálogo; con saldos (estado
+        actual ya guardado) no se vuelven a aplicar. Las instantáneas y los
+        puntos de control se descartan.
+        
+        Args:
+            catalogo: Catálogo categoría -> {cuenta: saldo}
+            asientos: Dicts con 'tipo', 'movimientos' y opcionalmente
+                      'fecha' (date o ISO) y 'secuencia'
+            saldos: Estado actual categoría -> {cuenta: saldo}
+        """
+        self.catalogo = crear_estado(self.almacenamiento, catalogo)
+        self.estado_actual = self._copiar_catalogo()
+        self.estado_inicial = self._copiar_catalogo()
+        self._subtotales_catalogo = self.catalogo.sumar_categorias()
+        self._subtotales_iniciales = dict(self._subtotales_catalogo)
+        self._subtotales = dict(self._subtotales_catalogo)
+        self.diario = LibroDiario()
+        self._saldos_anteriores = None
+        self._catalogo_modificado()
+        self._cuentas_modificadas()
+        self._instantaneas = {}
+        self._buscador = None
+        self._arbol = None
+        
+        for asiento in asientos:
+            fecha = asiento.get('fecha')
+            if isinstance(fecha, str):
+                fecha = date.fromisoformat(fecha)
+            self.diario.registrar(asiento['tipo'], [tuple(m) for m in asiento['movimientos']],
+                                  fecha, asiento.get('secuencia'))
+        
+        if saldos is None:
+            # Como en reconstruir_estado, los movimientos de cuentas que ya
+            # no existen se ignoran y las bajas separan a las cuentas que se
+            # volvieron a dar de alta
+            self.estado_actual = self.diario.reproducir(self.estado_inicial)
+        else:
+            for categoria, cuentas in saldos.items():
+                actuales = self.estado_actual[categoria]
+                for cuenta, saldo in cuentas.items():
+                    if cuenta in actuales and actuales[cuenta] != saldo:
+                        self.estado_actual.escribible(categoria)[cuenta] = saldo
+        self._subtotales = self.estado_actual.sumar_categorias()
+        self.notificar_reemplazo()
     
     def _copiar_catalogo(self) -> Dict:
-        """Crea una copia profunda del catálogo"""
-        return {
-            categoria: dict(cuentas)
-            for categoria, cuentas in self.catalogo.items()
-        }
+        """
+        Crea una copia del catálogo con escritura diferida: no se copia
+        nada hasta que se modifica alguna categoría
+        """
+        return self.catalogo.instantanea()
     
     # === OPERACIONES DE CATÁLOGO ===
     
+    def _catalogo_modificado(self):
+        """Los puntos de control dejan de ser válidos al cambiar el catálogo"""
+        self.version_catalogo += 1
+        self.puntos_control.limpiar()
+    
+    def _cuentas_modificadas(self, categoria: Optional[str] = None):
+        """Nueva versión de las cuentas de una categoría (o de todas)"""
+        for cat in (self.catalogo if categoria is None else (categoria,)):
+            self.versiones_cuentas[cat] = next(_VERSIONES_CUENTAS)
+    
     def agregar_cuenta(self, categoria: str, nombre: str, valor: float) -> bool:
         """Agrega una nueva cuenta al catálogo"""
         if nombre in self.catalogo[categoria]:
             return False
         
-        self.catalogo[categoria][nombre] = valor
-        self.estado_actual[categoria][nombre] = valor
-        self.estado_inicial[categoria][nombre] = valor
+        for estado in (self.catalogo, self.estado_actual, self.estado_inicial):
+            estado.escribible(categoria)[nombre] = valor
+        self._cuentas_modificadas(categoria)
+        
+        unidades = self.estado_actual.a_unidad(valor)
+        self._subtotales[categoria] += unidades
+        self._subtotales_iniciales[categoria] += unidades
+        self._subtotales_catalogo[categoria] += unidades
+        if self._buscador is not None:
+            self._buscador.agregar(categoria, nombre)
+        if self._arbol is not None:
+            self._arbol.agregar(categoria, nombre)
+        if self.eventos.activo:
+            self._emitir(CATALOGO, {(categoria, nombre): unidades})
+        self._catalogo_modificado()
         return True
     
     def modificar_cuenta(self, categoria: str, nombre: str, nuevo_valor: float) -> bool:
@@ -80,8 +223,24 @@ class BalanceModel:
         if nombre not in self.catalogo[categoria]:
             return False
         
-        self.catalogo[categoria][nombre] = nuevo_valor
-        self.estado_inicial[categoria][nombre] = nuevo_valor
+        # Los saldos inicial y actual se desplazan igual que el catálogo para
+        # que estado_inicial + diario siga reproduciendo estado_actual
+        a_unidad = self.catalogo.a_unidad
+        cambio = a_unidad(nuevo_valor) - a_unidad(self.catalogo[categoria][nombre])
+        diferencia = self.catalogo.de_unidad(cambio)
+        
+        self.catalogo.escribible(categoria)[nombre] = nuevo_valor
+        self._subtotales_catalogo[categoria] += cambio
+        self._subtotales_iniciales[categoria] += self.estado_inicial.acumular(
+            categoria, nombre, diferencia
+        )
+        delta = self.estado_actual.acumular(categoria, nombre, diferencia)
+        self._subtotales[categoria] += delta
+        if self._arbol is not None:
+            self._arbol.acumular(categoria, nombre, delta)
+        if self.eventos.activo:
+            self._emitir(CATALOGO, {(categoria, nombre): delta})
+        self._catalogo_modificado()
         return True
     
     def eliminar_cuenta(self, categoria: str, nombre: str) -> bool:
@@ -92,11 +251,32 @@ class BalanceModel:
             return False
         
         if nombre in self.catalogo[categoria]:
-            del self.catalogo[categoria][nombre]
+            # Descontar los saldos antes de borrar: en el almacenamiento en
+            # arreglo los tres estados comparten el índice de cuentas
+            saldo = 0
             if nombre in self.estado_actual[categoria]:
-                del self.estado_actual[categoria][nombre]
+                saldo = self.estado_actual.a_unidad(self.estado_actual[categoria][nombre])
+                self._subtotales[categoria] -= saldo
+                if self._arbol is not None:
+                    self._arbol.eliminar(categoria, nombre)
             if nombre in self.estado_inicial[categoria]:
-                del self.estado_inicial[categoria][nombre]
+                self._subtotales_iniciales[categoria] -= self.estado_inicial.a_unidad(
+                    self.estado_inicial[categoria][nombre])
+            self._subtotales_catalogo[categoria] -= self.catalogo.a_unidad(
+                self.catalogo[categoria][nombre])
+            
+            for estado in (self.catalogo, self.estado_actual, self.estado_inicial):
+                estado.escribible(categoria).pop(nombre, None)
+            self._cuentas_modificadas(categoria)
+            
+            # Una cuenta nueva con el mismo nombre no debe heredar, al
+            # reproducir el diario, los movimientos de esta
+            self.diario.registrar_baja(categoria, nombre)
+            if self._buscador is not None:
+                self._buscador.eliminar(categoria, nombre)
+            if self.eventos.activo:
+                self._emitir(CATALOGO, {(categoria, nombre): -saldo})
+            self._catalogo_modificado()
             return True
         
         return False
@@ -109,8 +289,344 @@ class BalanceModel:
         """Obtiene el valor actual de una cuenta"""
         return self.estado_actual[categoria].get(cuenta, 0.0)
     
+    @property
+    def buscador(self) -> BuscadorCuentas:
+        """Índice de búsqueda de cuentas (se crea la primera vez)"""
+        if self._buscador is None:
+            self._buscador = BuscadorCuentas(self.catalogo)
+        return self._buscador
+    
+    def buscar_cuentas(self, texto: str, categoria: Optional[str] = None,
+                       limite: int = 50) -> List[Tuple[str, str]]:
+        """
+        Cuentas para autocompletar: por prefijo, por palabra y parecidas
+        
+        Returns:
+            Lista de (categoría, cuenta)
+        """
+        return self.buscador.buscar(texto, categoria, limite)
+    
+    def ubicar_cuenta(self, nombre: str) -> List[str]:
+        """Categorías en las que existe una cuenta con ese nombre"""
+        return self.buscador.categorias_de(nombre)
+    
+    # === EVENTOS ===
+    
+    def _emitir(self, tipo: str, deltas: Dict[Tuple[str, str], float],
+                secuencia: Optional[int] = None):
+        """Publica un cambio con los deltas en unidades del almacenamiento"""
+        de_unidad = self.estado_actual.de_unidad
+        self.eventos.emitir(EventoCambio(
+            tipo,
+            {clave: de_unidad(delta) for clave, delta in deltas.items()},
+            frozenset(deltas),
+            self._totales(self._subtotales, self.estado_actual),
+            secuencia
+        ))
+    
+    def notificar_reemplazo(self):
+        """
+        Avisa a los suscriptores que cambió todo el estado (carga,
+        reinicio o un modelo nuevo que toma el bus de otro)
+        """
+        if self.eventos.activo:
+            self.eventos.emitir(EventoCambio(
+                ESTADO, {}, None, self._totales(self._subtotales, self.estado_actual)
+            ))
+    
+    # === SUBCUENTAS ===
+    
+    @property
+    def arbol(self) -> ArbolCuentas:
+        """Árbol de subcuentas del estado actual (se crea la primera vez)"""
+        if self._arbol is None:
+            self._arbol = ArbolCuentas(self.estado_actual)
+        return self._arbol
+    
+    def preparar_indices(self):
+        """
+        Crea ya el índice de búsqueda y el árbol de subcuentas
+        
+        Normalmente se crean con la primera consulta; quien consulta desde
+        varios hilos a la vez los crea antes, con acceso exclusivo.
+        """
+        self.buscador.preparar()
+        self.arbol
+    
+    def total_cuenta(self, categoria: str, ruta: Optional[str] = None) -> float:
+        """
+        Saldo de una cuenta o total de un nivel de subcuentas (p. ej.
+        'BANCO/BBVA' suma todas las cuentas 'BANCO/BBVA/...')
+        
+        Sin ruta retorna el total de la categoría.
+        
+        Raises:
+            KeyError: Si la ruta no es ni cuenta ni nivel de la categoría
+        """
+        if ruta is None:
+            return self.estado_actual.de_unidad(self._subtotales[categoria])
+        return self.estado_actual.de_unidad(self.arbol.total(categoria, ruta))
+    
+    def obtener_subcuentas(self, categoria: str,
+                           ruta: Optional[str] = None) -> List[Tuple[str, float, bool]]:
+        """
+        Niveles directamente debajo de una ruta (sin ruta, el primer nivel
+        de la categoría)
+        
+        Returns:
+            Lista de (ruta, total, tiene_subcuentas)
+        """
+        de_unidad = self.estado_actual.de_unidad
+        return [(nombre, de_unidad(total), tiene_hijos)
+                for nombre, total, tiene_hijos in self.arbol.hijos(categoria, ruta)]
+    
+    # === LIBRO DIARIO ===
+    
+    def _registrar_asiento(self, tipo: str, 
+                           movimientos: List[Tuple[str, str, float]],
+                           fecha: Optional[date] = None,
+                           secuencia: Optional[int] = None) -> Asiento:
+        """
+        Aplica los movimientos al estado actual y los anexa al diario
+        
+        Todas las cuentas (y la fecha) se validan antes de modificar nada,
+        de modo que un error no deja la transacción a medias.
+        
+        Raises:
+            KeyError: Si alguna cuenta no existe
+            ValueError: Si la fecha es anterior a la del último asiento
+        """
+        for categoria, cuenta, _ in movimientos:
+            if cuenta not in self.estado_actual[categoria]:
+                raise KeyError(cuenta)
+        
+        fecha = self.diario.validar_fecha(fecha)
+        ultimo = self.diario.ultimo
+        self.puntos_control.antes_de_asiento(
+            len(self.diario), ultimo.fecha if ultimo else None, fecha, self.estado_actual
+        )
+        
+        arbol = self._arbol
+        deltas = {} if self.eventos.activo else None
+        for categoria, cuenta, importe in movimientos:
+            delta = self.estado_actual.acumular(categoria, cuenta, importe)
+            self._subtotales[categoria] += delta
+            if arbol is not None:
+                arbol.acumular(categoria, cuenta, delta)
+            if deltas is not None:
+                deltas[(categoria, cuenta)] = deltas.get((categoria, cuenta), 0) + delta
+        
+        asiento = self.diario.registrar(tipo, movimientos, fecha, secuencia)
+        self.puntos_control.despues_de_asiento(len(self.diario), fecha, self.estado_actual)
+        if deltas is not None:
+            self._emitir(ASIENTO, deltas, asiento.secuencia)
+        return asiento
+    
+    def aplicar_ajuste(self, tipo: str, movimientos: List[Tuple[str, str, float]],
+                       fecha: Optional[date] = None) -> Dict:
+        """
+        Registra un asiento con movimientos ya calculados (anulaciones,
+        correcciones)
+        
+        Returns:
+            Dict con el tipo, la secuencia y las cuentas afectadas
+        """
+        asiento = self._registrar_asiento(tipo, movimientos, fecha)
+        
+        return {
+            'tipo': tipo,
+            'secuencia': asiento.secuencia,
+            'cuentas': [(m.categoria, m.cuenta) for m in asiento.movimientos],
+            'cuentas_afectadas': len(asiento.movimientos)
+        }
+    
+    def fijar_apertura(self, saldos_anteriores: Optional[Callable[[date], Dict]] = None):
+        """
+        Toma el estado actual como punto de partida del diario
+        
+        Para cuando los asientos anteriores no se cargan en el diario (p. ej.
+        al leer un libro binario): estado_al y reconstruir_estado parten de
+        aquí en lugar del catálogo.
+        
+        Args:
+            saldos_anteriores: Función fecha -> {categoria: {cuenta: saldo}}
+                               para las fechas anteriores a la apertura (p. ej.
+                               LibroBinario.saldos); sin ella estado_al las
+                               rechaza
+        """
+        self.estado_inicial = self.estado_actual.copiar()
+        self._subtotales_iniciales = dict(self._subtotales)
+        self._saldos_anteriores = saldos_anteriores
+        self.puntos_control.limpiar()
+    
+    def reconstruir_estado(self) -> Dict:
+        """Reconstruye el estado actual a partir del inicial y el diario"""
+        return self.diario.reproducir(self.estado_inicial)
+    
+    def estado_al(self, fecha: date) -> Tuple[Dict, int]:
+        """
+        Estado con los asientos registrados hasta una fecha (inclusive)
+        
+        Parte del punto de control anterior más cercano y reproduce solo
+        los asientos que faltan, en lugar de todo el diario. Si el diario
+        continúa otro (libro binario, copia bifurcada), las fechas
+        anteriores a su apertura se piden a saldos_anteriores.
+        
+        Returns:
+            Tuple (estado, asientos reproducidos)
+        
+        Raises:
+            ValueError: Si la fecha es anterior a la apertura y no hay de
+                        dónde obtener esos saldos
+        """
+        apertura = self.diario.fecha_apertura
+        if apertura is not None and fecha < apertura:
+            if self._saldos_anteriores is None:
+                raise ValueError(
+                    f"No hay saldos anteriores a la apertura del diario "
+                    f"({apertura.isoformat()})"
+                )
+            return crear_estado(self.almacenamiento, self._saldos_anteriores(fecha)), 0
+        
+        hasta = self.diario.posicion_hasta(fecha)
+        punto = self.puntos_control.buscar(hasta)
+        
+        if punto is None:
+            base, desde = self.estado_inicial, 0
+        else:
+            base, desde = punto.estado, punto.posicion
+        
+        return self.diario.reproducir(base, desde, hasta), hasta - desde
+    
+    def balance_al(self, fecha: date) -> Dict:
+        """
+        Balance general a una fecha
+        
+        Returns:
+            Dict con la fecha, el número de asientos incluidos, el estado
+            y los totales a esa fecha
+        """
+        estado, reproducidos = self.estado_al(fecha)
+        
+        return {
+            'fecha': fecha,
+            'asientos': self.diario.posicion_hasta(fecha),
+            'reproducidos': reproducidos,
+            'estado': estado.a_dict(),
+            'totales': self._totales(estado.sumar_categorias(), estado)
+        }
+    
+    # === INSTANTÁNEAS ===
+    
+    def tomar_instantanea(self, nombre: Optional[str] = None) -> Instantanea:
+        """
+        Guarda una vista inmutable del estado actual (O(1), sin copiar)
+        
+        Args:
+            nombre: Nombre de la instantánea; si ya existe se reemplaza
+        """
+        if not nombre:
+            nombre = f"#{len(self._instantaneas) + 1}"
+        
+        ultimo = self.diario.ultimo
+        instantanea = Instantanea(
+            nombre,
+            self.estado_actual.instantanea(),
+            ultimo.secuencia if ultimo else None
+        )
+        self._instantaneas.pop(nombre, None)
+        self._instantaneas[nombre] = instantanea
+        return instantanea
+    
+    def listar_instantaneas(self) -> List[Instantanea]:
+        """Instantáneas guardadas, de la más antigua a la más reciente"""
+        return list(self._instantaneas.values())
+    
+    def obtener_instantanea(self, nombre: str) -> Instantanea:
+        """Obtiene una instantánea por nombre (KeyError si no existe)"""
+        return self._instantaneas[nombre]
+    
+    def eliminar_instantanea(self, nombre: str) -> bool:
+        """Descarta una instantánea"""
+        return self._instantaneas.pop(nombre, None) is not None
+    
+    def restaurar_instantanea(self, nombre: str) -> Dict:
+        """
+        Regresa el estado actual a los saldos de una instantánea
+        
+        La restauración se registra en el diario como un asiento con la
+        diferencia de cada cuenta modificada desde la instantánea. Las
+        categorías que no se tocaron siguen compartidas y no se recorren.
+        Las cuentas dadas de alta después conservan su saldo.
+        
+        Raises:
+            KeyError: Si la instantánea no existe
+        """
+        instantanea = self._instantaneas[nombre]
+        movimientos = instantanea.diferencias_desde(self.estado_actual)
+        
+        secuencia = None
+        if movimientos:
+            secuencia = self._registrar_asiento('RESTAURACION', movimientos).secuencia
+        
+        return {
+            'tipo': 'RESTAURACION',
+            'secuencia': secuencia,
+            'instantanea': nombre,
+            'cuentas_afectadas': len(movimientos)
+        }
+    
+    def bifurcar(self) -> 'BalanceModel':
+        """
+        Copia independiente del modelo para simular operaciones (p. ej.
+        escenarios hipotéticos) sin afectar al original
+        
+        Los estados se comparten con escritura diferida, por lo que el costo
+        no depende del número de cuentas. La copia empieza con el diario
+        vacío (continúa la numeración) y su estado inicial es el actual.
+        """
+        copia = copy.copy(self)
+        
+        # Las envolturas de instrumentación de la instancia llamarían al original
+        for nombre in [n for n, v in vars(copia).items() if hasattr(v, '__wrapped__')]:
+            delattr(copia, nombre)
+        
+        # Con catálogo de cuentas propio: las altas y bajas de la copia (p. ej.
+        # las cuentas que crea un anticipo) no tocan al original
+        copia.catalogo, copia.estado_actual, copia.estado_inicial = instantaneas_separadas(
+            self.catalogo, self.estado_actual, self.estado_actual
+        )
+        copia._subtotales = dict(self._subtotales)
+        copia._subtotales_iniciales = dict(self._subtotales)
+        copia._subtotales_catalogo = dict(self._subtotales_catalogo)
+        copia._instantaneas = {}
+        copia._buscador = None
+        copia._arbol = None
+        copia.eventos = BusEventos()
+        copia.versiones_cuentas = dict(self.versiones_cuentas)
+        copia.puntos_control = PuntosControl(self.puntos_control.cada_asientos)
+        copia._saldos_anteriores = None
+        
+        ultimo = self.diario.ultimo
+        copia.diario = LibroDiario()
+        if ultimo is not None:
+            copia.diario.continuar_desde(ultimo.secuencia, ultimo.fecha)
+        return copia
+    
     # === CÁLCULOS FINANCIEROS ===
     
+    def _cuantizar(self, monto: float) -> float:
+        """Redondea un importe al centavo cuando el modelo opera en centavos"""
+        if self.centavos:
+            return de_centavos(a_centavos(monto))
+        return monto
+    
+    def _porcion(self, total: float, porcentaje: float) -> float:
+        """Porción de un total (anticipos), redondeada al centavo si aplica"""
+        if self.centavos:
+            return de_centavos(redondear(a_centavos(total) * porcentaje))
+        return total * porcentaje
+    
     def calcular_iva(self, monto: float, incluye_iva: bool = False) -> Tuple[float, float]:
         """
         Calcula el IVA de un monto
@@ -122,6 +638,10 @@ class BalanceModel:
         Returns:
             Tuple (subtotal, iva)
         """
+        if self.centavos:
+            subtotal, iva = calcular_iva_centavos(a_centavos(monto), self.tasa_iva, incluye_iva)
+            return de_centavos(subtotal), de_centavos(iva)
+        
         if incluye_iva:
             subtotal = monto / (1 + self.tasa_iva)
             iva = monto - subtotal
@@ -132,40 +652,88 @@ class BalanceModel:
         return subtotal, iva
     
     def calcular_totales(self) -> Dict[str, float]:
-        """Calcula los totales del balance"""
-        suma_circulante = sum(self.estado_actual['ACTIVO_CIRCULANTE'].values())
-        suma_no_circulante = sum(self.estado_actual['ACTIVO_NO_CIRCULANTE'].values())
+        """
+        Calcula los totales del balance
+        
+        Usa los subtotales incrementales, por lo que el costo no depende
+        del número de cuentas.
+        """
+        if self.depurar_totales:
+            self.verificar_subtotales()
+        
+        return self._totales(self._subtotales, self.estado_actual)
+    
+    @staticmethod
+    def _totales(subtotales: Dict[str, float], estado) -> Dict[str, float]:
+        """Totales del balance a partir de los subtotales de un estado"""
+        # Las sumas se hacen en las unidades del motor (enteras y exactas
+        # en centavos) y solo al final se convierten a pesos
+        suma_circulante = subtotales['ACTIVO_CIRCULANTE']
+        suma_no_circulante = subtotales['ACTIVO_NO_CIRCULANTE']
         total_activo = suma_circulante + suma_no_circulante
         
-        suma_pasivo_lp = sum(self.estado_actual['PASIVO_LARGO_PLAZO'].values())
-        suma_pasivo_cp = sum(self.estado_actual['PASIVO_CORTO_PLAZO'].values())
-        suma_capital = sum(self.estado_actual['CAPITAL'].values())
+        suma_pasivo_lp = subtotales['PASIVO_LARGO_PLAZO']
+        suma_pasivo_cp = subtotales['PASIVO_CORTO_PLAZO']
+        suma_capital = subtotales['CAPITAL']
         total_pasivo_capital = suma_pasivo_lp + suma_pasivo_cp + suma_capital
         
         diferencia = abs(total_activo - total_pasivo_capital)
         
+        de_unidad = estado.de_unidad
         return {
-            'activo_circulante': suma_circulante,
-            'activo_no_circulante': suma_no_circulante,
-            'total_activo': total_activo,
-            'pasivo_largo_plazo': suma_pasivo_lp,
-            'pasivo_corto_plazo': suma_pasivo_cp,
-            'capital': suma_capital,
-            'total_pasivo_capital': total_pasivo_capital,
-            'diferencia': diferencia,
-            'balance_cuadra': diferencia <= 0.01
+            'activo_circulante': de_unidad(suma_circulante),
+            'activo_no_circulante': de_unidad(suma_no_circulante),
+            'total_activo': de_unidad(total_activo),
+            'pasivo_largo_plazo': de_unidad(suma_pasivo_lp),
+            'pasivo_corto_plazo': de_unidad(suma_pasivo_cp),
+            'capital': de_unidad(suma_capital),
+            'total_pasivo_capital': de_unidad(total_pasivo_capital),
+            'diferencia': de_unidad(diferencia),
+            'balance_cuadra': diferencia <= estado.tolerancia
         }
     
+    def verificar_subtotales(self):
+        """
+        Compara los subtotales incrementales (y los del árbol de
+        subcuentas, si ya se creó) contra una suma completa
+        
+        Raises:
+            AssertionError: Si algún subtotal se desvió del recálculo
+        """
+        for nombre, subtotales, estado in (
+                ('actual', self._subtotales, self.estado_actual),
+                ('inicial', self._subtotales_iniciales, self.estado_inicial),
+                ('del catálogo', self._subtotales_catalogo, self.catalogo)):
+            for categoria, suma in estado.sumar_categorias().items():
+                incremental = subtotales[categoria]
+                if not math.isclose(incremental, suma, rel_tol=1e-9, abs_tol=1e-6):
+                    raise AssertionError(
+                        f"Subtotal {nombre} de {categoria} desincronizado: "
+                        f"incremental={incremental:,.6f}, recalculado={suma:,.6f}"
+                    )
+        
+        if self._arbol is not None:
+            recalculado = ArbolCuentas(self.estado_actual).totales()
+            for (categoria, ruta), total in self._arbol.totales().items():
+                suma = recalculado.get((categoria, ruta), 0)
+                if not math.isclose(total, suma, rel_tol=1e-9, abs_tol=1e-6):
+                    raise AssertionError(
+                        f"Total de {categoria}/{ruta} desincronizado: "
+                        f"incremental={total:,.6f}, recalculado={suma:,.6f}"
+                    )
+    
     # === TRANSACCIONES ===
     
     def compra_efectivo(self, cuenta_pago: str, tipo_destino: str, 
-                       cuenta_destino: str, total: float) -> Dict:
+                       cuenta_destino: str, total: float,
+                       fecha: Optional[date] = None) -> Dict:
         """
         Realiza una compra en efectivo
         
         Returns:
             Dict con detalles de la transacción
         """
+        total = self._cuantizar(total)
         subtotal, iva = self.calcular_iva(total, incluye_iva=True)
         
         # Verificar fondos
@@ -173,12 +741,15 @@ class BalanceModel:
         tiene_fondos = fondos_disponibles >= total
         
         # Actualizar cuentas
-        self.estado_actual['ACTIVO_CIRCULANTE'][cuenta_pago] -= total
-        self.estado_actual[tipo_destino][cuenta_destino] += subtotal
-        self.estado_actual['ACTIVO_CIRCULANTE']['IVA ACREDITABLE'] += iva
+        asiento = self._registrar_asiento('COMPRA EFECTIVO', [
+            ('ACTIVO_CIRCULANTE', cuenta_pago, -total),
+            (tipo_destino, cuenta_destino, subtotal),
+            ('ACTIVO_CIRCULANTE', 'IVA ACREDITABLE', iva)
+        ], fecha)
         
         return {
             'tipo': 'COMPRA EFECTIVO',
+            'secuencia': asiento.secuencia,
             'cuenta_pago': cuenta_pago,
             'cuenta_destino': cuenta_destino,
             'total': total,
@@ -188,7 +759,8 @@ class BalanceModel:
         }
     
     def compra_credito(self, compras: List[Tuple[str, str, float]], 
-                      tipo_pasivo: str, cuenta_pasivo: str) -> Dict:
+                      tipo_pasivo: str, cuenta_pasivo: str,
+                      fecha: Optional[date] = None) -> Dict:
         """
         Realiza una compra a crédito con múltiples conceptos
         
@@ -196,6 +768,7 @@ class BalanceModel:
             compras: Lista de (tipo_activo, cuenta, total)
             tipo_pasivo: Categoría del pasivo
             cuenta_pasivo: Cuenta de pasivo
+            fecha: Fecha del asiento (hoy si no se indica)
         
         Returns:
             Dict con detalles de la transacción
@@ -203,12 +776,14 @@ class BalanceModel:
         total_credito = 0
         total_iva = 0
         detalles = []
+        movimientos = []
         
         for tipo_activo, cuenta, total in compras:
+            total = self._cuantizar(total)
             subtotal, iva = self.calcular_iva(total, incluye_iva=True)
             
             # Actualizar activo
-            self.estado_actual[tipo_activo][cuenta] += subtotal
+            movimientos.append((tipo_activo, cuenta, subtotal))
             total_iva += iva
             total_credito += total
             
@@ -219,12 +794,18 @@ class BalanceModel:
                 'iva': iva
             })
         
+        total_credito = self._cuantizar(total_credito)
+        total_iva = self._cuantizar(total_iva)
+        
         # Actualizar IVA y pasivo
-        self.estado_actual['ACTIVO_CIRCULANTE']['IVA POR ACREDITAR'] += total_iva
-        self.estado_actual[tipo_pasivo][cuenta_pasivo] += total_credito
+        movimientos.append(('ACTIVO_CIRCULANTE', 'IVA POR ACREDITAR', total_iva))
+        movimientos.append((tipo_pasivo, cuenta_pasivo, total_credito))
+        
+        asiento = self._registrar_asiento('COMPRA CREDITO', movimientos, fecha)
         
         return {
             'tipo': 'COMPRA CREDITO',
+            'secuencia': asiento.secuencia,
             'detalles': detalles,
             'total_credito': total_credito,
             'total_iva': total_iva,
@@ -234,31 +815,39 @@ class BalanceModel:
     def compra_combinada(self, cuenta_pago: str, tipo_destino: str,
                         cuenta_destino: str, tipo_pasivo: str,
                         cuenta_pasivo: str, total: float, 
-                        porcentaje_anticipo: float) -> Dict:
+                        porcentaje_anticipo: float,
+                        fecha: Optional[date] = None) -> Dict:
         """
         Realiza una compra combinada (anticipo + crédito)
         
         Returns:
             Dict con detalles de la transacción
         """
+        total = self._cuantizar(total)
         subtotal, iva_total = self.calcular_iva(total, incluye_iva=True)
         
         # Calcular anticipo y deuda
-        anticipo = total * porcentaje_anticipo
-        deuda = total - anticipo
+        anticipo = self._porcion(total, porcentaje_anticipo)
+        deuda = self._cuantizar(total - anticipo)
         
+        # El IVA de la deuda es el resto del IVA total, así anticipo y
+        # deuda suman exactamente el IVA de la factura
         sub_anticipo, iva_anticipo = self.calcular_iva(anticipo, incluye_iva=True)
-        sub_deuda, iva_deuda = self.calcular_iva(deuda, incluye_iva=True)
+        iva_deuda = self._cuantizar(iva_total - iva_anticipo)
+        sub_deuda = self._cuantizar(deuda - iva_deuda)
         
         # Actualizar cuentas
-        self.estado_actual['ACTIVO_CIRCULANTE'][cuenta_pago] -= anticipo
-        self.estado_actual[tipo_destino][cuenta_destino] += subtotal
-        self.estado_actual['ACTIVO_CIRCULANTE']['IVA ACREDITABLE'] += iva_anticipo
-        self.estado_actual['ACTIVO_CIRCULANTE']['IVA POR ACREDITAR'] += iva_deuda
-        self.estado_actual[tipo_pasivo][cuenta_pasivo] += deuda
+        asiento = self._registrar_asiento('COMPRA COMBINADA', [
+            ('ACTIVO_CIRCULANTE', cuenta_pago, -anticipo),
+            (tipo_destino, cuenta_destino, subtotal),
+            ('ACTIVO_CIRCULANTE', 'IVA ACREDITABLE', iva_anticipo),
+            ('ACTIVO_CIRCULANTE', 'IVA POR ACREDITAR', iva_deuda),
+            (tipo_pasivo, cuenta_pasivo, deuda)
+        ], fecha)
         
         return {
             'tipo': 'COMPRA COMBINADA',
+            'secuencia': asiento.secuencia,
             'cuenta_pago': cuenta_pago,
             'cuenta_destino': cuenta_destino,
             'cuenta_pasivo': cuenta_pasivo,
@@ -275,34 +864,35 @@ class BalanceModel:
         }
     
     def anticipo_clientes(self, cuenta_recibe: str, total_venta: float,
-                         porcentaje_anticipo: float) -> Dict:
+                         porcentaje_anticipo: float,
+                         fecha: Optional[date] = None) -> Dict:
         """
         Registra un anticipo de clientes
         
         Returns:
             Dict con detalles de la transacción
         """
+        total_venta = self._cuantizar(total_venta)
         subtotal, iva_total = self.calcular_iva(total_venta, incluye_iva=True)
         
-        anticipo = total_venta * porcentaje_anticipo
+        anticipo = self._porcion(total_venta, porcentaje_anticipo)
         sub_anticipo, iva_anticipo = self.calcular_iva(anticipo, incluye_iva=True)
         
-        # Actualizar cuentas
-        self.estado_actual['ACTIVO_CIRCULANTE'][cuenta_recibe] += anticipo
-        
-        # Crear o actualizar cuentas de anticipo
-        if 'ANTICIPO CLIENTES' in self.estado_actual['CAPITAL']:
-            self.estado_actual['CAPITAL']['ANTICIPO CLIENTES'] += sub_anticipo
-        else:
-            self.estado_actual['CAPITAL']['ANTICIPO CLIENTES'] = sub_anticipo
+        # Crear cuentas de anticipo si no existen
+        for cuenta in ('ANTICIPO CLIENTES', 'IVA TRASLADO'):
+            if cuenta not in self.catalogo['CAPITAL']:
+                self.agregar_cuenta('CAPITAL', cuenta, 0.0)
         
-        if 'IVA TRASLADO' in self.estado_actual['CAPITAL']:
-            self.estado_actual['CAPITAL']['IVA TRASLADO'] += iva_anticipo
-        else:
-            self.estado_actual['CAPITAL']['IVA TRASLADO'] = iva_anticipo
+        # Actualizar cuentas
+        asiento = self._registrar_asiento('ANTICIPO CLIENTES', [
+            ('ACTIVO_CIRCULANTE', cuenta_recibe, anticipo),
+            ('CAPITAL', 'ANTICIPO CLIENTES', sub_anticipo),
+            ('CAPITAL', 'IVA TRASLADO', iva_anticipo)
+        ], fecha)
         
         return {
             'tipo': 'ANTICIPO CLIENTES',
+            'secuencia': asiento.secuencia,
             'cuenta_recibe': cuenta_recibe,
             'total_venta': total_venta,
             'subtotal': subtotal,
@@ -313,14 +903,63 @@ class BalanceModel:
             'porcentaje_anticipo': porcentaje_anticipo * 100
         }
     
+    def aplicar_lote(self, tipo: str, columnas: Dict,
+                     fecha: Optional[date] = None) -> Dict:
+        """
+        Aplica un lote de transacciones del mismo tipo en forma vectorizada
+        
+        Args:
+            tipo: 'COMPRA EFECTIVO', 'COMPRA CREDITO', 'COMPRA COMBINADA'
+                  o 'ANTICIPO CLIENTES'
+            columnas: Un arreglo (o escalar) por parámetro; ver
+                      models.operaciones.COLUMNAS_LOTE
+            fecha: Fecha del asiento del lote (hoy si no se indica)
+        
+        Returns:
+            Dict con el resumen del lote. Todo el lote se registra como un
+            solo asiento con el movimiento neto de cada cuenta; un lote sin
+            operaciones no registra nada (secuencia None).
+        """
+        from models.lotes import calcular_movimientos, agrupar_movimientos
+        
+        partes, resumen = calcular_movimientos(tipo, columnas, self.tasa_iva,
+                                               centavos=self.centavos)
+        if not resumen['operaciones']:
+            return {'tipo': f'LOTE {tipo}', 'secuencia': None, 'cuentas_afectadas': 0,
+                    **resumen}
+        
+        if tipo == 'ANTICIPO CLIENTES':
+            for cuenta in ('ANTICIPO CLIENTES', 'IVA TRASLADO'):
+                if cuenta not in self.catalogo['CAPITAL']:
+                    self.agregar_cuenta('CAPITAL', cuenta, 0.0)
+        
+        asiento = self._registrar_asiento(
+            f'LOTE {tipo}', agrupar_movimientos(partes, centavos=self.centavos), fecha
+        )
+        
+        return {
+            'tipo': f'LOTE {tipo}',
+            'secuencia': asiento.secuencia,
+            'cuentas_afectadas': len(asiento.movimientos),
+            **resumen
+        }
+    
     def reiniciar(self):
-        """Reinicia el estado al inicial"""
+        """Reinicia el estado al catálogo y descarta los asientos del diario"""
         self.estado_actual = self._copiar_catalogo()
+        self.estado_inicial = self._copiar_catalogo()
+        self._subtotales_iniciales = dict(self._subtotales_catalogo)
+        self._subtotales = dict(self._subtotales_catalogo)
+        self._arbol = None
+        self._saldos_anteriores = None
+        self.diario.limpiar()
+        self.puntos_control.limpiar()
+        self.notificar_reemplazo()
     
     def exportar_estado(self) -> Dict:
         """Exporta el estado actual completo"""
         return {
-            'catalogo': self.catalogo,
-            'estado_actual': self.estado_actual,
+            'catalogo': self.catalogo.a_dict(),
+            'estado_actual': self.estado_actual.a_dict(),
             'totales': self.calcular_totales()
         }
@@ -0,0 +1,272 @@
+"""
+models/base_datos.py
+Persistencia del catálogo, los saldos y el libro diario en SQLite
+
+La base se abre en modo WAL. Los asientos nuevos se acumulan en memoria y
+se escriben con executemany en una sola transacción cuando se juntan
+`lote_commit` asientos o pasan `intervalo_commit` segundos desde la última
+escritura (y siempre al llamar confirmar() o cerrar()). El plazo se revisa
+al sincronizar y en confirmar_vencido(), que quien usa la base llama
+periódicamente para que una sesión inactiva no deje asientos sin escribir.
+
+La conexión se puede usar desde cualquier hilo (p. ej. una Tarea que
+escribe en segundo plano): cada método toma el candado de la base.
+"""
+
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from typing import Dict, Iterator, List, Tuple
+
+VERSION_ESQUEMA = 1
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cuentas (
+    categoria TEXT NOT NULL,
+    cuenta TEXT NOT NULL,
+    orden INTEGER NOT NULL,
+    saldo_catalogo REAL NOT NULL,
+    saldo_actual REAL NOT NULL,
+    PRIMARY KEY (categoria, cuenta)
+);
+CREATE TABLE IF NOT EXISTS asientos (
+    secuencia INTEGER PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    tipo TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS movimientos (
+    secuencia INTEGER NOT NULL REFERENCES asientos (secuencia),
+    orden INTEGER NOT NULL,
+    categoria TEXT NOT NULL,
+    cuenta TEXT NOT NULL,
+    importe REAL NOT NULL,
+    PRIMARY KEY (secuencia, orden)
+);
+CREATE INDEX IF NOT EXISTS idx_movimientos_cuenta ON movimientos (cuenta, categoria);
+CREATE INDEX IF NOT EXISTS idx_asientos_fecha ON asientos (fecha);
+CREATE INDEX IF NOT EXISTS idx_asientos_tipo ON asientos (tipo);
+"""
+
+
+def leer_saldos(ruta: str) -> Dict[str, Dict[str, float]]:
+    """
+    Saldos actuales guardados en una base, sin abrirla para escritura
+
+    Para leer la base desde otro proceso (p. ej. al consolidar); solo ve lo
+    ya confirmado.
+    """
+    saldos: Dict[str, Dict[str, float]] = {}
+    conexion = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)
+    try:
+        for categoria, cuenta, saldo in conexion.execute(
+                "SELECT categoria, cuenta, saldo_actual FROM cuentas ORDER BY orden"):
+            saldos.setdefault(categoria, {})[cuenta] = saldo
+    finally:
+        conexion.close()
+    return saldos
+
+
+class BaseDatos:
+    """Base SQLite sincronizada con un BalanceModel"""
+
+    def __init__(self, ruta: str, lote_commit: int = 1000,
+                 intervalo_commit: float = 1.0):
+        self.ruta = ruta
+        self.lote_commit = lote_commit
+        self.intervalo_commit = intervalo_commit
+
+        # Una sola conexión compartida entre hilos; el candado serializa su uso
+        self._candado = threading.RLock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(ESQUEMA)
+        self._conexion.execute(
+            "INSERT OR IGNORE INTO meta VALUES ('version', ?)", (str(VERSION_ESQUEMA),)
+        )
+        self._conexion.commit()
+
+        # Asientos del diario ya enviados y filas pendientes de escribir
+        self._guardados = 0
+        self._ultima_secuencia = None
+        self._version_catalogo = None
+        self._asientos: List[Tuple] = []
+        self._movimientos: List[Tuple] = []
+        self._cuentas_tocadas = set()
+        self._ultimo_commit = time.monotonic()
+
+    # === LECTURA ===
+
+    def esta_vacia(self) -> bool:
+        """True si la base aún no tiene catálogo"""
+        with self._candado:
+            return self._conexion.execute("SELECT 1 FROM cuentas LIMIT 1").fetchone() is None
+
+    def cargar(self, modelo):
+        """
+        Carga catálogo, saldos y diario en el modelo en una sola pasada
+
+        Los saldos actuales se leen tal cual, por lo que los asientos no se
+        vuelven a aplicar.
+        """
+        catalogo: Dict[str, Dict[str, float]] = {c: {} for c in modelo.catalogo}
+        saldos: Dict[str, Dict[str, float]] = {c: {} for c in modelo.catalogo}
+
+        with self._candado:
+            for categoria, cuenta, saldo_catalogo, saldo_actual in self._conexion.execute(
+                    "SELECT categoria, cuenta, saldo_catalogo, saldo_actual "
+                    "FROM cuentas ORDER BY orden"):
+                catalogo.setdefault(categoria, {})[cuenta] = saldo_catalogo
+                saldos.setdefault(categoria, {})[cuenta] = saldo_actual
+
+            # cargar_estado consume el generador de asientos dentro del candado
+            modelo.cargar_estado(catalogo, self._leer_asientos(), saldos)
+            self._marcar_guardados(modelo)
+            self._version_catalogo = modelo.version_catalogo
+
+    def _leer_asientos(self) -> Iterator[Dict]:
+        """Asientos con sus movimientos, en orden de secuencia"""
+        filas = self._conexion.execute(
+            "SELECT a.secuencia, a.fecha, a.tipo, m.categoria, m.cuenta, m.importe "
+            "FROM asientos a LEFT JOIN movimientos m ON m.secuencia = a.secuencia "
+            "ORDER BY a.secuencia, m.orden"
+        )
+        for (secuencia, fecha, tipo), grupo in groupby(filas, key=lambda f: f[:3]):
+            yield {
+                'secuencia': secuencia,
+                'fecha': fecha,
+                'tipo': tipo,
+                'movimientos': [f[3:] for f in grupo if f[3] is not None]
+            }
+
+    # === ESCRITURA ===
+
+    def sincronizar(self, modelo):
+        """
+        Agrega a la cola los asientos nuevos del diario
+
+        Si el diario ya no contiene el último asiento guardado (se reinició
+        o se cargó otro), se reescribe todo.
+        """
+        with self._candado:
+            if self._guardados > len(modelo.diario) or (
+                    self._guardados and
+                    modelo.diario.desde(self._guardados - 1)[0].secuencia != self._ultima_secuencia):
+                self.guardar_todo(modelo)
+                return
+
+            for asiento in modelo.diario.desde(self._guardados):
+                self._asientos.append((asiento.secuencia, asiento.fecha.isoformat(), asiento.tipo))
+                for orden, (categoria, cuenta, importe) in enumerate(asiento.movimientos):
+                    self._movimientos.append((asiento.secuencia, orden, categoria, cuenta, importe))
+                    self._cuentas_tocadas.add((categoria, cuenta))
+            self._marcar_guardados(modelo)
+
+            if modelo.version_catalogo != self._version_catalogo:
+                self.guardar_cuentas(modelo)
+            elif len(self._asientos) >= self.lote_commit:
+                self.confirmar(modelo)
+            else:
+                self.confirmar_vencido(modelo)
+
+    def confirmar_vencido(self, modelo) -> bool:
+        """
+        Escribe los asientos pendientes si pasaron `intervalo_commit`
+        segundos desde la última escritura
+
+        Returns:
+            True si escribió algo
+        """
+        with self._candado:
+            if not self._asientos or \
+                    time.monotonic() - self._ultimo_commit < self.intervalo_commit:
+                return False
+            self.confirmar(modelo)
+            return True
+
+    def confirmar(self, modelo):
+        """Escribe los asientos pendientes y los saldos que cambiaron"""
+        with self._candado:
+            if self._asientos:
+                estado = modelo.estado_actual
+                saldos = [
+                    (estado[categoria][cuenta], categoria, cuenta)
+                    for categoria, cuenta in self._cuentas_tocadas
+                    if cuenta in estado[categoria]
+                ]
+                with self._conexion:
+                    self._conexion.executemany(
+                        "INSERT INTO asientos VALUES (?, ?, ?)", self._asientos)
+                    self._conexion.executemany(
+                        "INSERT INTO movimientos VALUES (?, ?, ?, ?, ?)", self._movimientos)
+                    self._conexion.executemany(
+                        "UPDATE cuentas SET saldo_actual = ? WHERE categoria = ? AND cuenta = ?",
+                        saldos)
+                self._asientos = []
+                self._movimientos = []
+                self._cuentas_tocadas = set()
+            self._ultimo_commit = time.monotonic()
+
+    def guardar_cuentas(self, modelo):
+        """Reescribe el catálogo y los saldos (tras agregar, modificar o eliminar)"""
+        with self._candado:
+            self.confirmar(modelo)
+            with self._conexion:
+                self._conexion.execute("DELETE FROM cuentas")
+                self._conexion.executemany(
+                    "INSERT INTO cuentas VALUES (?, ?, ?, ?, ?)", self._filas_cuentas(modelo))
+            self._version_catalogo = modelo.version_catalogo
+
+    def guardar_todo(self, modelo):
+        """Reemplaza todo el contenido de la base por el del modelo"""
+        with self._candado:
+            self._asientos = []
+            self._movimientos = []
+            self._cuentas_tocadas = set()
+
+            asientos = [(a.secuencia, a.fecha.isoformat(), a.tipo) for a in modelo.diario]
+            movimientos = [
+                (a.secuencia, orden, categoria, cuenta, importe)
+                for a in modelo.diario
+                for orden, (categoria, cuenta, importe) in enumerate(a.movimientos)
+            ]
+            with self._conexion:
+                for tabla in ('movimientos', 'asientos', 'cuentas'):
+                    self._conexion.execute(f"DELETE FROM {tabla}")
+                self._conexion.executemany(
+                    "INSERT INTO cuentas VALUES (?, ?, ?, ?, ?)", self._filas_cuentas(modelo))
+                self._conexion.executemany("INSERT INTO asientos VALUES (?, ?, ?)", asientos)
+                self._conexion.executemany(
+                    "INSERT INTO movimientos VALUES (?, ?, ?, ?, ?)", movimientos)
+
+            self._marcar_guardados(modelo)
+            self._version_catalogo = modelo.version_catalogo
+            self._ultimo_commit = time.monotonic()
+
+    def _marcar_guardados(self, modelo):
+        """Recuerda hasta qué asiento del diario ya se envió a la base"""
+        ultimo = modelo.diario.ultimo
+        self._guardados = len(modelo.diario)
+        self._ultima_secuencia = ultimo.secuencia if ultimo else None
+
+    @staticmethod
+    def _filas_cuentas(modelo) -> Iterator[Tuple]:
+        orden = 0
+        for categoria, cuentas in modelo.catalogo.items():
+            actuales = modelo.estado_actual[categoria]
+            for cuenta, saldo in cuentas.items():
+                yield categoria, cuenta, orden, saldo, actuales.get(cuenta, saldo)
+                orden += 1
+
+    def cerrar(self, modelo=None):
+        """Escribe lo pendiente (si se indica el modelo) y cierra la conexión"""
+        with self._candado:
+            if modelo is not None:
+                self.sincronizar(modelo)
+                self.confirmar(modelo)
+            self._conexion.close()
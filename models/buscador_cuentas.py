@@ -0,0 +1,222 @@
+"""
+models/buscador_cuentas.py
+Índice de búsqueda de cuentas por nombre (autocompletado y búsqueda aproximada)
+
+Mantiene el nombre de cada cuenta en listas ordenadas (nombre completo y
+cada palabra) para buscar por prefijo con bisect, y un índice de trigramas
+para sugerir nombres parecidos cuando no hay coincidencias exactas. Las
+búsquedas no distinguen mayúsculas ni acentos.
+"""
+
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Candidatos (por trigramas en común) que se comparan con SequenceMatcher
+CANDIDATOS_APROXIMADOS = 200
+
+# Cuenta encontrada: (categoría, nombre)
+Resultado = Tuple[str, str]
+
+
+def normalizar(texto: str) -> str:
+    """Mayúsculas, sin acentos y con espacios simples"""
+    sin_acentos = unicodedata.normalize('NFKD', texto)
+    sin_acentos = ''.join(c for c in sin_acentos if not unicodedata.combining(c))
+    return ' '.join(sin_acentos.upper().split())
+
+
+def _trigramas(clave: str) -> Set[str]:
+    relleno = f" {clave} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class BuscadorCuentas:
+    """
+    Índice nombre -> categorías con búsqueda por prefijo y aproximada
+
+    Altas y bajas cuestan O(n) por el desplazamiento en las listas
+    ordenadas (memmove, rápido aun con decenas de miles de cuentas); las
+    búsquedas por prefijo son O(log n + resultados).
+    """
+
+    def __init__(self, catalogo: Optional[Mapping[str, Iterable[str]]] = None):
+        # nombre -> categorías donde existe (en orden de alta)
+        self._categorias: Dict[str, List[str]] = {}
+
+        # (clave normalizada, nombre, categoría) ordenados
+        self._nombres: List[Tuple[str, str, str]] = []
+
+        # (palabra, nombre, categoría) para la segunda palabra en adelante
+        self._palabras: List[Tuple[str, str, str]] = []
+
+        # trigrama -> {(nombre, categoría)}; se crea con la primera búsqueda
+        # aproximada
+        self._trigramas: Optional[Dict[str, Set[Tuple[str, str]]]] = None
+
+        if catalogo is not None:
+            entradas = [(normalizar(nombre), nombre, categoria)
+                        for categoria, nombres in catalogo.items() for nombre in nombres]
+            for clave, nombre, categoria in entradas:
+                self._indexar(clave, nombre, categoria)
+            self._nombres = sorted(entradas)
+            self._palabras.sort()
+
+    def _indexar(self, clave: str, nombre: str, categoria: str):
+        """Registra una cuenta en el índice de nombres y el de palabras"""
+        self._categorias.setdefault(nombre, []).append(categoria)
+        for palabra in clave.split()[1:]:
+            self._palabras.append((palabra, nombre, categoria))
+
+    def preparar(self):
+        """
+        Crea ya el índice de trigramas (si no, lo crea la primera búsqueda
+        aproximada); después de esto las consultas no modifican el buscador
+        """
+        self._indice_trigramas()
+
+    def _indice_trigramas(self) -> Dict[str, Set[Tuple[str, str]]]:
+        if self._trigramas is None:
+            self._trigramas = {}
+            for clave, nombre, categoria in self._nombres:
+                for trigrama in _trigramas(clave):
+                    self._trigramas.setdefault(trigrama, set()).add((nombre, categoria))
+        return self._trigramas
+
+    # === MANTENIMIENTO ===
+
+    def agregar(self, categoria: str, nombre: str):
+        """Agrega una cuenta (no hace nada si ya está)"""
+        if categoria in self._categorias.get(nombre, ()):
+            return
+        clave = normalizar(nombre)
+        self._categorias.setdefault(nombre, []).append(categoria)
+        insort(self._nombres, (clave, nombre, categoria))
+        for palabra in clave.split()[1:]:
+            insort(self._palabras, (palabra, nombre, categoria))
+        if self._trigramas is not None:
+            for trigrama in _trigramas(clave):
+                self._trigramas.setdefault(trigrama, set()).add((nombre, categoria))
+
+    def eliminar(self, categoria: str, nombre: str):
+        """Quita una cuenta (no hace nada si no está)"""
+        categorias = self._categorias.get(nombre)
+        if not categorias or categoria not in categorias:
+            return
+        categorias.remove(categoria)
+        if not categorias:
+            del self._categorias[nombre]
+
+        clave = normalizar(nombre)
+        for lista, entrada in [(self._nombres, (clave, nombre, categoria))] + [
+            (self._palabras, (palabra, nombre, categoria)) for palabra in clave.split()[1:]
+        ]:
+            posicion = bisect_left(lista, entrada)
+            if posicion < len(lista) and lista[posicion] == entrada:
+                del lista[posicion]
+        if self._trigramas is not None:
+            for trigrama in _trigramas(clave):
+                cuentas = self._trigramas.get(trigrama)
+                if cuentas is not None:
+                    cuentas.discard((nombre, categoria))
+                    if not cuentas:
+                        del self._trigramas[trigrama]
+
+    # === CONSULTAS ===
+
+    def categorias_de(self, nombre: str) -> List[str]:
+        """Categorías en las que existe una cuenta con ese nombre exacto"""
+        return list(self._categorias.get(nombre, ()))
+
+    @staticmethod
+    def _con_prefijo(lista: List[Tuple[str, str, str]], prefijo: str,
+                     categoria: Optional[str], limite: int) -> List[Resultado]:
+        resultados = []
+        for i in range(bisect_left(lista, (prefijo,)), len(lista)):
+            clave, nombre, cat = lista[i]
+            if not clave.startswith(prefijo) or len(resultados) >= limite:
+                break
+            if categoria is None or cat == categoria:
+                resultados.append((cat, nombre))
+        return resultados
+
+    def por_prefijo(self, prefijo: str, categoria: Optional[str] = None,
+                    limite: int = 50) -> List[Resultado]:
+        """
+        Cuentas cuyo nombre empieza con el prefijo, en orden alfabético
+
+        Con una categoría que tenga pocas cuentas entre muchas el recorrido
+        salta las de otras categorías, así que sigue siendo lineal en las
+        coincidencias del prefijo, no en el catálogo.
+        """
+        return self._con_prefijo(self._nombres, normalizar(prefijo), categoria, limite)
+
+    def aproximadas(self, texto: str, categoria: Optional[str] = None,
+                    limite: int = 10, minimo: float = 0.5) -> List[Resultado]:
+        """
+        Cuentas con nombre parecido (errores de captura, palabras en otro
+        orden), de la más a la menos parecida
+
+        Args:
+            minimo: Parecido mínimo entre 0 y 1 (SequenceMatcher.ratio)
+        """
+        clave = normalizar(texto)
+        if not clave:
+            return []
+
+        # Los trigramas raros primero: los muy comunes (p. ej. de una
+        # palabra que repiten miles de cuentas) solo suman a los candidatos
+        # que ya se tienen, así el costo no crece con el catálogo
+        indice = self._indice_trigramas()
+        listas = sorted((indice.get(t, ()) for t in _trigramas(clave)), key=len)
+        comunes: Counter = Counter()
+        for cuentas in listas:
+            if len(comunes) < CANDIDATOS_APROXIMADOS or len(cuentas) <= len(comunes):
+                for cuenta in cuentas:
+                    if categoria is None or cuenta[1] == categoria:
+                        comunes[cuenta] += 1
+            else:
+                for cuenta in comunes:
+                    if cuenta in cuentas:
+                        comunes[cuenta] += 1
+
+        comparador = SequenceMatcher(b=clave, autojunk=False)
+        puntuados = []
+        for (nombre, cat), _ in comunes.most_common(CANDIDATOS_APROXIMADOS):
+            comparador.set_seq1(normalizar(nombre))
+            parecido = comparador.ratio()
+            if parecido >= minimo:
+                puntuados.append((-parecido, nombre, cat))
+        puntuados.sort()
+        return [(cat, nombre) for _, nombre, cat in puntuados[:limite]]
+
+    def buscar(self, texto: str, categoria: Optional[str] = None,
+               limite: int = 50) -> List[Resultado]:
+        """
+        Búsqueda para autocompletar
+
+        Primero las cuentas que empiezan con el texto, luego las que tienen
+        una palabra que empieza con él y, si no hay ninguna, las parecidas.
+        """
+        clave = normalizar(texto)
+        resultados = self._con_prefijo(self._nombres, clave, categoria, limite)
+        if clave and len(resultados) < limite:
+            vistos = set(resultados)
+            # Cada cuenta puede aparecer una vez por palabra
+            for resultado in self._con_prefijo(self._palabras, clave, categoria, 4 * limite):
+                if resultado not in vistos:
+                    vistos.add(resultado)
+                    resultados.append(resultado)
+                    if len(resultados) >= limite:
+                        break
+            if not resultados:
+                resultados = self.aproximadas(clave, categoria, limite)
+        return resultados
+
+    def __len__(self) -> int:
+        return len(self._nombres)
+
+    def __contains__(self, nombre) -> bool:
+        return nombre in self._categorias
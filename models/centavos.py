@@ -0,0 +1,70 @@
+"""
+models/centavos.py
+Aritmética de punto fijo en centavos enteros
+
+Todo redondeo lleva la mitad lejos del cero (1.005 -> 1.01, -1.005 ->
+-1.01), no al par como round(); así el importe inverso de un movimiento
+redondea exactamente al inverso.
+"""
+
+import math
+from typing import Tuple
+
+# Las tasas se expresan en diezmilésimos (0.16 -> 1600)
+ESCALA_TASA = 10000
+
+
+def redondear(valor: float) -> int:
+    """
+    Entero más cercano, con la mitad lejos del cero
+
+    Antes se descarta el error binario de la multiplicación (1.005 * 100
+    da 100.49999999999999), que de otro modo bajaría una mitad exacta.
+    """
+    entero = math.floor(round(abs(valor), 6) + 0.5)
+    return entero if valor >= 0 else -entero
+
+
+def a_centavos(monto: float) -> int:
+    """Convierte un importe en pesos a centavos enteros"""
+    return redondear(monto * 100)
+
+
+def de_centavos(centavos: int) -> float:
+    """Convierte centavos enteros a pesos"""
+    return centavos / 100
+
+
+def tasa_entera(tasa: float) -> int:
+    """Convierte una tasa (0.16) a diezmilésimos enteros (1600)"""
+    return redondear(tasa * ESCALA_TASA)
+
+
+def dividir_redondeando(numerador: int, denominador: int) -> int:
+    """División entera (denominador positivo) con la mitad lejos del cero"""
+    if numerador < 0:
+        return -((-2 * numerador + denominador) // (2 * denominador))
+    return (2 * numerador + denominador) // (2 * denominador)
+
+
+def calcular_iva_centavos(monto: int, tasa: float,
+                          incluye_iva: bool = False) -> Tuple[int, int]:
+    """
+    Calcula el IVA en centavos enteros
+
+    Con incluye_iva=True el subtotal se redondea y el IVA se obtiene por
+    diferencia, de modo que subtotal + iva == monto exactamente.
+
+    Returns:
+        Tuple (subtotal, iva) en centavos
+    """
+    tasa_dm = tasa_entera(tasa)
+
+    if incluye_iva:
+        subtotal = dividir_redondeando(monto * ESCALA_TASA, ESCALA_TASA + tasa_dm)
+        iva = monto - subtotal
+    else:
+        subtotal = monto
+        iva = dividir_redondeando(monto * tasa_dm, ESCALA_TASA)
+
+    return subtotal, iva
@@ -0,0 +1,214 @@
+"""
+models/consolidacion.py
+Consolidación de los balances de varias empresas
+
+Cada proceso del pool recibe un grupo de empresas, calcula sus totales y
+devuelve la suma parcial de sus cuentas; el proceso principal junta una
+suma parcial por grupo y aplica las eliminaciones entre compañías.
+
+Una empresa se envía como su estado en diccionarios o como la ruta de su
+base (SQLite o .blib), que el proceso del pool lee por su cuenta: así el
+proceso principal no copia ni serializa sus saldos. Lo que queda en el
+proceso principal crece con las empresas (repartirlas y, si se envían en
+diccionarios, copiarlas) y con las cuentas distintas por grupo (juntar las
+sumas). Con pocas empresas (menos de 2 * MIN_EMPRESAS_POR_PROCESO, por
+omisión) no se usa el pool, porque arrancarlo cuesta más que el cálculo.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from models.almacenamiento import crear_estado
+
+# Grupos por proceso, para repartir la carga aunque las empresas difieran
+GRUPOS_POR_PROCESO = 4
+
+# Con menos empresas por proceso el arranque del pool cuesta más que el cálculo
+MIN_EMPRESAS_POR_PROCESO = 50
+
+
+class Eliminacion(NamedTuple):
+    """
+    Saldos recíprocos entre dos empresas que se eliminan al consolidar
+
+    Si no se indica el importe se elimina el saldo de menor magnitud de
+    ambos lados (nada si tienen signos distintos); la diferencia entre
+    ambos se reporta como no conciliada.
+    """
+    empresa: str
+    categoria: str
+    cuenta: str
+    contraparte: str
+    categoria_contraparte: str
+    cuenta_contraparte: str
+    importe: Optional[float] = None
+
+
+# Estado categoría -> {cuenta: saldo} o ruta de la base de la empresa
+Saldos = Union[Dict[str, Dict[str, float]], str]
+
+
+def leer_saldos(ruta: str) -> Dict[str, Dict[str, float]]:
+    """Saldos actuales guardados en una base SQLite o un libro binario (.blib)"""
+    if ruta.lower().endswith('.blib'):
+        from models.libro_binario import LibroBinario
+        return LibroBinario(ruta).saldos()
+
+    from models.base_datos import leer_saldos as leer_saldos_sqlite
+    return leer_saldos_sqlite(ruta)
+
+
+def procesos_para(empresas: int, procesos: Optional[int] = None) -> int:
+    """Procesos que usa consolidar (1 = sin pool) para ese número de empresas"""
+    if procesos is None:
+        procesos = min(os.cpu_count() or 1, empresas // MIN_EMPRESAS_POR_PROCESO)
+    return max(1, procesos) if empresas > 1 else 1
+
+
+def _consolidar_grupo(almacenamiento: str, empresas: List[Tuple[str, Saldos]],
+                      requeridas: Dict[str, List[Tuple[str, str]]]
+                      ) -> Tuple[Dict[str, Dict], Dict[str, Dict[str, float]], Dict[Tuple, float]]:
+    """
+    Totales de cada empresa del grupo, suma de sus cuentas (en unidades) y
+    saldo de las cuentas `requeridas` (las de las eliminaciones)
+
+    Se ejecuta en un proceso del pool, por lo que solo recibe y devuelve
+    diccionarios simples (o rutas, que lee aquí).
+    """
+    from models.balance_model import BalanceModel
+
+    totales: Dict[str, Dict] = {}
+    suma: Dict[str, Dict[str, float]] = {}
+    encontrados: Dict[Tuple, float] = {}
+
+    for nombre, saldos in empresas:
+        if isinstance(saldos, str):
+            saldos = leer_saldos(saldos)
+        for categoria, cuenta in requeridas.get(nombre, ()):
+            if cuenta in saldos.get(categoria, {}):
+                encontrados[(nombre, categoria, cuenta)] = saldos[categoria][cuenta]
+
+        estado = crear_estado(almacenamiento, saldos)
+        totales[nombre] = BalanceModel._totales(estado.sumar_categorias(), estado)
+
+        a_unidad = estado.a_unidad
+        for categoria, cuentas in saldos.items():
+            destino = suma.setdefault(categoria, {})
+            for cuenta, saldo in cuentas.items():
+                destino[cuenta] = destino.get(cuenta, 0) + a_unidad(saldo)
+
+    return totales, suma, encontrados
+
+
+def _repartir(empresas: List[Tuple[str, Saldos]], grupos: int) -> List[List[Tuple[str, Saldos]]]:
+    """Divide la lista en `grupos` partes de tamaño parecido"""
+    tamano = -(-len(empresas) // grupos)
+    return [empresas[i:i + tamano] for i in range(0, len(empresas), tamano)]
+
+
+def consolidar(estados: Dict[str, Saldos],
+               almacenamiento: str = 'diccionario',
+               eliminaciones: Iterable[Eliminacion] = (),
+               procesos: Optional[int] = None) -> Dict:
+    """
+    Balance general consolidado de varias empresas
+
+    Args:
+        estados: Nombre de la empresa -> estado categoría -> {cuenta: saldo}
+                 o ruta de su base (ya confirmada), que se lee en el pool
+        almacenamiento: Motor con el que se suman los saldos ('centavos'
+                        suma sin error de redondeo)
+        eliminaciones: Saldos entre compañías a eliminar
+        procesos: Procesos del pool (por omisión uno por núcleo, con al
+                  menos MIN_EMPRESAS_POR_PROCESO empresas cada uno); con 1
+                  todo se calcula en el proceso actual
+
+    Returns:
+        Dict con los totales de cada empresa, el estado consolidado, las
+        eliminaciones aplicadas y los totales consolidados
+
+    Raises:
+        KeyError: Si una eliminación menciona una empresa o cuenta inexistente
+    """
+    from models.balance_model import BalanceModel
+
+    eliminaciones = list(eliminaciones)
+    requeridas: Dict[str, List[Tuple[str, str]]] = {}
+    for eliminacion in eliminaciones:
+        for empresa, categoria, cuenta in (eliminacion[0:3], eliminacion[3:6]):
+            if empresa not in estados:
+                raise KeyError(f"Eliminación: no existe {empresa}: {categoria}/{cuenta}")
+            requeridas.setdefault(empresa, []).append((categoria, cuenta))
+
+    empresas = list(estados.items())
+    procesos = procesos_para(len(empresas), procesos)
+
+    if procesos == 1:
+        parciales = [_consolidar_grupo(almacenamiento, empresas, requeridas)]
+    else:
+        grupos = _repartir(empresas, procesos * GRUPOS_POR_PROCESO)
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            parciales = list(pool.map(
+                _consolidar_grupo, [almacenamiento] * len(grupos), grupos,
+                [requeridas] * len(grupos)
+            ))
+
+    # Juntar las sumas parciales (en unidades del motor)
+    totales_empresas: Dict[str, Dict] = {}
+    suma: Dict[str, Dict[str, float]] = {}
+    saldos_eliminaciones: Dict[Tuple, float] = {}
+    for totales, parcial, encontrados in parciales:
+        totales_empresas.update(totales)
+        saldos_eliminaciones.update(encontrados)
+        for categoria, cuentas in parcial.items():
+            destino = suma.setdefault(categoria, {})
+            for cuenta, valor in cuentas.items():
+                destino[cuenta] = destino.get(cuenta, 0) + valor
+
+    # La conversión entre pesos y unidades no depende del estado
+    unidades = crear_estado(almacenamiento, {})
+    a_unidad, de_unidad = unidades.a_unidad, unidades.de_unidad
+
+    for eliminacion in eliminaciones:
+        for clave in (tuple(eliminacion[0:3]), tuple(eliminacion[3:6])):
+            if clave not in saldos_eliminaciones:
+                raise KeyError(f"Eliminación: no existe {clave[0]}: {clave[1]}/{clave[2]}")
+
+    aplicadas = []
+    for eliminacion in eliminaciones:
+        saldo = a_unidad(saldos_eliminaciones[tuple(eliminacion[0:3])])
+        saldo_contraparte = a_unidad(saldos_eliminaciones[tuple(eliminacion[3:6])])
+        if eliminacion.importe is None:
+            # La parte recíproca tiene el signo de ambos saldos; si los
+            # signos difieren no hay nada que eliminar
+            if saldo > 0 and saldo_contraparte > 0:
+                importe = min(saldo, saldo_contraparte)
+            elif saldo < 0 and saldo_contraparte < 0:
+                importe = max(saldo, saldo_contraparte)
+            else:
+                importe = 0
+        else:
+            importe = a_unidad(eliminacion.importe)
+
+        suma[eliminacion.categoria][eliminacion.cuenta] -= importe
+        suma[eliminacion.categoria_contraparte][eliminacion.cuenta_contraparte] -= importe
+        aplicadas.append({
+            **eliminacion._asdict(),
+            'importe': de_unidad(importe),
+            'no_conciliado': de_unidad(abs(saldo - saldo_contraparte))
+        })
+
+    consolidado = {
+        categoria: {cuenta: de_unidad(valor) for cuenta, valor in cuentas.items()}
+        for categoria, cuentas in suma.items()
+    }
+    estado = crear_estado(almacenamiento, consolidado)
+
+    return {
+        'empresas': len(totales_empresas),
+        'totales_empresas': totales_empresas,
+        'estado': consolidado,
+        'eliminaciones': aplicadas,
+        'totales': BalanceModel._totales(estado.sumar_categorias(), estado)
+    }
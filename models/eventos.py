@@ -0,0 +1,140 @@
+"""
+models/eventos.py
+Eventos de cambio del modelo hacia las vistas
+
+BalanceModel publica un EventoCambio en su BusEventos por cada asiento y
+cada cambio al catálogo, con los deltas por cuenta, los totales nuevos y
+la secuencia del asiento. Solo se arma el evento si hay suscriptores.
+
+El bus combina los eventos pendientes: dentro de agrupados() (p. ej. una
+importación) o en modo diferido (la interfaz llama a despachar() desde su
+ciclo de eventos) mil asientos llegan como un solo evento.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+# Tipos de evento, del más particular al más general
+ASIENTO = 'ASIENTO'      # movimientos registrados en el diario
+CATALOGO = 'CATALOGO'    # cuenta agregada, modificada o eliminada
+ESTADO = 'ESTADO'        # estado reemplazado (carga, reinicio)
+
+_GENERALIDAD = {ASIENTO: 0, CATALOGO: 1, ESTADO: 2}
+
+Clave = Tuple[str, str]
+
+
+class EventoCambio(NamedTuple):
+    """
+    Cambio del estado actual
+
+    deltas: (categoría, cuenta) -> cambio de saldo
+    cuentas: (categoría, cuenta) tocadas, incluidas las creadas o
+             eliminadas; None si cambió todo el estado
+    totales: Totales después del cambio (como calcular_totales)
+    secuencia: Último asiento incluido (None si no hubo asientos)
+    eventos: Cuántos eventos se combinaron en este
+    """
+    tipo: str
+    deltas: Dict[Clave, float]
+    cuentas: Optional[FrozenSet[Clave]]
+    totales: Dict[str, float]
+    secuencia: Optional[int] = None
+    eventos: int = 1
+
+    def combinar(self, siguiente: 'EventoCambio') -> 'EventoCambio':
+        """Un solo evento equivalente a este seguido de `siguiente`"""
+        deltas = dict(self.deltas)
+        for clave, delta in siguiente.deltas.items():
+            deltas[clave] = deltas.get(clave, 0) + delta
+
+        cuentas = None
+        if self.cuentas is not None and siguiente.cuentas is not None:
+            cuentas = self.cuentas | siguiente.cuentas
+
+        tipo = max(self.tipo, siguiente.tipo, key=_GENERALIDAD.__getitem__)
+        secuencia = siguiente.secuencia if siguiente.secuencia is not None else self.secuencia
+        return EventoCambio(tipo, deltas, cuentas, siguiente.totales, secuencia,
+                            self.eventos + siguiente.eventos)
+
+
+class BusEventos:
+    """
+    Suscriptores de los cambios de un modelo
+
+    Síncrono por defecto: cada evento se entrega al emitirse. Con
+    diferido=True los eventos se acumulan (combinados) hasta despachar(),
+    lo que permite emitirlos desde otro hilo y entregarlos en el de la
+    interfaz.
+    """
+
+    def __init__(self, diferido: bool = False):
+        self.diferido = diferido
+        self._suscriptores: List[Callable[[EventoCambio], None]] = []
+        self._pendiente: Optional[EventoCambio] = None
+        self._agrupando = 0
+        self._candado = threading.Lock()
+
+    @property
+    def activo(self) -> bool:
+        """Hay suscriptores (si no, el modelo no arma los eventos)"""
+        return bool(self._suscriptores)
+
+    def suscribir(self, callback: Callable[[EventoCambio], None]) -> Callable[[], None]:
+        """
+        Registra un suscriptor
+
+        Returns:
+            Función sin argumentos que cancela la suscripción
+        """
+        self._suscriptores.append(callback)
+        return lambda: self.cancelar(callback)
+
+    def cancelar(self, callback: Callable[[EventoCambio], None]):
+        """Quita un suscriptor (no hace nada si no estaba)"""
+        if callback in self._suscriptores:
+            self._suscriptores.remove(callback)
+
+    def emitir(self, evento: EventoCambio):
+        with self._candado:
+            if self._pendiente is None:
+                self._pendiente = evento
+            else:
+                self._pendiente = self._pendiente.combinar(evento)
+            if self.diferido or self._agrupando:
+                return
+        self.despachar()
+
+    @contextmanager
+    def agrupados(self) -> Iterator[None]:
+        """Los eventos del bloque se entregan combinados al terminar"""
+        with self._candado:
+            self._agrupando += 1
+        try:
+            yield
+        finally:
+            with self._candado:
+                self._agrupando -= 1
+                entregar = not self._agrupando and not self.diferido
+            if entregar:
+                self.despachar()
+
+    def despachar(self) -> Optional[EventoCambio]:
+        """
+        Entrega el evento pendiente (combinado) a los suscriptores
+
+        Dentro de agrupados() no entrega nada: un bloque que corre en otro
+        hilo se ve completo o no se ve.
+
+        Returns:
+            El evento entregado, o None si no había
+        """
+        with self._candado:
+            if self._agrupando:
+                return None
+            evento, self._pendiente = self._pendiente, None
+        if evento is not None:
+            for callback in list(self._suscriptores):
+                callback(evento)
+        return evento
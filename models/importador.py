@@ -0,0 +1,166 @@
+"""
+models/importador.py
+Lectura en flujo de operaciones desde archivos CSV o JSONL
+
+Cada registro trae la columna 'tipo' más los parámetros de la transacción
+(ver models.operaciones.COLUMNAS_LOTE) y, opcionalmente, 'fecha' en
+formato ISO. Los registros se leen uno a uno y se agrupan en bloques de
+tamaño fijo, de modo que la memoria no depende del tamaño del archivo.
+"""
+
+import csv
+import json
+from datetime import date
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from models.operaciones import COLUMNAS_LOTE, COLUMNAS_MONTO
+
+FORMATOS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# Columnas cuya categoría es fija en la transacción
+CATEGORIA_FIJA = {
+    'cuenta_pago': 'ACTIVO_CIRCULANTE',
+    'cuenta_recibe': 'ACTIVO_CIRCULANTE',
+}
+
+# Columna de categoría que acompaña a cada columna de cuenta
+CATEGORIA_DE = {
+    'cuenta_destino': 'tipo_destino',
+    'cuenta': 'tipo_activo',
+    'cuenta_pasivo': 'tipo_pasivo',
+}
+
+
+class ErrorRegistro(NamedTuple):
+    """Registro rechazado, con su número de línea en el archivo"""
+    linea: int
+    mensaje: str
+
+
+class Bloque:
+    """Registros del mismo tipo y fecha, en forma columnar"""
+
+    def __init__(self, tipo: str, fecha: Optional[date]):
+        self.tipo = tipo
+        self.fecha = fecha
+        self.lineas: List[int] = []
+        self.registros: List[Dict] = []
+        self.columnas: Dict[str, List] = {c: [] for c in COLUMNAS_LOTE[tipo]}
+
+    def agregar(self, linea: int, registro: Dict):
+        self.lineas.append(linea)
+        self.registros.append(registro)
+        for nombre, valores in self.columnas.items():
+            valores.append(registro[nombre])
+
+    def __len__(self) -> int:
+        return len(self.lineas)
+
+
+def detectar_formato(ruta: str) -> str:
+    """Formato según la extensión del archivo ('csv' o 'jsonl')"""
+    for extension, formato in FORMATOS.items():
+        if ruta.lower().endswith(extension):
+            return formato
+    raise ValueError(f"Formato no reconocido para '{ruta}' (use .csv o .jsonl)")
+
+
+def leer_registros(ruta: str, formato: Optional[str] = None
+                   ) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Lee el archivo registro por registro
+
+    Yields:
+        Tuple (línea, registro, error); si la línea no se pudo interpretar
+        el registro es None y error describe el problema
+    """
+    formato = formato or detectar_formato(ruta)
+
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        if formato == 'csv':
+            lector = csv.DictReader(archivo)
+            for registro in lector:
+                yield lector.line_num, registro, None
+        elif formato == 'jsonl':
+            for linea, texto in enumerate(archivo, 1):
+                if not texto.strip():
+                    continue
+                try:
+                    registro = json.loads(texto)
+                except json.JSONDecodeError as e:
+                    yield linea, None, f"JSON inválido: {e.msg}"
+                    continue
+                if not isinstance(registro, dict):
+                    yield linea, None, "Se esperaba un objeto JSON"
+                    continue
+                yield linea, registro, None
+        else:
+            raise ValueError(f"Formato desconocido: {formato}")
+
+
+def normalizar_tipo(tipo) -> str:
+    """'compra_efectivo', 'Compra Efectivo', ... -> 'COMPRA EFECTIVO'"""
+    return str(tipo or '').strip().upper().replace('_', ' ')
+
+
+def validar_registro(registro: Dict,
+                     existe_cuenta: Callable[[str, str], bool]
+                     ) -> Tuple[str, Dict, Optional[date]]:
+    """
+    Valida un registro y convierte sus valores
+
+    Args:
+        registro: Valores leídos del archivo
+        existe_cuenta: Función (categoria, cuenta) -> bool
+
+    Returns:
+        Tuple (tipo, parámetros, fecha)
+
+    Raises:
+        ValueError: Con la descripción del primer problema encontrado
+    """
+    tipo = normalizar_tipo(registro.get('tipo'))
+    if tipo not in COLUMNAS_LOTE:
+        raise ValueError(f"Tipo desconocido: '{registro.get('tipo')}'")
+
+    parametros = {}
+    for nombre in COLUMNAS_LOTE[tipo]:
+        valor = registro.get(nombre)
+        if valor is None or str(valor).strip() == '':
+            raise ValueError(f"Falta '{nombre}'")
+
+        if nombre in COLUMNAS_MONTO:
+            try:
+                valor = float(valor)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{nombre}' no es numérico: {valor!r}")
+            if nombre == 'porcentaje_anticipo':
+                if not 0 <= valor <= 1:
+                    raise ValueError(f"'{nombre}' debe estar entre 0 y 1: {valor}")
+            elif valor <= 0:
+                raise ValueError(f"'{nombre}' debe ser mayor que cero: {valor}")
+        else:
+            valor = str(valor).strip().upper()
+
+        parametros[nombre] = valor
+
+    for nombre, valor in parametros.items():
+        if nombre in CATEGORIA_FIJA:
+            categoria = CATEGORIA_FIJA[nombre]
+        elif nombre in CATEGORIA_DE:
+            categoria = parametros[CATEGORIA_DE[nombre]]
+        else:
+            continue
+        if not existe_cuenta(categoria, valor):
+            raise ValueError(f"Cuenta no encontrada: {categoria}/{valor}")
+
+    fecha = registro.get('fecha')
+    if fecha:
+        try:
+            fecha = date.fromisoformat(str(fecha).strip())
+        except ValueError:
+            raise ValueError(f"Fecha inválida: {fecha!r} (use AAAA-MM-DD)")
+    else:
+        fecha = None
+
+    return tipo, parametros, fecha
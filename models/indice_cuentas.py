@@ -0,0 +1,130 @@
+"""
+models/indice_cuentas.py
+Índice de cuentas - Asigna a cada cuenta un slot entero estable
+"""
+
+import sys
+from typing import Dict, Iterable, List, Mapping
+
+
+class IndiceCuentas:
+    """
+    Índice (categoría, nombre) -> slot y slot -> (categoría, nombre)
+
+    Los slots se asignan en orden y no se reutilizan: al eliminar una cuenta
+    su slot queda marcado como libre, así cualquier arreglo indexado por
+    slot sigue siendo válido. Los nombres se internan para que todas las
+    estructuras compartan la misma cadena.
+
+    Las altas y bajas reemplazan el diccionario de la categoría en lugar de
+    modificarlo, de modo que quien lo esté recorriendo (p. ej. un lector en
+    otro hilo) no lo ve cambiar a medias. Por lo mismo copiar() es barato:
+    la copia comparte esos diccionarios y las listas por slot hasta la
+    primera alta o baja de cualquiera de los dos.
+    """
+
+    # Código de categoría de los slots eliminados
+    LIBRE = -1
+
+    def __init__(self, categorias: List[str]):
+        self.categorias = [sys.intern(c) for c in categorias]
+        self._codigo_categoria = {c: i for i, c in enumerate(self.categorias)}
+        self._slots: Dict[str, Dict[str, int]] = {c: {} for c in self.categorias}
+        self._categoria_de_slot: List[int] = []
+        self._nombre_de_slot: List[str] = []
+
+        # Cambia con cada alta o baja (para invalidar cachés derivados)
+        self.version = 0
+
+        # True si las listas por slot se comparten con una copia
+        self._compartido = False
+
+    @classmethod
+    def desde_catalogo(cls, catalogo: Mapping[str, Iterable[str]]) -> 'IndiceCuentas':
+        """Índice con las cuentas de un catálogo, en orden (una sola pasada)"""
+        indice = cls(list(catalogo))
+        for categoria, nombres in catalogo.items():
+            cuentas = indice._slots[categoria]
+            codigo = indice._codigo_categoria[categoria]
+            for nombre in nombres:
+                if nombre not in cuentas:
+                    nombre = sys.intern(nombre)
+                    cuentas[nombre] = len(indice._nombre_de_slot)
+                    indice._categoria_de_slot.append(codigo)
+                    indice._nombre_de_slot.append(nombre)
+        indice.version += 1
+        return indice
+
+    def copiar(self) -> 'IndiceCuentas':
+        """
+        Copia independiente: las altas y bajas en una no se ven en la otra
+
+        Cuesta O(categorías); las listas por slot se copian con la primera
+        alta o baja posterior.
+        """
+        copia = IndiceCuentas.__new__(IndiceCuentas)
+        copia.categorias = self.categorias
+        copia._codigo_categoria = self._codigo_categoria
+        copia._slots = dict(self._slots)
+        copia._categoria_de_slot = self._categoria_de_slot
+        copia._nombre_de_slot = self._nombre_de_slot
+        copia.version = self.version
+        copia._compartido = self._compartido = True
+        return copia
+
+    def _preparar_escritura(self):
+        """Deja de compartir las listas por slot antes de modificarlas"""
+        if self._compartido:
+            self._categoria_de_slot = list(self._categoria_de_slot)
+            self._nombre_de_slot = list(self._nombre_de_slot)
+            self._compartido = False
+
+    def agregar(self, categoria: str, nombre: str) -> int:
+        """Asigna un slot a una cuenta nueva y lo retorna"""
+        cuentas = self._slots[categoria]
+        if nombre in cuentas:
+            return cuentas[nombre]
+
+        self._preparar_escritura()
+        slot = len(self._nombre_de_slot)
+        nombre = sys.intern(nombre)
+        self._categoria_de_slot.append(self._codigo_categoria[categoria])
+        self._nombre_de_slot.append(nombre)
+        self._slots[categoria] = {**cuentas, nombre: slot}
+        self.version += 1
+        return slot
+
+    def eliminar(self, categoria: str, nombre: str) -> int:
+        """Libera el slot de una cuenta y lo retorna"""
+        cuentas = dict(self._slots[categoria])
+        slot = cuentas.pop(nombre)
+        self._preparar_escritura()
+        self._slots[categoria] = cuentas
+        self._categoria_de_slot[slot] = self.LIBRE
+        self.version += 1
+        return slot
+
+    def slot(self, categoria: str, nombre: str) -> int:
+        """Slot de una cuenta (KeyError si no existe)"""
+        return self._slots[categoria][nombre]
+
+    def cuentas(self, categoria: str) -> Mapping[str, int]:
+        """Cuentas vivas de una categoría (nombre -> slot) en orden de alta"""
+        return self._slots[categoria]
+
+    def categoria_de(self, slot: int) -> str:
+        """Categoría a la que pertenece un slot"""
+        return self.categorias[self._categoria_de_slot[slot]]
+
+    def nombre_de(self, slot: int) -> str:
+        """Nombre de la cuenta de un slot"""
+        return self._nombre_de_slot[slot]
+
+    @property
+    def codigos_categoria(self) -> List[int]:
+        """Código de categoría por slot (LIBRE para los eliminados)"""
+        return self._categoria_de_slot
+
+    def __len__(self) -> int:
+        """Número de slots asignados (incluye los liberados)"""
+        return len(self._nombre_de_slot)
@@ -0,0 +1,47 @@
+"""
+models/instantaneas.py
+Instantáneas con nombre del estado actual
+"""
+
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+
+class Instantanea:
+    """
+    Vista inmutable del estado actual en un momento dado
+
+    Comparte memoria con el estado del que se tomó (copia con escritura
+    diferida), por lo que tomarla no copia el catálogo.
+    """
+
+    def __init__(self, nombre: str, estado, secuencia: Optional[int]):
+        self.nombre = nombre
+        self.fecha = datetime.now()
+        self.secuencia = secuencia
+        self._estado = estado
+
+    @property
+    def estado(self) -> Mapping[str, Mapping[str, float]]:
+        """Saldos de la instantánea (solo lectura)"""
+        return MappingProxyType({
+            categoria: MappingProxyType(cuentas)
+            for categoria, cuentas in self._estado.items()
+        })
+
+    def obtener_valor(self, categoria: str, cuenta: str) -> float:
+        """Saldo de una cuenta en la instantánea"""
+        return self._estado[categoria].get(cuenta, 0.0)
+
+    def diferencias_desde(self, estado):
+        """Movimientos que llevan un estado a los saldos de esta instantánea"""
+        return estado.diferencias(self._estado)
+
+    def resumen(self) -> Dict:
+        """Datos para listar la instantánea"""
+        return {
+            'nombre': self.nombre,
+            'fecha': self.fecha.isoformat(timespec='seconds'),
+            'secuencia': self.secuencia
+        }
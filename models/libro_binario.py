@@ -0,0 +1,343 @@
+"""
+models/libro_binario.py
+Libro de movimientos en formato binario de ancho fijo (requiere numpy)
+
+Cada movimiento de un asiento ocupa un registro de REGISTRO.itemsize bytes
+(secuencia, fecha, slot de cuenta, categoría, importe en centavos y código
+de tipo). Los registros se anexan con escrituras en bloque y se leen con
+mmap como un arreglo estructurado de NumPy, sin interpretar registro por
+registro; reconstruir los saldos es una reducción vectorizada.
+
+Junto al archivo binario se guarda `<ruta>.json` con el catálogo y las
+tablas de slots y tipos. Los importes se guardan en centavos, por lo que
+fuera del almacenamiento en centavos se redondean al centavo.
+
+Al dar de baja una cuenta su slot queda retirado (sin nombre en la tabla):
+si se vuelve a dar de alta recibe un slot nuevo y no suma los movimientos
+de la anterior.
+"""
+
+import json
+import mmap
+import os
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.centavos import a_centavos, de_centavos
+from models.libro_diario import BAJA_CUENTA
+
+MAGICO = b'BLIB'
+VERSION_FORMATO = 1
+
+REGISTRO = np.dtype([
+    ('secuencia', '<i8'),
+    ('fecha', '<M8[D]'),
+    ('centavos', '<i8'),
+    ('slot', '<i4'),
+    ('categoria', 'u1'),
+    ('tipo', '<u2'),
+    ('_relleno', 'V1'),
+])
+
+# Magia, versión y tamaño de registro
+CABECERA = np.dtype([('magico', 'S4'), ('version', '<u4'), ('tamano', '<u4'), ('_relleno', 'V4')])
+
+# Bits de la parte baja al sumar centavos con bincount (float64 exacto)
+_BITS_BAJOS = 24
+
+
+def leer_registros(ruta: str) -> np.ndarray:
+    """
+    Arreglo estructurado con todos los registros del archivo, sobre mmap
+
+    El arreglo comparte memoria con el archivo mapeado (no se copia).
+    """
+    with open(ruta, 'rb') as archivo:
+        tamano = os.fstat(archivo.fileno()).st_size
+        if tamano <= CABECERA.itemsize:
+            return np.zeros(0, dtype=REGISTRO)
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    cabecera = np.frombuffer(mapa, dtype=CABECERA, count=1)[0]
+    if cabecera['magico'] != MAGICO or cabecera['tamano'] != REGISTRO.itemsize:
+        raise ValueError(f"'{ruta}' no es un libro binario válido")
+
+    n = (tamano - CABECERA.itemsize) // REGISTRO.itemsize
+    return np.frombuffer(mapa, dtype=REGISTRO, count=n, offset=CABECERA.itemsize)
+
+
+def sumar_por_slot(registros: np.ndarray, num_slots: int,
+                   hasta: Optional[date] = None) -> np.ndarray:
+    """
+    Suma exacta (int64) de centavos por slot de cuenta
+
+    bincount acumula en float64; para que la suma sea exacta con decenas de
+    millones de registros, los centavos se separan en parte alta y baja y
+    cada parte se acumula por separado.
+    """
+    if hasta is not None:
+        registros = registros[registros['fecha'] <= np.datetime64(hasta, 'D')]
+
+    slots = registros['slot']
+    centavos = registros['centavos']
+    bajos = centavos & ((1 << _BITS_BAJOS) - 1)
+    altos = centavos >> _BITS_BAJOS
+
+    suma_bajos = np.bincount(slots, weights=bajos, minlength=num_slots)
+    suma_altos = np.bincount(slots, weights=altos, minlength=num_slots)
+    return (suma_altos.astype(np.int64) << _BITS_BAJOS) + suma_bajos.astype(np.int64)
+
+
+class LibroBinario:
+    """
+    Persistencia del diario en un libro binario
+
+    Tiene la misma interfaz que models.base_datos.BaseDatos, de modo que el
+    controlador puede usar cualquiera de los dos.
+    """
+
+    def __init__(self, ruta: str, tamano_bufer: int = 65536,
+                 intervalo_vaciado: float = 1.0):
+        self.ruta = ruta
+        self.ruta_indice = f"{ruta}.json"
+        self.intervalo_vaciado = intervalo_vaciado
+        self._ultimo_vaciado = time.monotonic()
+
+        self.tamano_bufer = tamano_bufer
+        self._pendientes: List[Tuple] = []
+
+        self._catalogo: Dict[str, Dict[str, float]] = {}
+        self._categorias: List[str] = []
+        self._cuentas: List[Tuple[str, str]] = []
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self._tipos: List[str] = []
+        self._codigos_tipo: Dict[str, int] = {}
+        self._ultima_secuencia_archivo = 0
+        self._ultima_fecha_archivo: Optional[date] = None
+        self._indice_modificado = False
+
+        self._guardados = 0
+        self._ultima_secuencia = None
+        self._version_catalogo = None
+        self._apertura = None
+
+        if os.path.exists(self.ruta_indice):
+            self._leer_indice()
+
+    # === ÍNDICE (catálogo, slots y tipos) ===
+
+    def _leer_indice(self):
+        with open(self.ruta_indice, encoding='utf-8') as archivo:
+            indice = json.load(archivo)
+        if indice.get('version') != VERSION_FORMATO:
+            raise ValueError(f"'{self.ruta_indice}' no es un índice de libro binario")
+
+        self._catalogo = indice['catalogo']
+        self._categorias = indice['categorias']
+        self._cuentas = [tuple(c) for c in indice['cuentas']]
+        self._slots = {c: i for i, c in enumerate(self._cuentas)}
+        self._tipos = indice['tipos']
+        self._codigos_tipo = {t: i for i, t in enumerate(self._tipos)}
+        self._ultima_secuencia_archivo = indice['ultima_secuencia']
+        if indice.get('ultima_fecha'):
+            self._ultima_fecha_archivo = date.fromisoformat(indice['ultima_fecha'])
+
+    def _escribir_indice(self):
+        temporal = f"{self.ruta_indice}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'version': VERSION_FORMATO,
+                'catalogo': self._catalogo,
+                'categorias': self._categorias,
+                'cuentas': self._cuentas,
+                'tipos': self._tipos,
+                'ultima_secuencia': self._ultima_secuencia_archivo,
+                'ultima_fecha': (self._ultima_fecha_archivo.isoformat()
+                                 if self._ultima_fecha_archivo else None)
+            }, archivo, ensure_ascii=False)
+        os.replace(temporal, self.ruta_indice)
+        self._indice_modificado = False
+
+    def _tomar_catalogo(self, modelo):
+        self._catalogo = {
+            categoria: dict(cuentas.items())
+            for categoria, cuentas in modelo.catalogo.items()
+        }
+        for categoria in self._catalogo:
+            if categoria not in self._categorias:
+                self._categorias.append(categoria)
+        self._version_catalogo = modelo.version_catalogo
+        self._indice_modificado = True
+
+    def _slot(self, categoria: str, cuenta: str) -> int:
+        clave = (categoria, cuenta)
+        slot = self._slots.get(clave)
+        if slot is None:
+            slot = self._slots[clave] = len(self._cuentas)
+            self._cuentas.append(clave)
+            self._indice_modificado = True
+        return slot
+
+    def _codigo_tipo(self, tipo: str) -> int:
+        codigo = self._codigos_tipo.get(tipo)
+        if codigo is None:
+            codigo = self._codigos_tipo[tipo] = len(self._tipos)
+            self._tipos.append(tipo)
+            self._indice_modificado = True
+        return codigo
+
+    # === LECTURA ===
+
+    def esta_vacia(self) -> bool:
+        """True si aún no hay catálogo guardado"""
+        return not os.path.exists(self.ruta_indice)
+
+    def registros(self) -> np.ndarray:
+        """Registros del archivo (sin los que siguen en el búfer)"""
+        if not os.path.exists(self.ruta):
+            return np.zeros(0, dtype=REGISTRO)
+        return leer_registros(self.ruta)
+
+    def saldos(self, hasta: Optional[date] = None) -> Dict[str, Dict[str, float]]:
+        """Catálogo más la suma de todos los movimientos (hasta una fecha)"""
+        sumas = sumar_por_slot(self.registros(), len(self._cuentas), hasta)
+
+        saldos = {categoria: dict(cuentas) for categoria, cuentas in self._catalogo.items()}
+        for slot in np.flatnonzero(sumas).tolist():
+            categoria, cuenta = self._cuentas[slot]
+            if cuenta in saldos.get(categoria, {}):
+                saldos[categoria][cuenta] = de_centavos(
+                    a_centavos(saldos[categoria][cuenta]) + int(sumas[slot])
+                )
+        return saldos
+
+    def cargar(self, modelo):
+        """
+        Carga el catálogo y los saldos reducidos del archivo en el modelo
+
+        Los asientos del archivo no se convierten a objetos: el estado
+        reducido pasa a ser la apertura del modelo, su diario empieza vacío
+        y continúa la numeración del archivo. Los balances a fechas
+        anteriores (balance_al) se calculan con saldos(hasta).
+        """
+        modelo.cargar_estado(self._catalogo, (), self.saldos())
+        modelo.fijar_apertura(self.saldos)
+        modelo.diario.continuar_desde(self._ultima_secuencia_archivo,
+                                      self._ultima_fecha_archivo)
+        self._version_catalogo = modelo.version_catalogo
+        self._marcar_guardados(modelo)
+
+    # === ESCRITURA ===
+
+    def _anexar(self, asiento):
+        codigo = self._codigo_tipo(asiento.tipo)
+        for categoria, cuenta, importe in asiento.movimientos:
+            self._pendientes.append((
+                asiento.secuencia, asiento.fecha, a_centavos(importe),
+                self._slot(categoria, cuenta), self._categorias.index(categoria),
+                codigo, b''
+            ))
+        if asiento.tipo == BAJA_CUENTA:
+            for categoria, cuenta, _ in asiento.movimientos:
+                slot = self._slots.pop((categoria, cuenta), None)
+                if slot is not None:
+                    self._cuentas[slot] = (categoria, None)
+        self._ultima_secuencia_archivo = asiento.secuencia
+        self._ultima_fecha_archivo = asiento.fecha
+        self._indice_modificado = True
+        if len(self._pendientes) >= self.tamano_bufer:
+            self._vaciar_bufer()
+
+    def _vaciar_bufer(self):
+        """Escribe los registros pendientes al final del archivo en una sola escritura"""
+        if not self._pendientes:
+            return
+        nuevo = not os.path.exists(self.ruta)
+        with open(self.ruta, 'ab') as archivo:
+            if nuevo:
+                archivo.write(self._cabecera())
+            archivo.write(np.array(self._pendientes, dtype=REGISTRO).tobytes())
+        self._pendientes = []
+
+    @staticmethod
+    def _cabecera() -> bytes:
+        return np.array([(MAGICO, VERSION_FORMATO, REGISTRO.itemsize, b'')],
+                        dtype=CABECERA).tobytes()
+
+    def sincronizar(self, modelo):
+        """
+        Anexa al búfer los asientos nuevos del diario
+
+        El búfer se escribe al llenarse, al cambiar el catálogo o cuando
+        pasan `intervalo_vaciado` segundos desde la última escritura (ese
+        plazo también lo revisa confirmar_vencido).
+
+        Si el diario se reinició (o cambió la apertura), el archivo se
+        reescribe con el diario actual.
+        """
+        if modelo.estado_inicial is not self._apertura or \
+                self._guardados > len(modelo.diario) or (
+                self._guardados and
+                modelo.diario.desde(self._guardados - 1)[0].secuencia != self._ultima_secuencia):
+            self.guardar_todo(modelo)
+            return
+
+        for asiento in modelo.diario.desde(self._guardados):
+            self._anexar(asiento)
+        self._marcar_guardados(modelo)
+
+        if modelo.version_catalogo != self._version_catalogo:
+            self._tomar_catalogo(modelo)
+            self.confirmar(modelo)
+        else:
+            self.confirmar_vencido(modelo)
+
+    def confirmar_vencido(self, modelo=None) -> bool:
+        """
+        Escribe el búfer y el índice si hay algo pendiente y pasaron
+        `intervalo_vaciado` segundos desde la última escritura
+
+        Returns:
+            True si escribió algo
+        """
+        if not (self._pendientes or self._indice_modificado) or \
+                time.monotonic() - self._ultimo_vaciado < self.intervalo_vaciado:
+            return False
+        self.confirmar(modelo)
+        return True
+
+    def confirmar(self, modelo=None):
+        """Escribe el búfer y, si cambió, el índice"""
+        self._vaciar_bufer()
+        if self._indice_modificado:
+            self._escribir_indice()
+        self._ultimo_vaciado = time.monotonic()
+
+    def guardar_todo(self, modelo):
+        """Reescribe el archivo y el índice con el catálogo y diario del modelo"""
+        self._pendientes = []
+        self._ultima_fecha_archivo = None
+        with open(self.ruta, 'wb') as archivo:
+            archivo.write(self._cabecera())
+
+        self._tomar_catalogo(modelo)
+        for asiento in modelo.diario:
+            self._anexar(asiento)
+        self._marcar_guardados(modelo)
+        self.confirmar(modelo)
+
+    def _marcar_guardados(self, modelo):
+        """Recuerda hasta qué asiento del diario ya se envió al archivo"""
+        ultimo = modelo.diario.ultimo
+        self._guardados = len(modelo.diario)
+        self._ultima_secuencia = ultimo.secuencia if ultimo else None
+        self._apertura = modelo.estado_inicial
+
+    def cerrar(self, modelo=None):
+        """Escribe lo pendiente (si se indica el modelo)"""
+        if modelo is not None:
+            self.sincronizar(modelo)
+        self.confirmar(modelo)
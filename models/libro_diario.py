@@ -0,0 +1,180 @@
+"""
+models/libro_diario.py
+Libro diario - Registro inmutable y secuencial de los asientos contables
+"""
+
+from bisect import bisect_right
+from datetime import date
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Tipo del asiento que anota la baja de una cuenta (movimientos en cero)
+BAJA_CUENTA = 'BAJA DE CUENTA'
+
+
+class Movimiento(NamedTuple):
+    """Cargo o abono a una cuenta (importe con signo)"""
+    categoria: str
+    cuenta: str
+    importe: float
+
+
+class Asiento(NamedTuple):
+    """Asiento del libro diario; una vez registrado no se modifica"""
+    secuencia: int
+    tipo: str
+    movimientos: Tuple[Movimiento, ...]
+    fecha: date
+
+
+def invertir_movimientos(movimientos: Iterable[Movimiento]) -> Tuple[Movimiento, ...]:
+    """Movimientos que anulan a los indicados (mismo importe, signo contrario)"""
+    return tuple(Movimiento(categoria, cuenta, -importe)
+                 for categoria, cuenta, importe in movimientos)
+
+
+class LibroDiario:
+    """
+    Libro diario de solo anexado
+
+    Cada asiento recibe un número de secuencia estrictamente creciente,
+    que nunca se reutiliza aunque el libro se limpie. Las fechas de los
+    asientos no pueden retroceder, así el libro queda ordenado por fecha.
+    """
+
+    def __init__(self):
+        self._asientos: List[Asiento] = []
+        self._fechas: List[date] = []
+        self._siguiente = 1
+        
+        # Fecha del último asiento anterior al libro (si se continúa otro)
+        self._fecha_apertura: Optional[date] = None
+
+    def validar_fecha(self, fecha: Optional[date] = None) -> date:
+        """
+        Fecha que tendría el siguiente asiento
+
+        Si no se indica es hoy, o la del último asiento si es posterior.
+
+        Raises:
+            ValueError: Si la fecha es anterior a la del último asiento
+        """
+        ultima = self._fechas[-1] if self._fechas else self._fecha_apertura
+        if fecha is None:
+            fecha = max(date.today(), ultima) if ultima else date.today()
+        if ultima and fecha < ultima:
+            raise ValueError(
+                f"La fecha {fecha.isoformat()} es anterior al último asiento "
+                f"({ultima.isoformat()})"
+            )
+        return fecha
+
+    def registrar(self, tipo: str, movimientos: Iterable[Tuple[str, str, float]],
+                  fecha: Optional[date] = None,
+                  secuencia: Optional[int] = None) -> Asiento:
+        """
+        Anexa un asiento al final del libro (O(1)) y lo retorna
+
+        Args:
+            secuencia: Número a conservar al cargar un diario guardado; debe
+                       ser mayor que el del último asiento
+        """
+        if secuencia is not None:
+            if secuencia < self._siguiente:
+                raise ValueError(f"Secuencia {secuencia} repetida o fuera de orden")
+            self._siguiente = secuencia
+
+        asiento = Asiento(
+            self._siguiente,
+            tipo,
+            tuple(Movimiento(categoria, cuenta, importe)
+                  for categoria, cuenta, importe in movimientos),
+            self.validar_fecha(fecha)
+        )
+        self._asientos.append(asiento)
+        self._fechas.append(asiento.fecha)
+        self._siguiente += 1
+        return asiento
+
+    def registrar_baja(self, categoria: str, cuenta: str) -> Optional[Asiento]:
+        """
+        Anota que una cuenta se dio de baja
+
+        Así, al reproducir, una cuenta que después se vuelva a dar de alta
+        con el mismo nombre no hereda los movimientos de la anterior. Lleva
+        la fecha del último asiento para no impedir asientos posteriores con
+        fecha atrasada; si el libro no tiene asientos (ni continúa otro) no
+        hay movimientos que separar y no se anota nada.
+        """
+        ultima = self._fechas[-1] if self._fechas else self._fecha_apertura
+        if ultima is None:
+            return None
+        return self.registrar(BAJA_CUENTA, [(categoria, cuenta, 0.0)], ultima)
+
+    def continuar_desde(self, secuencia: int, fecha: Optional[date] = None):
+        """
+        Continúa un libro anterior cuyos asientos no se cargan
+        
+        El siguiente asiento se numera después de `secuencia` y no puede
+        tener fecha anterior a `fecha`.
+        """
+        self._siguiente = max(self._siguiente, secuencia + 1)
+        self._fecha_apertura = fecha
+
+    @property
+    def fecha_apertura(self) -> Optional[date]:
+        """Fecha del último asiento del libro anterior (si se continúa otro)"""
+        return self._fecha_apertura
+
+    def limpiar(self):
+        """Descarta los asientos conservando el contador de secuencia"""
+        self._asientos = []
+        self._fechas = []
+        self._fecha_apertura = None
+
+    def posicion_hasta(self, fecha: date) -> int:
+        """Número de asientos con fecha menor o igual a la indicada"""
+        return bisect_right(self._fechas, fecha)
+
+    def desde(self, posicion: int) -> List[Asiento]:
+        """Asientos a partir de una posición (p. ej. los aún no guardados)"""
+        return self._asientos[posicion:]
+
+    @property
+    def ultimo(self) -> Optional[Asiento]:
+        """Último asiento registrado (o None si el libro está vacío)"""
+        return self._asientos[-1] if self._asientos else None
+
+    def __len__(self) -> int:
+        return len(self._asientos)
+
+    def __iter__(self) -> Iterator[Asiento]:
+        return iter(self._asientos)
+
+    def reproducir(self, estado_base, desde: int = 0, hasta: Optional[int] = None):
+        """
+        Reconstruye un estado aplicando asientos sobre una base
+
+        Args:
+            estado_base: Estado de un motor de almacenamiento (no se modifica)
+            desde: Posición del primer asiento a aplicar
+            hasta: Posición final (exclusiva); por omisión hasta el último
+
+        Returns:
+            Nuevo estado con los asientos aplicados. Los movimientos de
+            cuentas que ya no existen en la base se ignoran, y una baja
+            devuelve la cuenta a su saldo en la base (si se volvió a dar de
+            alta, empieza desde ahí).
+        """
+        estado = estado_base.copiar()
+
+        for asiento in self._asientos[desde:hasta]:
+            if asiento.tipo == BAJA_CUENTA:
+                for categoria, cuenta, _ in asiento.movimientos:
+                    if cuenta in estado[categoria]:
+                        estado.escribible(categoria)[cuenta] = estado_base[categoria][cuenta]
+                continue
+            for categoria, cuenta, importe in asiento.movimientos:
+                if cuenta in estado[categoria]:
+                    estado.acumular(categoria, cuenta, importe)
+
+        return estado
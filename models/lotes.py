@@ -0,0 +1,257 @@
+"""
+models/lotes.py
+Cálculo vectorizado de lotes de transacciones con NumPy
+
+Cada lote se recibe en forma columnar (un arreglo por parámetro de la
+transacción) y se reduce a un movimiento neto por cuenta.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from models.centavos import ESCALA_TASA, tasa_entera
+from models.operaciones import COLUMNAS_LOTE, COLUMNAS_MONTO
+
+
+def _redondear(valores: np.ndarray) -> np.ndarray:
+    """models.centavos.redondear elemento a elemento (a int64)"""
+    enteros = np.floor(np.round(np.abs(valores), 6) + 0.5).astype(np.int64)
+    return np.where(valores >= 0, enteros, -enteros)
+
+
+def _dividir_redondeando(numeradores: np.ndarray, denominador: int) -> np.ndarray:
+    """models.centavos.dividir_redondeando elemento a elemento"""
+    cocientes = (2 * np.abs(numeradores) + denominador) // (2 * denominador)
+    return np.where(numeradores >= 0, cocientes, -cocientes)
+
+
+def calcular_iva_vectorizado(montos: np.ndarray, tasa_iva: float,
+                             incluye_iva: bool = False,
+                             centavos: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula el IVA de un arreglo de montos (misma fórmula que
+    BalanceModel.calcular_iva, aplicada elemento a elemento)
+
+    Con centavos=True los montos son centavos int64 y se usa el mismo
+    redondeo entero que models.centavos.calcular_iva_centavos.
+
+    Returns:
+        Tuple (subtotales, ivas)
+    """
+    if centavos:
+        tasa_dm = tasa_entera(tasa_iva)
+        if incluye_iva:
+            subtotales = _dividir_redondeando(montos * ESCALA_TASA, ESCALA_TASA + tasa_dm)
+            ivas = montos - subtotales
+        else:
+            subtotales = montos
+            ivas = _dividir_redondeando(montos * tasa_dm, ESCALA_TASA)
+        return subtotales, ivas
+
+    if incluye_iva:
+        subtotales = montos / (1 + tasa_iva)
+        ivas = montos - subtotales
+    else:
+        subtotales = montos
+        ivas = montos * tasa_iva
+
+    return subtotales, ivas
+
+
+def _normalizar_columnas(tipo: str, columnas: Dict[str, Sequence]) -> Dict:
+    """
+    Valida las columnas del lote
+
+    Las columnas de montos se convierten a arreglos float64 de longitud n.
+    Las columnas de texto escalares se conservan como str, de modo que un
+    valor repetido en todo el lote no se tenga que factorizar.
+    """
+    if tipo not in COLUMNAS_LOTE:
+        raise ValueError(f"Tipo de lote desconocido: {tipo}")
+
+    requeridas = COLUMNAS_LOTE[tipo]
+    faltantes = [nombre for nombre in requeridas if nombre not in columnas]
+    if faltantes:
+        raise ValueError(f"Faltan columnas para {tipo}: {', '.join(faltantes)}")
+
+    normalizadas = {}
+    for nombre in requeridas:
+        valor = columnas[nombre]
+        if isinstance(valor, str):
+            normalizadas[nombre] = valor
+        elif nombre in COLUMNAS_MONTO:
+            normalizadas[nombre] = np.asarray(valor, dtype=np.float64).ravel()
+        else:
+            normalizadas[nombre] = np.asarray(valor).astype(str).ravel()
+
+    longitudes = {len(v) for v in normalizadas.values() if not isinstance(v, str)}
+    longitudes.discard(1)
+    if len(longitudes) > 1:
+        raise ValueError(f"Las columnas del lote tienen longitudes distintas: {sorted(longitudes)}")
+    n = longitudes.pop() if longitudes else 1
+
+    for nombre, valor in normalizadas.items():
+        if not isinstance(valor, str) and len(valor) != n:
+            normalizadas[nombre] = np.repeat(valor, n)
+
+    return normalizadas
+
+
+def _porcion(totales: np.ndarray, porcentajes: np.ndarray, centavos: bool) -> np.ndarray:
+    """Porción de cada total (anticipos), redondeada al centavo si aplica"""
+    if centavos:
+        return _redondear(totales * porcentajes)
+    return totales * porcentajes
+
+
+def calcular_movimientos(tipo: str, columnas: Dict[str, Sequence],
+                         tasa_iva: float, centavos: bool = False) -> Tuple[List[Tuple], Dict]:
+    """
+    Calcula los movimientos de todas las operaciones del lote
+
+    Returns:
+        Tuple (partes, resumen); cada parte es (categorias, cuentas, importes)
+        donde categorias y cuentas son un str o un arreglo por operación.
+        Con centavos=True los importes son centavos int64.
+    """
+    c = _normalizar_columnas(tipo, columnas)
+
+    if centavos:
+        for nombre in ('total', 'total_venta'):
+            if nombre in c:
+                c[nombre] = _redondear(c[nombre] * 100)
+
+    if tipo == 'COMPRA EFECTIVO':
+        total = c['total']
+        subtotal, iva = calcular_iva_vectorizado(total, tasa_iva, True, centavos)
+
+        partes = [
+            ('ACTIVO_CIRCULANTE', c['cuenta_pago'], -total),
+            (c['tipo_destino'], c['cuenta_destino'], subtotal),
+            ('ACTIVO_CIRCULANTE', 'IVA ACREDITABLE', iva),
+        ]
+        resumen = {'total': total.sum(), 'subtotal': subtotal.sum(), 'iva': iva.sum()}
+
+    elif tipo == 'COMPRA CREDITO':
+        total = c['total']
+        subtotal, iva = calcular_iva_vectorizado(total, tasa_iva, True, centavos)
+
+        partes = [
+            (c['tipo_activo'], c['cuenta'], subtotal),
+            ('ACTIVO_CIRCULANTE', 'IVA POR ACREDITAR', iva),
+            (c['tipo_pasivo'], c['cuenta_pasivo'], total),
+        ]
+        resumen = {'total_credito': total.sum(), 'total_iva': iva.sum()}
+
+    elif tipo == 'COMPRA COMBINADA':
+        total = c['total']
+        subtotal, iva_total = calcular_iva_vectorizado(total, tasa_iva, True, centavos)
+
+        anticipo = _porcion(total, c['porcentaje_anticipo'], centavos)
+        deuda = total - anticipo
+        _, iva_anticipo = calcular_iva_vectorizado(anticipo, tasa_iva, True, centavos)
+        iva_deuda = iva_total - iva_anticipo
+
+        partes = [
+            ('ACTIVO_CIRCULANTE', c['cuenta_pago'], -anticipo),
+            (c['tipo_destino'], c['cuenta_destino'], subtotal),
+            ('ACTIVO_CIRCULANTE', 'IVA ACREDITABLE', iva_anticipo),
+            ('ACTIVO_CIRCULANTE', 'IVA POR ACREDITAR', iva_deuda),
+            (c['tipo_pasivo'], c['cuenta_pasivo'], deuda),
+        ]
+        resumen = {'total': total.sum(), 'subtotal': subtotal.sum(),
+                   'iva_total': iva_total.sum(), 'anticipo': anticipo.sum(),
+                   'deuda': deuda.sum()}
+
+    else:  # ANTICIPO CLIENTES
+        total_venta = c['total_venta']
+        total = total_venta
+        anticipo = _porcion(total_venta, c['porcentaje_anticipo'], centavos)
+        sub_anticipo, iva_anticipo = calcular_iva_vectorizado(anticipo, tasa_iva, True, centavos)
+
+        partes = [
+            ('ACTIVO_CIRCULANTE', c['cuenta_recibe'], anticipo),
+            ('CAPITAL', 'ANTICIPO CLIENTES', sub_anticipo),
+            ('CAPITAL', 'IVA TRASLADO', iva_anticipo),
+        ]
+        resumen = {'total_venta': total_venta.sum(), 'anticipo': anticipo.sum(),
+                   'sub_anticipo': sub_anticipo.sum(), 'iva_anticipo': iva_anticipo.sum()}
+
+    escala = 100 if centavos else 1
+    resumen = {clave: float(valor) / escala for clave, valor in resumen.items()}
+    resumen['operaciones'] = len(total)
+
+    return partes, resumen
+
+
+def _factorizar(columna) -> Tuple[np.ndarray, np.ndarray]:
+    """Retorna (valores_unicos, codigo_por_elemento) de una columna str o arreglo"""
+    if isinstance(columna, str):
+        return np.array([columna]), None
+    return np.unique(columna, return_inverse=True)
+
+
+def agrupar_movimientos(partes: List[Tuple],
+                        centavos: bool = False) -> List[Tuple[str, str, float]]:
+    """
+    Reduce los movimientos a un importe neto por (categoría, cuenta)
+
+    En cada parte, las categorías y cuentas se factorizan a códigos enteros
+    y los importes se suman con una sola reducción agrupada (bincount, o
+    una suma entera exacta con np.add.at si son centavos). Los netos se
+    retornan en pesos.
+    """
+    netos: Dict[Tuple[str, str], float] = {}
+
+    for categorias, cuentas, importes in partes:
+        if len(importes) == 0:
+            continue
+
+        nombres_cat, codigos_cat = _factorizar(categorias)
+        nombres_cta, codigos_cta = _factorizar(cuentas)
+
+        if codigos_cat is None and codigos_cta is None:
+            grupos = [((str(nombres_cat[0]), str(nombres_cta[0])), importes.sum().item())]
+        else:
+            if codigos_cat is None:
+                codigos_cat = np.zeros(len(importes), dtype=np.int64)
+            if codigos_cta is None:
+                codigos_cta = np.zeros(len(importes), dtype=np.int64)
+
+            claves = codigos_cat.astype(np.int64) * len(nombres_cta) + codigos_cta
+            unicas, grupo = np.unique(claves, return_inverse=True)
+            if centavos:
+                sumas = np.zeros(len(unicas), dtype=np.int64)
+                np.add.at(sumas, grupo, importes)
+            else:
+                sumas = np.bincount(grupo, weights=importes, minlength=len(unicas))
+
+            grupos = [
+                ((str(nombres_cat[clave // len(nombres_cta)]),
+                  str(nombres_cta[clave % len(nombres_cta)])), suma)
+                for clave, suma in zip(unicas.tolist(), sumas.tolist())
+            ]
+
+        for clave, suma in grupos:
+            netos[clave] = netos.get(clave, 0) + suma
+
+    escala = 100 if centavos else 1
+    return [(categoria, cuenta, neto / escala) for (categoria, cuenta), neto in netos.items()]
+
+
+def retiros_por_cuenta(tipo: str, columnas: Dict[str, Sequence]) -> Dict[str, float]:
+    """Suma lo que el lote retira de cada cuenta de pago (para validar fondos)"""
+    if tipo not in ('COMPRA EFECTIVO', 'COMPRA COMBINADA'):
+        return {}
+
+    c = _normalizar_columnas(tipo, columnas)
+    retiros = c['total'] if tipo == 'COMPRA EFECTIVO' else c['total'] * c['porcentaje_anticipo']
+
+    if isinstance(c['cuenta_pago'], str):
+        return {c['cuenta_pago']: float(retiros.sum())}
+
+    nombres, grupo = np.unique(c['cuenta_pago'], return_inverse=True)
+    sumas = np.bincount(grupo, weights=retiros, minlength=len(nombres))
+
+    return dict(zip(nombres.tolist(), sumas.tolist()))
@@ -0,0 +1,16 @@
+"""
+models/operaciones.py
+Parámetros de cada tipo de transacción (sin dependencias externas)
+"""
+
+# Columnas requeridas por tipo de operación, en el mismo orden que los
+# parámetros de las transacciones individuales del modelo
+COLUMNAS_LOTE = {
+    'COMPRA EFECTIVO': ('cuenta_pago', 'tipo_destino', 'cuenta_destino', 'total'),
+    'COMPRA CREDITO': ('tipo_activo', 'cuenta', 'total', 'tipo_pasivo', 'cuenta_pasivo'),
+    'COMPRA COMBINADA': ('cuenta_pago', 'tipo_destino', 'cuenta_destino',
+                         'tipo_pasivo', 'cuenta_pasivo', 'total', 'porcentaje_anticipo'),
+    'ANTICIPO CLIENTES': ('cuenta_recibe', 'total_venta', 'porcentaje_anticipo'),
+}
+
+COLUMNAS_MONTO = ('total', 'total_venta', 'porcentaje_anticipo')
@@ -0,0 +1,62 @@
+"""
+models/persistencia.py
+Guardado y carga del estado del modelo en archivos JSON
+
+El archivo contiene el catálogo y el libro diario; el estado actual no se
+guarda porque se reconstruye reproduciendo los asientos.
+"""
+
+import json
+import os
+from typing import Dict
+
+VERSION_FORMATO = 1
+
+
+def estado_a_dict(modelo) -> Dict:
+    """Catálogo y diario del modelo en tipos serializables"""
+    return {
+        'version': VERSION_FORMATO,
+        'catalogo': {
+            categoria: dict(cuentas.items())
+            for categoria, cuentas in modelo.catalogo.items()
+        },
+        'diario': [
+            {
+                'secuencia': asiento.secuencia,
+                'fecha': asiento.fecha.isoformat(),
+                'tipo': asiento.tipo,
+                'movimientos': [list(m) for m in asiento.movimientos]
+            }
+            for asiento in modelo.diario
+        ]
+    }
+
+
+def guardar_json(modelo, ruta: str):
+    """
+    Guarda el catálogo y el diario en un archivo JSON
+
+    Se escribe primero a un archivo temporal y luego se reemplaza, así una
+    falla a medio guardar no deja el archivo truncado.
+    """
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(estado_a_dict(modelo), archivo, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def cargar_json(modelo, ruta: str):
+    """
+    Carga en el modelo un archivo guardado con guardar_json
+
+    Raises:
+        ValueError: Si el archivo no tiene el formato esperado
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+
+    if not isinstance(datos, dict) or datos.get('version') != VERSION_FORMATO:
+        raise ValueError(f"'{ruta}' no es un archivo de estado válido")
+
+    modelo.cargar_estado(datos['catalogo'], datos.get('diario', []))
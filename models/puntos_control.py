@@ -0,0 +1,63 @@
+"""
+models/puntos_control.py
+Puntos de control del libro diario para consultas a una fecha
+"""
+
+from bisect import bisect_right
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+
+class PuntoControl(NamedTuple):
+    """Estado después de aplicar los primeros `posicion` asientos del diario"""
+    posicion: int
+    fecha: Optional[date]
+    estado: object
+
+
+class PuntosControl:
+    """
+    Puntos de control automáticos
+
+    Se guarda una instantánea del estado cada `cada_asientos` asientos y al
+    cerrar cada mes (antes del primer asiento del mes siguiente). Para
+    consultar una fecha basta partir del punto anterior más cercano y
+    reproducir solo los asientos que siguen.
+    """
+
+    def __init__(self, cada_asientos: int = 1000):
+        self.cada_asientos = cada_asientos
+        self._puntos: List[PuntoControl] = []
+        self._posiciones: List[int] = []
+
+    def _agregar(self, posicion: int, fecha: Optional[date], estado):
+        if self._posiciones and self._posiciones[-1] == posicion:
+            return
+        self._puntos.append(PuntoControl(posicion, fecha, estado.instantanea()))
+        self._posiciones.append(posicion)
+
+    def antes_de_asiento(self, posicion: int, fecha_anterior: Optional[date],
+                         fecha: date, estado):
+        """Cierra el mes anterior si el nuevo asiento cae en otro periodo"""
+        if fecha_anterior is not None and \
+                (fecha.year, fecha.month) != (fecha_anterior.year, fecha_anterior.month):
+            self._agregar(posicion, fecha_anterior, estado)
+
+    def despues_de_asiento(self, posicion: int, fecha: date, estado):
+        """Guarda un punto si ya pasaron cada_asientos desde el último"""
+        ultimo = self._posiciones[-1] if self._posiciones else 0
+        if posicion - ultimo >= self.cada_asientos:
+            self._agregar(posicion, fecha, estado)
+
+    def buscar(self, posicion: int) -> Optional[PuntoControl]:
+        """Punto de control más cercano en o antes de una posición"""
+        i = bisect_right(self._posiciones, posicion)
+        return self._puntos[i - 1] if i else None
+
+    def limpiar(self):
+        """Descarta todos los puntos (p. ej. al cambiar el catálogo)"""
+        self._puntos = []
+        self._posiciones = []
+
+    def __len__(self) -> int:
+        return len(self._puntos)
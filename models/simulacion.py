@@ -0,0 +1,274 @@
+"""
+models/simulacion.py
+Simulación de escenarios hipotéticos sobre el estado actual
+
+Cada escenario es una lista de operaciones (tipo, parámetros) que se aplica
+sobre una bifurcación del modelo (BalanceModel.bifurcar, sin copiar
+saldos). Los escenarios se reparten en un pool de procesos: cada proceso
+recibe el estado base una sola vez y lo bifurca por escenario.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from models.operaciones import COLUMNAS_LOTE
+
+# Con menos escenarios por proceso el arranque del pool cuesta más que el cálculo
+MIN_ESCENARIOS_POR_PROCESO = 200
+
+# Escenarios que se envían juntos a un proceso
+ESCENARIOS_POR_ENVIO = 50
+
+CUENTAS_EFECTIVO = ('CAJA', 'BANCO')
+
+METRICAS = ('efectivo', 'activo_circulante', 'pasivo_corto_plazo',
+            'pasivo_total', 'razon_circulante', 'diferencia')
+
+Operacion = Tuple[str, Dict]
+
+
+class Escenario(NamedTuple):
+    """Operaciones hipotéticas que se aplican juntas sobre el estado actual"""
+    nombre: str
+    operaciones: Tuple[Operacion, ...]
+
+
+# === GENERACIÓN DE ESCENARIOS ===
+
+def escenarios_anticipo(cuenta_pago: str, tipo_destino: str, cuenta_destino: str,
+                        total: float,
+                        cuentas_pasivo: Sequence[Tuple[str, str]],
+                        porcentajes: Optional[Iterable[float]] = None) -> Iterator[Escenario]:
+    """
+    Barrido del porcentaje de anticipo de una compra combinada
+
+    Args:
+        cuentas_pasivo: (categoría, cuenta) de cada proveedor o acreedor
+        porcentajes: Valores entre 0 y 1 (por omisión 0%, 1%, ..., 100%)
+    """
+    porcentajes = list(porcentajes) if porcentajes is not None else [
+        i / 100 for i in range(101)
+    ]
+    for tipo_pasivo, cuenta_pasivo in cuentas_pasivo:
+        for porcentaje in porcentajes:
+            yield Escenario(
+                f"{cuenta_pasivo} {porcentaje:.0%}",
+                (('COMPRA COMBINADA', {
+                    'cuenta_pago': cuenta_pago,
+                    'tipo_destino': tipo_destino,
+                    'cuenta_destino': cuenta_destino,
+                    'tipo_pasivo': tipo_pasivo,
+                    'cuenta_pasivo': cuenta_pasivo,
+                    'total': total,
+                    'porcentaje_anticipo': porcentaje
+                }),)
+            )
+
+
+def escenarios_montecarlo(plantillas: Sequence[Operacion], num_escenarios: int,
+                          operaciones_por_escenario: int,
+                          total_min: float, total_max: float,
+                          semilla: Optional[int] = None) -> Iterator[Escenario]:
+    """
+    Flujos aleatorios de operaciones
+
+    Cada operación toma una plantilla al azar (tipo y parámetros sin el
+    monto) y un total uniforme entre total_min y total_max. Con la misma
+    semilla se generan los mismos escenarios.
+    """
+    for plantilla in plantillas:
+        if plantilla[0] not in COLUMNAS_LOTE:
+            raise ValueError(f"Tipo desconocido: {plantilla[0]}")
+
+    for i in range(num_escenarios):
+        azar = random.Random(None if semilla is None else semilla + i)
+        operaciones = []
+        for _ in range(operaciones_por_escenario):
+            tipo, parametros = azar.choice(plantillas)
+            monto = 'total_venta' if tipo == 'ANTICIPO CLIENTES' else 'total'
+            operaciones.append((tipo, dict(parametros, **{
+                monto: round(azar.uniform(total_min, total_max), 2)
+            })))
+        yield Escenario(f"#{i + 1}", tuple(operaciones))
+
+
+# === EJECUCIÓN ===
+
+def aplicar_operacion(modelo, tipo: str, parametros: Dict) -> Dict:
+    """Aplica una operación (mismos parámetros que realizar_operacion)"""
+    if tipo == 'COMPRA EFECTIVO':
+        return modelo.compra_efectivo(
+            parametros['cuenta_pago'], parametros['tipo_destino'],
+            parametros['cuenta_destino'], parametros['total'])
+    if tipo == 'COMPRA CREDITO':
+        return modelo.compra_credito(
+            [(parametros['tipo_activo'], parametros['cuenta'], parametros['total'])],
+            parametros['tipo_pasivo'], parametros['cuenta_pasivo'])
+    if tipo == 'COMPRA COMBINADA':
+        return modelo.compra_combinada(
+            parametros['cuenta_pago'], parametros['tipo_destino'], parametros['cuenta_destino'],
+            parametros['tipo_pasivo'], parametros['cuenta_pasivo'], parametros['total'],
+            parametros['porcentaje_anticipo'])
+    if tipo == 'ANTICIPO CLIENTES':
+        return modelo.anticipo_clientes(
+            parametros['cuenta_recibe'], parametros['total_venta'],
+            parametros['porcentaje_anticipo'])
+    raise ValueError(f"Tipo desconocido: {tipo}")
+
+
+def _pago_requerido(tipo: str, parametros: Dict) -> Optional[Tuple[str, float]]:
+    """Cuenta y monto que deben tener fondos (como en el controlador)"""
+    if tipo == 'COMPRA EFECTIVO':
+        return parametros['cuenta_pago'], parametros['total']
+    if tipo == 'COMPRA COMBINADA':
+        return parametros['cuenta_pago'], parametros['total'] * parametros['porcentaje_anticipo']
+    return None
+
+
+def simular_escenario(base, escenario: Escenario, forzar: bool = False,
+                      cuentas_efectivo: Sequence[str] = CUENTAS_EFECTIVO) -> Dict:
+    """
+    Aplica un escenario sobre una bifurcación del modelo base
+
+    Sin forzar, las operaciones sin fondos suficientes se omiten y se
+    cuentan como rechazadas. Las que fallan (p. ej. cuenta inexistente)
+    también se cuentan, con su error.
+    """
+    modelo = base.bifurcar()
+    rechazadas = 0
+    errores = []
+
+    for tipo, parametros in escenario.operaciones:
+        try:
+            pago = _pago_requerido(tipo, parametros)
+            if pago and not forzar and \
+                    modelo.estado_actual['ACTIVO_CIRCULANTE'][pago[0]] < pago[1]:
+                rechazadas += 1
+                continue
+            aplicar_operacion(modelo, tipo, parametros)
+        except (KeyError, ValueError) as e:
+            rechazadas += 1
+            errores.append(f"{tipo}: {e}")
+
+    totales = modelo.calcular_totales()
+    circulante = modelo.estado_actual['ACTIVO_CIRCULANTE']
+    pasivo_cp = totales['pasivo_corto_plazo']
+
+    return {
+        'nombre': escenario.nombre,
+        'operaciones': len(escenario.operaciones),
+        'rechazadas': rechazadas,
+        'errores': errores[:10],
+        'efectivo': sum(circulante[c] for c in cuentas_efectivo if c in circulante),
+        'activo_circulante': totales['activo_circulante'],
+        'pasivo_corto_plazo': pasivo_cp,
+        'pasivo_total': totales['pasivo_largo_plazo'] + pasivo_cp,
+        'razon_circulante': totales['activo_circulante'] / pasivo_cp if pasivo_cp else None,
+        'diferencia': totales['diferencia'],
+        'balance_cuadra': totales['balance_cuadra']
+    }
+
+
+# Modelo base de cada proceso del pool (se crea una vez en _iniciar_proceso)
+_BASE = None
+
+
+def _datos_base(modelo) -> Dict:
+    """Lo necesario para reconstruir el modelo en otro proceso"""
+    ultimo = modelo.diario.ultimo
+    return {
+        'almacenamiento': modelo.almacenamiento,
+        'tasa_iva': modelo.tasa_iva,
+        'catalogo': {c: dict(cuentas) for c, cuentas in modelo.catalogo.a_dict().items()},
+        'saldos': {c: dict(cuentas) for c, cuentas in modelo.estado_actual.a_dict().items()},
+        'secuencia': ultimo.secuencia if ultimo else 0,
+        'fecha': ultimo.fecha if ultimo else None
+    }
+
+
+def _iniciar_proceso(datos: Dict):
+    from models.balance_model import BalanceModel
+
+    global _BASE
+    _BASE = BalanceModel(almacenamiento=datos['almacenamiento'])
+    _BASE.tasa_iva = datos['tasa_iva']
+    _BASE.cargar_estado(datos['catalogo'], (), datos['saldos'])
+    _BASE.diario.continuar_desde(datos['secuencia'], datos['fecha'])
+
+
+def _simular_envio(escenarios: List[Escenario], forzar: bool,
+                   cuentas_efectivo: Sequence[str]) -> List[Dict]:
+    return [simular_escenario(_BASE, e, forzar, cuentas_efectivo) for e in escenarios]
+
+
+def resumir(resultados: List[Dict]) -> Dict:
+    """Distribución (mínimo, percentiles, media, máximo) de cada métrica"""
+    resumen = {}
+    for metrica in METRICAS:
+        valores = sorted(r[metrica] for r in resultados if r[metrica] is not None)
+        if not valores:
+            resumen[metrica] = None
+            continue
+        ultimo = len(valores) - 1
+        resumen[metrica] = {
+            'min': valores[0],
+            'p5': valores[round(ultimo * 0.05)],
+            'p50': valores[round(ultimo * 0.50)],
+            'p95': valores[round(ultimo * 0.95)],
+            'max': valores[-1],
+            'media': sum(valores) / len(valores)
+        }
+
+    cuadran = sum(1 for r in resultados if r['balance_cuadra'])
+    resumen['balance_cuadra'] = {
+        'si': cuadran,
+        'no': len(resultados) - cuadran,
+        'proporcion': cuadran / len(resultados) if resultados else None
+    }
+    resumen['rechazadas'] = sum(r['rechazadas'] for r in resultados)
+    return resumen
+
+
+def simular(modelo, escenarios: Iterable[Escenario], procesos: Optional[int] = None,
+            forzar: bool = False,
+            cuentas_efectivo: Sequence[str] = CUENTAS_EFECTIVO) -> Dict:
+    """
+    Ejecuta escenarios sobre el estado actual del modelo (que no se modifica)
+
+    Args:
+        escenarios: Escenario a simular
+        procesos: Procesos del pool (por omisión uno por núcleo, con al
+                  menos MIN_ESCENARIOS_POR_PROCESO escenarios cada uno);
+                  con 1 todo se simula en el proceso actual
+        forzar: Aplica las operaciones aunque no haya fondos
+        cuentas_efectivo: Cuentas de ACTIVO_CIRCULANTE que cuentan como efectivo
+
+    Returns:
+        Dict con el resultado de cada escenario y el resumen de su distribución
+    """
+    escenarios = list(escenarios)
+    if procesos is None:
+        procesos = min(os.cpu_count() or 1, len(escenarios) // MIN_ESCENARIOS_POR_PROCESO)
+
+    if procesos <= 1:
+        resultados = [simular_escenario(modelo, e, forzar, cuentas_efectivo)
+                      for e in escenarios]
+    else:
+        envios = [escenarios[i:i + ESCENARIOS_POR_ENVIO]
+                  for i in range(0, len(escenarios), ESCENARIOS_POR_ENVIO)]
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso,
+                                 initargs=(_datos_base(modelo),)) as pool:
+            resultados = [
+                resultado
+                for parcial in pool.map(_simular_envio, envios,
+                                        [forzar] * len(envios),
+                                        [tuple(cuentas_efectivo)] * len(envios))
+                for resultado in parcial
+            ]
+
+    return {
+        'escenarios': resultados,
+        'resumen': resumir(resultados)
+    }
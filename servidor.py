@@ -0,0 +1,365 @@
+"""
+servidor.py
+Servicio HTTP/JSON local (asyncio) alrededor de BalanceController
+
+Solo usa la biblioteca estándar y, como balance.py, nunca importa tkinter.
+Las lecturas se atienden directamente en el ciclo de eventos, sin esperar a
+las escrituras. Las escrituras pasan por una cola con un único escritor,
+que aplica las pendientes en grupo y las confirma en la base de datos con
+una sola escritura antes de responder (group commit).
+
+Uso:
+    python -m servidor [--puerto 8765] [--bd ARCHIVO.sqlite] [--almacenamiento centavos]
+
+Rutas:
+    GET    /totales                        Totales del balance
+    GET    /estado                         Saldos actuales
+    GET    /catalogo                       Catálogo de cuentas
+    GET    /cuentas/CATEGORIA              Cuentas de una categoría
+    GET    /salud                          Asientos, escrituras y grupos
+    GET    /metricas[/prometheus]          Métricas (con --metricas)
+    POST   /operaciones                    {"tipo": ..., campos..., "fecha"?, "forzar"?}
+    POST   /cuentas                        {"categoria", "nombre", "valor"}
+    PUT    /cuentas/CATEGORIA/NOMBRE       {"valor"}
+    DELETE /cuentas/CATEGORIA/NOMBRE
+    POST   /deshacer, POST /rehacer
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.balance_controller import BalanceController
+from models.almacenamiento import ALMACENAMIENTOS
+
+MAX_CUERPO = 1 << 20
+
+ESTADOS_HTTP = {
+    200: 'OK',
+    201: 'Created',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+# Los datos son un dict (JSON) o texto plano (métricas de Prometheus)
+Respuesta = Tuple[int, Union[Dict, str]]
+
+
+class ServidorBalance:
+    """Servidor HTTP/JSON con lecturas concurrentes y un único escritor"""
+
+    def __init__(self, controller: BalanceController, max_grupo: int = 64):
+        self.controller = controller
+        self.max_grupo = max_grupo
+
+        self._cola: Optional[asyncio.Queue] = None
+        self.escrituras = 0
+        self.grupos = 0
+
+        # (método, primer segmento de la ruta) -> (función, es_escritura)
+        self._rutas: Dict[Tuple[str, str], Tuple[Callable, bool]] = {
+            ('GET', 'totales'): (self._totales, False),
+            ('GET', 'estado'): (self._estado, False),
+            ('GET', 'catalogo'): (self._catalogo, False),
+            ('GET', 'cuentas'): (self._cuentas, False),
+            ('GET', 'salud'): (self._salud, False),
+            ('GET', 'metricas'): (self._metricas, False),
+            ('POST', 'operaciones'): (self._operacion, True),
+            ('POST', 'cuentas'): (self._agregar_cuenta, True),
+            ('PUT', 'cuentas'): (self._modificar_cuenta, True),
+            ('DELETE', 'cuentas'): (self._eliminar_cuenta, True),
+            ('POST', 'deshacer'): (self._deshacer, True),
+            ('POST', 'rehacer'): (self._rehacer, True),
+        }
+
+    # === LECTURAS ===
+
+    def _totales(self, partes: List[str], datos: Dict) -> Respuesta:
+        return 200, self.controller.calcular_totales()
+
+    def _estado(self, partes: List[str], datos: Dict) -> Respuesta:
+        return 200, self.controller.obtener_estado_actual().a_dict()
+
+    def _catalogo(self, partes: List[str], datos: Dict) -> Respuesta:
+        return 200, self.controller.obtener_catalogo_completo().a_dict()
+
+    def _cuentas(self, partes: List[str], datos: Dict) -> Respuesta:
+        if len(partes) != 1:
+            return 404, {'error': "Use /cuentas/CATEGORIA"}
+        estado = self.controller.obtener_estado_actual()
+        if partes[0] not in estado:
+            return 404, {'error': f"Categoría no encontrada: {partes[0]}"}
+        return 200, dict(estado[partes[0]].items())
+
+    def _salud(self, partes: List[str], datos: Dict) -> Respuesta:
+        return 200, {
+            'asientos': len(self.controller.obtener_diario()),
+            'escrituras': self.escrituras,
+            'grupos': self.grupos,
+            'pendientes': self._cola.qsize() if self._cola else 0
+        }
+
+    def _metricas(self, partes: List[str], datos: Dict) -> Respuesta:
+        instrumentacion = self.controller.instrumentacion
+        if instrumentacion is None:
+            return 404, {'error': "Instrumentación desactivada (use --metricas)"}
+        if partes == ['prometheus']:
+            return 200, instrumentacion.a_prometheus()
+        return 200, instrumentacion.a_dict()
+
+    # === ESCRITURAS (solo desde el escritor) ===
+
+    def _operacion(self, partes: List[str], datos: Dict) -> Respuesta:
+        from models.importador import validar_registro
+
+        estado = self.controller.obtener_estado_actual()
+        try:
+            tipo, parametros, fecha = validar_registro(
+                datos, lambda cat, cuenta: cat in estado and cuenta in estado[cat]
+            )
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+        exito, detalles, mensaje = self.controller.realizar_operacion(
+            tipo, parametros, bool(datos.get('forzar')), fecha
+        )
+        if not exito:
+            return 400, {'error': mensaje}
+        return 201, detalles
+
+    def _agregar_cuenta(self, partes: List[str], datos: Dict) -> Respuesta:
+        try:
+            categoria, nombre, valor = datos['categoria'], datos['nombre'], float(datos['valor'])
+        except (KeyError, TypeError, ValueError):
+            return 400, {'error': "Se requieren 'categoria', 'nombre' y 'valor' numérico"}
+        if categoria not in self.controller.obtener_catalogo_completo():
+            return 404, {'error': f"Categoría no encontrada: {categoria}"}
+
+        exito, mensaje = self.controller.agregar_cuenta(categoria, nombre, valor)
+        return (201 if exito else 400), {'mensaje' if exito else 'error': mensaje}
+
+    def _modificar_cuenta(self, partes: List[str], datos: Dict) -> Respuesta:
+        if len(partes) != 2:
+            return 404, {'error': "Use /cuentas/CATEGORIA/NOMBRE"}
+        try:
+            valor = float(datos['valor'])
+        except (KeyError, TypeError, ValueError):
+            return 400, {'error': "Se requiere 'valor' numérico"}
+        if partes[0] not in self.controller.obtener_catalogo_completo():
+            return 404, {'error': f"Categoría no encontrada: {partes[0]}"}
+
+        exito, mensaje = self.controller.modificar_cuenta(partes[0], partes[1], valor)
+        return (200 if exito else 404), {'mensaje' if exito else 'error': mensaje}
+
+    def _eliminar_cuenta(self, partes: List[str], datos: Dict) -> Respuesta:
+        if len(partes) != 2:
+            return 404, {'error': "Use /cuentas/CATEGORIA/NOMBRE"}
+        if partes[0] not in self.controller.obtener_catalogo_completo():
+            return 404, {'error': f"Categoría no encontrada: {partes[0]}"}
+
+        exito, mensaje = self.controller.eliminar_cuenta(partes[0], partes[1])
+        return (200 if exito else 400), {'mensaje' if exito else 'error': mensaje}
+
+    def _deshacer(self, partes: List[str], datos: Dict) -> Respuesta:
+        exito, detalles, mensaje = self.controller.deshacer()
+        return (200 if exito else 400), (detalles if exito else {'error': mensaje})
+
+    def _rehacer(self, partes: List[str], datos: Dict) -> Respuesta:
+        exito, detalles, mensaje = self.controller.rehacer()
+        return (200 if exito else 400), (detalles if exito else {'error': mensaje})
+
+    async def _escritor(self):
+        """
+        Aplica las escrituras en orden de llegada
+
+        Toma todas las que ya esperan en la cola (hasta max_grupo), las
+        aplica una tras otra y las confirma en la base con una sola
+        escritura antes de responder a cada una.
+        """
+        while True:
+            grupo = [await self._cola.get()]
+            while len(grupo) < self.max_grupo and not self._cola.empty():
+                grupo.append(self._cola.get_nowait())
+
+            resultados = []
+            for funcion, partes, datos, futuro in grupo:
+                try:
+                    resultados.append((futuro, funcion(partes, datos)))
+                except Exception as e:
+                    resultados.append((futuro, (500, {'error': f"Error interno: {e}"})))
+
+            try:
+                self.controller.confirmar()
+            except Exception as e:
+                resultados = [(futuro, (500, {'error': f"Error al guardar: {e}"}))
+                              for futuro, _ in resultados]
+
+            self.escrituras += len(grupo)
+            self.grupos += 1
+            for futuro, respuesta in resultados:
+                if not futuro.cancelled():
+                    futuro.set_result(respuesta)
+
+    # === HTTP ===
+
+    async def despachar(self, metodo: str, ruta: str, cuerpo: bytes) -> Respuesta:
+        """Resuelve una petición a su respuesta (estado, datos)"""
+        partes = [unquote(p) for p in ruta.split('?', 1)[0].split('/') if p]
+        if not partes:
+            return 200, {'rutas': sorted(f"{m} /{r}" for m, r in self._rutas)}
+
+        ruta_conocida = any(r == partes[0] for _, r in self._rutas)
+        destino = self._rutas.get((metodo, partes[0]))
+        if destino is None:
+            return (405 if ruta_conocida else 404), {'error': f"{metodo} /{partes[0]} no existe"}
+
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+        except ValueError as e:
+            return 400, {'error': f"JSON inválido: {e}"}
+        if not isinstance(datos, dict):
+            return 400, {'error': "Se esperaba un objeto JSON"}
+
+        funcion, es_escritura = destino
+        if not es_escritura:
+            return funcion(partes[1:], datos)
+
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((funcion, partes[1:], datos, futuro))
+        return await futuro
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atiende una conexión (HTTP/1.1 con keep-alive)"""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                metodo, ruta, version = linea.decode('latin-1').split()
+
+                encabezados = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    encabezados[nombre.strip().lower()] = valor.strip()
+
+                largo = int(encabezados.get('content-length') or 0)
+                if largo > MAX_CUERPO:
+                    estado, datos = 413, {'error': "Cuerpo demasiado grande"}
+                    cerrar = True
+                else:
+                    cuerpo = await lector.readexactly(largo) if largo else b''
+                    try:
+                        estado, datos = await self.despachar(metodo.upper(), ruta, cuerpo)
+                    except Exception as e:
+                        # Un error de una lectura no debe cortar la conexión
+                        estado, datos = 500, {'error': f"Error interno: {e}"}
+                    cerrar = (encabezados.get('connection', '').lower() == 'close'
+                              or version == 'HTTP/1.0')
+
+                if isinstance(datos, str):
+                    tipo = 'text/plain; version=0.0.4; charset=utf-8'
+                    contenido = datos.encode('utf-8')
+                else:
+                    tipo = 'application/json; charset=utf-8'
+                    contenido = json.dumps(datos, ensure_ascii=False,
+                                           default=_a_json).encode('utf-8')
+                escritor.write(
+                    f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+                    f"Content-Type: {tipo}\r\n"
+                    f"Content-Length: {len(contenido)}\r\n"
+                    f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n"
+                    .encode('latin-1') + contenido
+                )
+                await escritor.drain()
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host: str = '127.0.0.1', puerto: int = 8765):
+        """Escucha hasta que se cancele la tarea"""
+        self._cola = asyncio.Queue()
+        escritor = asyncio.create_task(self._escritor())
+
+        # SIGTERM termina igual que Ctrl+C (no disponible en Windows)
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+
+        servidor = await asyncio.start_server(self._atender, host, puerto)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            escritor.cancel()
+
+
+def _a_json(valor):
+    """Valores que json no convierte solo (fechas, tuplas con nombre)"""
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if hasattr(valor, '_asdict'):
+        return valor._asdict()
+    return str(valor)
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Define los argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog='python -m servidor',
+        description="Servicio HTTP/JSON local del Balance General"
+    )
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Dirección de escucha (por omisión solo local)")
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--bd', metavar='ARCHIVO.sqlite',
+                        help="Base SQLite (o libro binario .blib) con catálogo, "
+                             "saldos y diario")
+    parser.add_argument('--almacenamiento', choices=ALMACENAMIENTOS, default='diccionario',
+                        help="Motor de almacenamiento de saldos")
+    parser.add_argument('--grupo', type=int, default=64,
+                        help="Máximo de escrituras confirmadas juntas")
+    parser.add_argument('--metricas', action='store_true',
+                        help="Mide llamadas y asientos (GET /metricas)")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Función principal; retorna el código de salida"""
+    args = crear_parser().parse_args(argv)
+
+    controller = BalanceController(almacenamiento=args.almacenamiento, base_datos=args.bd)
+    if args.metricas:
+        controller.activar_instrumentacion()
+    servidor = ServidorBalance(controller, args.grupo)
+    print(f"Escuchando en http://{args.host}:{args.puerto}/", file=sys.stderr)
+    try:
+        asyncio.run(servidor.servir(args.host, args.puerto))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        controller.cerrar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
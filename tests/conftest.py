@@ -0,0 +1,50 @@
+"""
+tests/conftest.py
+Configuración común de las pruebas
+"""
+
+import os
+import sys
+
+import pytest
+
+# Los módulos se importan como desde main.py (models, controllers, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.almacenamiento import ALMACENAMIENTOS  # noqa: E402
+from models.balance_model import BalanceModel  # noqa: E402
+
+
+@pytest.fixture(params=ALMACENAMIENTOS)
+def almacenamiento(request) -> str:
+    """Motor de almacenamiento; la prueba se ejecuta con cada uno"""
+    return request.param
+
+
+@pytest.fixture
+def modelo(almacenamiento) -> BalanceModel:
+    """Modelo nuevo con el motor de almacenamiento de la prueba"""
+    return BalanceModel(almacenamiento=almacenamiento)
+
+
+@pytest.fixture
+def saldos():
+    """Función que aplana el estado actual de un modelo: (categoría, cuenta) -> saldo"""
+    def saldos(modelo) -> dict:
+        return {(categoria, cuenta): saldo
+                for categoria, cuentas in modelo.estado_actual.a_dict().items()
+                for cuenta, saldo in cuentas.items()}
+    return saldos
+
+
+@pytest.fixture
+def raiz():
+    """Ventana Tk oculta; las pruebas de vistas se omiten sin pantalla"""
+    import tkinter as tk
+    try:
+        ventana = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"Sin pantalla para Tk: {e}")
+    ventana.withdraw()
+    yield ventana
+    ventana.destroy()
@@ -0,0 +1,64 @@
+"""
+tests/test_almacenamiento.py
+Índice de cuentas y motores de almacenamiento
+"""
+
+import pytest
+
+from models.almacenamiento import crear_estado
+from models.indice_cuentas import IndiceCuentas
+
+CATALOGO = {
+    'ACTIVO_CIRCULANTE': {'CAJA': 100.0, 'BANCO': 250.5},
+    'PASIVO_CORTO_PLAZO': {'PROVEEDORES': 80.0},
+}
+
+
+def test_los_slots_son_estables_y_no_se_reutilizan():
+    indice = IndiceCuentas(['ACTIVO_CIRCULANTE', 'CAPITAL'])
+    caja = indice.agregar('ACTIVO_CIRCULANTE', 'CAJA')
+    banco = indice.agregar('ACTIVO_CIRCULANTE', 'BANCO')
+    assert indice.agregar('ACTIVO_CIRCULANTE', 'CAJA') == caja
+
+    assert indice.eliminar('ACTIVO_CIRCULANTE', 'CAJA') == caja
+    assert indice.codigos_categoria[caja] == IndiceCuentas.LIBRE
+    with pytest.raises(KeyError):
+        indice.slot('ACTIVO_CIRCULANTE', 'CAJA')
+
+    nueva = indice.agregar('ACTIVO_CIRCULANTE', 'CAJA')
+    assert nueva not in (caja, banco)
+    assert len(indice) == 3
+    assert list(indice.cuentas('ACTIVO_CIRCULANTE')) == ['BANCO', 'CAJA']
+    assert (indice.categoria_de(nueva), indice.nombre_de(nueva)) == ('ACTIVO_CIRCULANTE', 'CAJA')
+    assert indice.slot('ACTIVO_CIRCULANTE', 'BANCO') == banco
+
+
+@pytest.mark.parametrize('almacenamiento', ['diccionario', 'arreglo'])
+def test_altas_bajas_y_sumas_por_categoria(almacenamiento):
+    estado = crear_estado(almacenamiento, CATALOGO)
+    estado['ACTIVO_CIRCULANTE']['INVENTARIO'] = 40.0
+    del estado['ACTIVO_CIRCULANTE']['CAJA']
+    estado['PASIVO_CORTO_PLAZO']['PROVEEDORES'] = 90.0
+
+    assert estado.sumar_categorias() == pytest.approx(
+        {'ACTIVO_CIRCULANTE': 290.5, 'PASIVO_CORTO_PLAZO': 90.0})
+    assert estado.a_dict() == {
+        'ACTIVO_CIRCULANTE': {'BANCO': 250.5, 'INVENTARIO': 40.0},
+        'PASIVO_CORTO_PLAZO': {'PROVEEDORES': 90.0},
+    }
+
+
+@pytest.mark.parametrize('almacenamiento', ['diccionario', 'arreglo'])
+def test_la_copia_no_comparte_saldos(almacenamiento):
+    estado = crear_estado(almacenamiento, CATALOGO)
+    copia = estado.copiar()
+    copia['ACTIVO_CIRCULANTE']['CAJA'] = 0.0
+
+    assert estado['ACTIVO_CIRCULANTE']['CAJA'] == 100.0
+    assert estado.sumar_categorias()['ACTIVO_CIRCULANTE'] == pytest.approx(350.5)
+    assert copia.sumar_categorias()['ACTIVO_CIRCULANTE'] == pytest.approx(250.5)
+
+
+def test_motor_desconocido():
+    with pytest.raises(ValueError):
+        crear_estado('hoja de calculo', CATALOGO)
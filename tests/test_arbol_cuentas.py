@@ -0,0 +1,127 @@
+"""
+tests/test_arbol_cuentas.py
+Subcuentas jerárquicas y totales por nivel
+"""
+
+import threading
+
+import pytest
+
+from controllers.concurrencia import BalanceControllerConcurrente
+
+from models.almacenamiento import crear_estado
+from models.arbol_cuentas import ArbolCuentas, ruta_valida
+
+CATALOGO = {
+    'ACTIVO_CIRCULANTE': {'CAJA': 100.0, 'BANCO/BBVA/CTA 1': 300.0, 'BANCO/BBVA/CTA 2': 200.0,
+                          'BANCO/HSBC': 50.0},
+    'CAPITAL': {'CAPITAL SOCIAL': 1000.0},
+}
+
+
+def test_totales_por_nivel():
+    arbol = ArbolCuentas(crear_estado('diccionario', CATALOGO))
+
+    assert arbol.total('ACTIVO_CIRCULANTE', 'BANCO') == 550
+    assert arbol.total('ACTIVO_CIRCULANTE', 'BANCO/BBVA') == 500
+    assert arbol.total('ACTIVO_CIRCULANTE', 'CAJA') == 100
+    with pytest.raises(KeyError):
+        arbol.total('ACTIVO_CIRCULANTE', 'BANCO/SANTANDER')
+
+    assert arbol.hijos('ACTIVO_CIRCULANTE') == [('CAJA', 100, False), ('BANCO', 550, True)]
+    assert arbol.hijos('ACTIVO_CIRCULANTE', 'BANCO') == [('BANCO/BBVA', 500, True),
+                                                         ('BANCO/HSBC', 50, False)]
+    assert arbol.hijos('CAPITAL', 'CAPITAL SOCIAL') == []
+
+
+def test_acumular_suma_a_toda_la_cadena():
+    estado = crear_estado('diccionario', CATALOGO)
+    arbol = ArbolCuentas(estado)
+
+    estado['ACTIVO_CIRCULANTE']['BANCO/BBVA/CTA 1'] += 25
+    arbol.acumular('ACTIVO_CIRCULANTE', 'BANCO/BBVA/CTA 1', 25)
+    arbol.acumular('ACTIVO_CIRCULANTE', 'CAJA', 10)
+
+    assert arbol.total('ACTIVO_CIRCULANTE', 'BANCO/BBVA/CTA 1') == 325
+    assert arbol.total('ACTIVO_CIRCULANTE', 'BANCO/BBVA') == 525
+    assert arbol.total('ACTIVO_CIRCULANTE', 'BANCO') == 575
+    assert arbol.totales() == ArbolCuentas(estado).totales()
+
+
+def test_alta_de_subcuenta_bajo_una_cuenta_plana():
+    estado = crear_estado('diccionario', CATALOGO)
+    arbol = ArbolCuentas(estado)
+
+    estado['ACTIVO_CIRCULANTE']['CAJA/CHICA'] = 5.0
+    arbol.agregar('ACTIVO_CIRCULANTE', 'CAJA/CHICA')
+
+    # CAJA conserva su saldo propio y ahora suma el de su subcuenta
+    assert arbol.total('ACTIVO_CIRCULANTE', 'CAJA') == 105
+    assert arbol.hijos('ACTIVO_CIRCULANTE', 'CAJA') == [('CAJA/CHICA', 5, False)]
+    assert arbol.totales() == ArbolCuentas(estado).totales()
+
+
+def test_baja_quita_los_niveles_vacios():
+    estado = crear_estado('diccionario', CATALOGO)
+    arbol = ArbolCuentas(estado)
+
+    for cuenta in ('BANCO/BBVA/CTA 1', 'BANCO/BBVA/CTA 2'):
+        arbol.eliminar('ACTIVO_CIRCULANTE', cuenta)
+        del estado['ACTIVO_CIRCULANTE'][cuenta]
+
+    assert ('ACTIVO_CIRCULANTE', 'BANCO/BBVA') not in arbol.totales()
+    assert arbol.total('ACTIVO_CIRCULANTE', 'BANCO') == 50
+    assert arbol.hijos('ACTIVO_CIRCULANTE', 'BANCO') == [('BANCO/HSBC', 50, False)]
+
+
+def test_ruta_valida():
+    assert ruta_valida('BANCO/BBVA')
+    assert not ruta_valida('BANCO//BBVA')
+    assert not ruta_valida('/BANCO')
+    assert not ruta_valida('BANCO/ ')
+
+
+def test_el_modelo_mantiene_los_niveles(modelo):
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'BANCO/BBVA', 1000)
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'BANCO/HSBC', 500.25)
+    modelo.compra_efectivo('BANCO/BBVA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116)
+    banco = modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'BANCO')
+
+    assert modelo.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO') == pytest.approx(banco + 1384.25)
+    assert modelo.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO/BBVA') == pytest.approx(884)
+    assert modelo.total_cuenta('ACTIVO_CIRCULANTE') == \
+        pytest.approx(sum(modelo.estado_actual['ACTIVO_CIRCULANTE'].values()))
+    assert ('BANCO/HSBC', pytest.approx(500.25), False) in \
+        modelo.obtener_subcuentas('ACTIVO_CIRCULANTE', 'BANCO')
+
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'BANCO/HSBC')
+    assert modelo.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO') == pytest.approx(banco + 884)
+    modelo.verificar_subtotales()
+
+
+def test_total_de_nivel_no_espera_al_escritor():
+    controller = BalanceControllerConcurrente()
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'Banco / BBVA', 300)
+    controller.obtener_publicacion()
+    escribiendo, soltar = threading.Event(), threading.Event()
+
+    def escribir(c):
+        escribiendo.set()
+        soltar.wait(5)
+        return c.agregar_cuenta('ACTIVO_CIRCULANTE', 'BANCO/HSBC', 200)
+
+    escritor = threading.Thread(
+        target=controller.aplicar_si_version, args=(controller.version, escribir))
+    escritor.start()
+    try:
+        assert escribiendo.wait(5)
+        # Con el candado de escritura tomado se lee la publicación anterior
+        assert controller.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO/BBVA') == 300
+        with pytest.raises(KeyError):
+            controller.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO/HSBC')
+    finally:
+        soltar.set()
+        escritor.join()
+
+    assert controller.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO/HSBC') == 200
+    assert controller.total_cuenta('ACTIVO_CIRCULANTE', 'BANCO/BBVA') == 300
@@ -0,0 +1,40 @@
+"""
+tests/test_balance_al.py
+Balance a una fecha con puntos de control
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from models.balance_model import BalanceModel
+
+
+def test_balance_al_fechas_pasadas(almacenamiento):
+    modelo = BalanceModel(almacenamiento=almacenamiento, puntos_control_cada=7)
+    inicio = date(2024, 1, 1)
+    for dia in range(60):
+        modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116,
+                               inicio + timedelta(days=dia))
+    assert len(modelo.puntos_control) > 0
+
+    assert modelo.balance_al(date(2023, 12, 31))['estado']['ACTIVO_CIRCULANTE']['BANCO'] == \
+        pytest.approx(2000000)
+    for dia in (0, 6, 7, 30, 59):
+        balance = modelo.balance_al(inicio + timedelta(days=dia))
+        assert balance['asientos'] == dia + 1
+        assert balance['reproducidos'] <= 7
+        assert balance['estado']['ACTIVO_CIRCULANTE']['BANCO'] == \
+            pytest.approx(2000000 - 116 * (dia + 1))
+        assert balance['totales']['balance_cuadra']
+
+
+def test_balance_al_ultima_fecha_es_el_estado_actual(almacenamiento):
+    modelo = BalanceModel(almacenamiento=almacenamiento, puntos_control_cada=3)
+    for dia in range(10):
+        modelo.anticipo_clientes('CAJA', 1160, 0.5, date(2024, 1, 1) + timedelta(days=dia))
+    modelo.modificar_cuenta('ACTIVO_CIRCULANTE', 'RENTA', 1000)
+
+    balance = modelo.balance_al(date(2024, 1, 10))
+    assert balance['estado'] == modelo.estado_actual.a_dict()
+    assert balance['totales'] == pytest.approx(modelo.calcular_totales())
@@ -0,0 +1,70 @@
+"""
+tests/test_balance_model.py
+Subtotales incrementales del modelo
+"""
+
+from datetime import date
+
+import pytest
+
+from models.balance_model import BalanceModel
+
+
+def _sumar(estado, categoria: str) -> float:
+    return sum(estado[categoria].values())
+
+
+def test_subtotales_siguen_a_transacciones_y_catalogo():
+    modelo = BalanceModel(depurar_totales=True)
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600)
+    modelo.compra_credito([('ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO', 23200)],
+                          'PASIVO_CORTO_PLAZO', 'PROVEEDORES')
+    modelo.compra_combinada('CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA',
+                            'PASIVO_CORTO_PLAZO', 'PROVEEDORES', 1160, 0.5)
+    modelo.anticipo_clientes('CAJA', 5800, 0.5)
+    modelo.agregar_cuenta('CAPITAL', 'RESERVA', 1000)
+    modelo.modificar_cuenta('ACTIVO_CIRCULANTE', 'CAJA', 51000)
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'RENTA')
+
+    totales = modelo.calcular_totales()
+
+    estado = modelo.estado_actual
+    assert totales['total_activo'] == pytest.approx(
+        _sumar(estado, 'ACTIVO_CIRCULANTE') + _sumar(estado, 'ACTIVO_NO_CIRCULANTE'))
+    assert totales['pasivo_corto_plazo'] == pytest.approx(_sumar(estado, 'PASIVO_CORTO_PLAZO'))
+    modelo.verificar_subtotales()
+
+
+def test_depurar_totales_detecta_subtotales_desincronizados():
+    modelo = BalanceModel(depurar_totales=True)
+    modelo.estado_actual['ACTIVO_CIRCULANTE']['CAJA'] += 1
+
+    with pytest.raises(AssertionError):
+        modelo.calcular_totales()
+
+
+def test_reiniciar_vuelve_a_los_subtotales_del_catalogo(almacenamiento):
+    modelo = BalanceModel(depurar_totales=True, almacenamiento=almacenamiento)
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600, date(2024, 1, 15))
+    modelo.agregar_cuenta('CAPITAL', 'RESERVA', 1000)
+    modelo.modificar_cuenta('ACTIVO_CIRCULANTE', 'CAJA', 51000)
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'RENTA', 1160, date(2024, 2, 1))
+
+    modelo.reiniciar()
+
+    modelo.verificar_subtotales()
+    assert modelo.calcular_totales()['total_activo'] == pytest.approx(22250000 + 1000 - 50000)
+    assert len(modelo.diario) == 0
+
+
+def test_reiniciar_despues_de_fijar_apertura(modelo):
+    modelo.compra_credito([('ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO', 23200)],
+                          'PASIVO_CORTO_PLAZO', 'PROVEEDORES', date(2024, 2, 1))
+    modelo.fijar_apertura()
+    modelo.verificar_subtotales()
+
+    modelo.reiniciar()
+
+    modelo.verificar_subtotales()
+    assert modelo.calcular_totales()['pasivo_corto_plazo'] == 0
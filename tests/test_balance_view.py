@@ -0,0 +1,38 @@
+"""
+tests/test_balance_view.py
+Actualización en su lugar de la vista del balance
+"""
+
+from controllers.balance_controller import BalanceController
+from views.balance_view import BalanceView
+
+
+def test_mostrar_balance_conserva_las_filas(raiz):
+    controller = BalanceController()
+    vista = BalanceView(raiz)
+    vista.mostrar_balance(controller.obtener_estado_actual(), controller.calcular_totales())
+    caja = vista._filas[('ACTIVO_CIRCULANTE', 'CAJA')]
+
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 100)
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'CLIENTES', 10)
+    vista.mostrar_balance(controller.obtener_estado_actual(), controller.calcular_totales())
+
+    assert vista._filas[('ACTIVO_CIRCULANTE', 'CAJA')] is caja
+    assert caja.valor == controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'CAJA')
+    assert ('ACTIVO_CIRCULANTE', 'CLIENTES') in vista._filas
+
+
+def test_niveles_se_actualizan_con_total_cuenta(raiz):
+    controller = BalanceController()
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'BANCOS/BBVA', 300)
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'BANCOS/HSBC', 200)
+    vista = BalanceView(raiz, total_cuenta=controller.total_cuenta)
+    vista.nivel = 1
+    vista.mostrar_balance(controller.obtener_estado_actual(), controller.calcular_totales())
+    assert vista._filas[('ACTIVO_CIRCULANTE', 'BANCOS')].valor == 500
+
+    controller.realizar_compra_efectivo('BANCOS/BBVA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 50)
+    assert vista.actualizar_cuentas(controller.obtener_estado_actual(),
+                                    controller.calcular_totales(),
+                                    [('ACTIVO_CIRCULANTE', 'BANCOS/BBVA')])
+    assert vista._filas[('ACTIVO_CIRCULANTE', 'BANCOS')].valor == 450
@@ -0,0 +1,62 @@
+"""
+tests/test_base_datos.py
+Persistencia en SQLite
+"""
+
+import time
+from datetime import date
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+from models.balance_model import BalanceModel
+from models.base_datos import BaseDatos, leer_saldos
+
+
+def test_guardar_y_cargar_conserva_estado_y_diario(almacenamiento, tmp_path, saldos):
+    ruta = str(tmp_path / 'balance.sqlite')
+    controller = BalanceController(almacenamiento=almacenamiento, base_datos=ruta)
+    modelo = controller.modelo
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600, date(2024, 1, 15))
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'X', 1160, date(2024, 2, 1))
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'X')
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.anticipo_clientes('CAJA', 5800, 0.5, date(2024, 3, 1))
+    controller.cerrar()
+
+    cargado = BalanceController(almacenamiento=almacenamiento, base_datos=ruta)
+    assert saldos(cargado.modelo) == pytest.approx(saldos(modelo))
+    assert [a.secuencia for a in cargado.modelo.diario] == [a.secuencia for a in modelo.diario]
+    assert cargado.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'X') == 0
+    cargado.modelo.verificar_subtotales()
+    cargado.cerrar()
+
+
+def test_sesion_inactiva_confirma_al_vencer_el_plazo(tmp_path):
+    ruta = str(tmp_path / 'balance.sqlite')
+    modelo = BalanceModel()
+    base = BaseDatos(ruta, intervalo_commit=0.05)
+    base.guardar_todo(modelo)
+
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 1160)
+    base.sincronizar(modelo)
+    assert not base.confirmar_vencido(modelo)
+    assert leer_saldos(ruta)['ACTIVO_CIRCULANTE']['BANCO'] == 2000000
+
+    time.sleep(0.06)
+    assert base.confirmar_vencido(modelo)
+    assert leer_saldos(ruta)['ACTIVO_CIRCULANTE']['BANCO'] == 1998840
+    assert not base.confirmar_vencido(modelo)
+    base.cerrar(modelo)
+
+
+def test_error_de_la_base_no_deshace_la_operacion(tmp_path):
+    controller = BalanceController(base_datos=str(tmp_path / 'balance.sqlite'))
+    controller.base_datos.cerrar()
+
+    exito, mensaje = controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'CLIENTES', 100)
+
+    assert exito
+    assert 'aviso: no se guardó en la base de datos' in mensaje
+    assert controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'CLIENTES') == 100
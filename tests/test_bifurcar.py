@@ -0,0 +1,48 @@
+"""
+tests/test_bifurcar.py
+Una copia del modelo (bifurcar) no afecta al original
+"""
+
+from datetime import date
+
+import pytest
+
+from models.balance_model import BalanceModel
+
+
+def test_altas_y_bajas_en_la_copia_no_tocan_el_original(almacenamiento):
+    modelo = BalanceModel(depurar_totales=True, almacenamiento=almacenamiento)
+    cuentas = {c: modelo.obtener_cuentas(c) for c in modelo.catalogo}
+    totales = modelo.calcular_totales()
+
+    copia = modelo.bifurcar()
+    assert copia.agregar_cuenta('CAPITAL', 'NUEVA', 5)
+    assert copia.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+    copia.anticipo_clientes('CAJA', 1000, 0.5)
+
+    assert {c: modelo.obtener_cuentas(c) for c in modelo.catalogo} == cuentas
+    assert modelo.calcular_totales() == totales
+    modelo.verificar_subtotales()
+
+    assert 'NUEVA' in copia.obtener_cuentas('CAPITAL')
+    assert 'PAPELERIA' not in copia.obtener_cuentas('ACTIVO_CIRCULANTE')
+    copia.verificar_subtotales()
+
+
+def test_altas_en_el_original_no_aparecen_en_la_copia(modelo):
+    copia = modelo.bifurcar()
+
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'DESPUES', 10)
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+
+    assert 'DESPUES' not in copia.obtener_cuentas('ACTIVO_CIRCULANTE')
+    assert 'PAPELERIA' in copia.obtener_cuentas('ACTIVO_CIRCULANTE')
+    copia.verificar_subtotales()
+
+
+def test_copia_bifurcada_rechaza_fechas_anteriores():
+    modelo = BalanceModel()
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 1160, date(2024, 1, 15))
+
+    with pytest.raises(ValueError):
+        modelo.bifurcar().balance_al(date(2023, 12, 31))
@@ -0,0 +1,106 @@
+"""
+tests/test_buscador_cuentas.py
+Búsqueda de cuentas por prefijo, por palabra y aproximada
+"""
+
+import threading
+
+from controllers.balance_controller import BalanceController
+from controllers.concurrencia import BalanceControllerConcurrente
+from models.buscador_cuentas import BuscadorCuentas
+
+CATALOGO = {
+    'ACTIVO_CIRCULANTE': ['CAJA', 'BANCO', 'CLIENTES', 'IVA ACREDITABLE', 'IVA X ACREDITAR'],
+    'ACTIVO_NO_CIRCULANTE': ['EQ. COMPUTO', 'MOBILIARIO Y EQUIPO'],
+    'PASIVO_CORTO_PLAZO': ['PROVEEDORES', 'ANTICIPO DE CLIENTES'],
+    'CAPITAL': ['CAPITAL SOCIAL'],
+}
+
+
+def test_prefijo_sin_mayusculas_ni_acentos():
+    buscador = BuscadorCuentas(CATALOGO)
+
+    assert buscador.por_prefijo('iva') == [('ACTIVO_CIRCULANTE', 'IVA ACREDITABLE'),
+                                          ('ACTIVO_CIRCULANTE', 'IVA X ACREDITAR')]
+    assert buscador.por_prefijo('Cájá') == [('ACTIVO_CIRCULANTE', 'CAJA')]
+    assert buscador.por_prefijo('C', 'CAPITAL') == [('CAPITAL', 'CAPITAL SOCIAL')]
+    assert len(buscador.por_prefijo('', limite=3)) == 3
+
+
+def test_buscar_agrega_coincidencias_por_palabra():
+    buscador = BuscadorCuentas(CATALOGO)
+
+    assert buscador.buscar('cli') == [('ACTIVO_CIRCULANTE', 'CLIENTES'),
+                                      ('PASIVO_CORTO_PLAZO', 'ANTICIPO DE CLIENTES')]
+    assert buscador.buscar('equipo') == [('ACTIVO_NO_CIRCULANTE', 'MOBILIARIO Y EQUIPO')]
+
+
+def test_sin_coincidencias_sugiere_parecidas():
+    buscador = BuscadorCuentas(CATALOGO)
+
+    assert buscador.buscar('PROVEDORES')[0] == ('PASIVO_CORTO_PLAZO', 'PROVEEDORES')
+    assert buscador.aproximadas('CAPTAL SOCAL')[0] == ('CAPITAL', 'CAPITAL SOCIAL')
+    assert buscador.aproximadas('ZZZZ') == []
+
+
+def test_altas_y_bajas_con_indice_de_trigramas():
+    buscador = BuscadorCuentas(CATALOGO)
+    buscador.aproximadas('CAJA')
+
+    buscador.agregar('ACTIVO_CIRCULANTE', 'CAJA CHICA')
+    buscador.agregar('ACTIVO_CIRCULANTE', 'CAJA CHICA')
+    buscador.eliminar('ACTIVO_CIRCULANTE', 'CAJA')
+    buscador.eliminar('ACTIVO_CIRCULANTE', 'NO EXISTE')
+
+    assert buscador.buscar('caja') == [('ACTIVO_CIRCULANTE', 'CAJA CHICA')]
+    assert buscador.aproximadas('CAJA CHIKA')[0] == ('ACTIVO_CIRCULANTE', 'CAJA CHICA')
+    assert 'CAJA' not in buscador
+    assert len(buscador) == sum(len(cuentas) for cuentas in CATALOGO.values())
+
+
+def test_la_misma_cuenta_en_dos_categorias():
+    buscador = BuscadorCuentas(CATALOGO)
+    buscador.agregar('PASIVO_CORTO_PLAZO', 'CLIENTES')
+    assert buscador.categorias_de('CLIENTES') == ['ACTIVO_CIRCULANTE', 'PASIVO_CORTO_PLAZO']
+
+    buscador.eliminar('ACTIVO_CIRCULANTE', 'CLIENTES')
+    assert buscador.categorias_de('CLIENTES') == ['PASIVO_CORTO_PLAZO']
+
+
+def test_el_controlador_mantiene_el_indice_con_el_catalogo():
+    controller = BalanceController()
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'Depósitos en garantía', 0)
+
+    assert controller.buscar_cuentas('garantia') == \
+        [('ACTIVO_CIRCULANTE', 'DEPÓSITOS EN GARANTÍA')]
+    assert controller.ubicar_cuenta(' depósitos en garantía ') == ['ACTIVO_CIRCULANTE']
+
+    controller.eliminar_cuenta('ACTIVO_CIRCULANTE', 'DEPÓSITOS EN GARANTÍA')
+    assert ('ACTIVO_CIRCULANTE', 'DEPÓSITOS EN GARANTÍA') not in \
+        controller.buscar_cuentas('garantia')
+    assert controller.ubicar_cuenta('DEPÓSITOS EN GARANTÍA') == []
+
+
+def test_busquedas_desde_varios_hilos_mientras_se_agregan_cuentas():
+    controller = BalanceControllerConcurrente()
+    # El índice de trigramas ya está creado: las búsquedas no lo modifican
+    assert controller.modelo.buscador._trigramas is not None
+    errores = []
+
+    def buscar():
+        try:
+            for _ in range(200):
+                controller.buscar_cuentas('PROVEDORES')
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=buscar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for i in range(50):
+        controller.agregar_cuenta('ACTIVO_CIRCULANTE', f'BANCO {i}', 1)
+    for hilo in hilos:
+        hilo.join()
+
+    assert errores == []
+    assert ('ACTIVO_CIRCULANTE', 'BANCO 49') in controller.buscar_cuentas('banco 49')
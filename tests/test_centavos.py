@@ -0,0 +1,65 @@
+"""
+tests/test_centavos.py
+Redondeo y reparto del IVA en centavos enteros
+"""
+
+import numpy as np
+import pytest
+
+from models.balance_model import BalanceModel
+from models.centavos import a_centavos, calcular_iva_centavos, dividir_redondeando
+from models.lotes import calcular_iva_vectorizado, calcular_movimientos
+
+
+@pytest.mark.parametrize('monto, centavos', [
+    (1.005, 101), (-1.005, -101), (0.125, 13), (2.675, 268), (0.015, 2), (0.014999, 1),
+])
+def test_a_centavos_lleva_la_mitad_lejos_del_cero(monto, centavos):
+    assert a_centavos(monto) == centavos
+
+
+def test_dividir_redondeando_es_simetrico():
+    assert dividir_redondeando(5, 2) == 3
+    assert dividir_redondeando(-5, 2) == -3
+    assert dividir_redondeando(4, 3) == 1
+
+
+@pytest.mark.parametrize('incluye_iva', [True, False])
+def test_iva_vectorizado_igual_al_escalar(incluye_iva):
+    montos = np.arange(-5000, 50000, 7, dtype=np.int64)
+    subtotales, ivas = calcular_iva_vectorizado(montos, 0.16, incluye_iva, centavos=True)
+
+    esperados = [calcular_iva_centavos(int(m), 0.16, incluye_iva) for m in montos]
+    assert subtotales.tolist() == [s for s, _ in esperados]
+    assert ivas.tolist() == [i for _, i in esperados]
+
+
+def test_con_iva_incluido_subtotal_mas_iva_es_el_monto():
+    for monto in range(0, 100000, 13):
+        subtotal, iva = calcular_iva_centavos(monto, 0.16, incluye_iva=True)
+        assert subtotal + iva == monto
+
+
+@pytest.mark.parametrize('total, porcentaje', [(0.25, 0.5), (1160.05, 0.5), (999.99, 0.3)])
+def test_anticipo_escalar_igual_al_del_lote(total, porcentaje):
+    modelo = BalanceModel(almacenamiento='centavos')
+    detalles = modelo.anticipo_clientes('CAJA', total, porcentaje)
+
+    partes, resumen = calcular_movimientos('ANTICIPO CLIENTES', {
+        'cuenta_recibe': ['CAJA'], 'total_venta': [total], 'porcentaje_anticipo': [porcentaje]
+    }, 0.16, centavos=True)
+
+    assert detalles['anticipo'] == resumen['anticipo']
+    assert detalles['iva_anticipo'] == resumen['iva_anticipo']
+    assert a_centavos(detalles['sub_anticipo']) + a_centavos(detalles['iva_anticipo']) == \
+        a_centavos(detalles['anticipo'])
+
+
+def test_anticipo_de_medio_centavo_redondea_hacia_arriba():
+    modelo = BalanceModel(almacenamiento='centavos')
+    assert modelo.anticipo_clientes('CAJA', 0.25, 0.5)['anticipo'] == 0.13
+
+    _, resumen = calcular_movimientos('ANTICIPO CLIENTES', {
+        'cuenta_recibe': 'CAJA', 'total_venta': [0.25, 0.75], 'porcentaje_anticipo': 0.5
+    }, 0.16, centavos=True)
+    assert resumen['anticipo'] == pytest.approx(0.13 + 0.38)
@@ -0,0 +1,80 @@
+"""
+tests/test_concurrencia.py
+Publicaciones del controlador concurrente
+"""
+
+import threading
+
+import pytest
+
+from controllers.concurrencia import BalanceControllerConcurrente
+from models.base_datos import leer_saldos
+
+
+def test_publicacion_no_cambia_con_altas_y_bajas(almacenamiento):
+    controller = BalanceControllerConcurrente(almacenamiento=almacenamiento)
+    publicacion = controller.obtener_publicacion()
+    cuentas = list(publicacion.estado['ACTIVO_CIRCULANTE'])
+    catalogo = list(publicacion.catalogo['CAPITAL'])
+
+    controller.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+    controller.agregar_cuenta('CAPITAL', 'NUEVA', 100)
+
+    assert list(publicacion.estado['ACTIVO_CIRCULANTE']) == cuentas
+    assert list(publicacion.catalogo['CAPITAL']) == catalogo
+    estado = publicacion.estado
+    suma = sum(estado.a_unidad(v) for v in estado['ACTIVO_CIRCULANTE'].values())
+    assert suma == pytest.approx(publicacion.subtotales['ACTIVO_CIRCULANTE'])
+
+
+def test_escrituras_desde_varios_hilos():
+    controller = BalanceControllerConcurrente(almacenamiento='centavos')
+
+    def comprar():
+        for _ in range(200):
+            controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 1)
+
+    hilos = [threading.Thread(target=comprar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(controller.obtener_diario()) == 800
+    assert controller.verificar_balance_cuadrado()[0]
+    controller.modelo.verificar_subtotales()
+
+
+def test_escrituras_desde_varios_hilos_con_base_datos(tmp_path):
+    ruta = str(tmp_path / 'balance.sqlite')
+    controller = BalanceControllerConcurrente(almacenamiento='centavos', base_datos=ruta)
+    resultados = []
+
+    def comprar():
+        for _ in range(50):
+            resultados.append(controller.realizar_compra_efectivo(
+                'CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 1)[0])
+
+    hilos = [threading.Thread(target=comprar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    esperado = controller.obtener_estado_actual()['ACTIVO_CIRCULANTE']['INVENTARIO']
+    controller.cerrar()
+
+    assert all(resultados) and len(resultados) == 200
+    assert leer_saldos(ruta)['ACTIVO_CIRCULANTE']['INVENTARIO'] == pytest.approx(esperado)
+
+
+def test_confirmar_vencido_no_cambia_la_version(tmp_path):
+    controller = BalanceControllerConcurrente(base_datos=str(tmp_path / 'balance.sqlite'))
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 10)
+    version = controller.version
+    publicacion = controller.obtener_publicacion()
+
+    controller.confirmar_vencido()
+
+    assert controller.version == version
+    assert controller.obtener_publicacion() is publicacion
+    controller.cerrar()
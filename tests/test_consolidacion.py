@@ -0,0 +1,83 @@
+"""
+tests/test_consolidacion.py
+Consolidación de varias empresas, en el proceso actual y en el pool
+"""
+
+from datetime import date
+
+import pytest
+
+from controllers.empresas_controller import RegistroEmpresas
+from models.balance_model import BalanceModel
+from models.consolidacion import Eliminacion, consolidar
+
+
+@pytest.fixture
+def registro(tmp_path):
+    registro = RegistroEmpresas()
+    for i, extension in enumerate(('sqlite', 'blib', 'sqlite', None)):
+        nombre = f'E{i}'
+        ruta = str(tmp_path / f'{nombre}.{extension}') if extension else None
+        assert registro.agregar_empresa(nombre, base_datos=ruta)[0]
+        controller = registro.obtener_empresa(nombre)
+        controller.modelo.compra_credito([('ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO', 1160 * (i + 1))],
+                                         'PASIVO_CORTO_PLAZO', 'PROVEEDORES', date(2024, 1, 15))
+    yield registro
+    registro.cerrar()
+
+
+def test_el_pool_lee_las_bases_y_da_lo_mismo(registro):
+    eliminaciones = [Eliminacion('E0', 'PASIVO_CORTO_PLAZO', 'PROVEEDORES',
+                                 'E1', 'ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO')]
+
+    exito, local, mensaje = registro.consolidar(eliminaciones, procesos=1)
+    assert exito, mensaje
+    exito, pool, mensaje = registro.consolidar(eliminaciones, procesos=2)
+    assert exito, mensaje
+
+    assert pool['totales'] == pytest.approx(local['totales'])
+    assert pool['eliminaciones'] == local['eliminaciones']
+    assert local['estado']['PASIVO_CORTO_PLAZO']['PROVEEDORES'] == pytest.approx(1160 * 10 - 1160)
+
+
+def test_eliminacion_con_cuenta_inexistente(registro):
+    eliminaciones = [Eliminacion('E0', 'PASIVO_CORTO_PLAZO', 'NO EXISTE',
+                                 'E1', 'ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO')]
+
+    for procesos in (1, 2):
+        exito, _, mensaje = registro.consolidar(eliminaciones, procesos=procesos)
+        assert not exito
+        assert 'NO EXISTE' in mensaje
+
+
+def _estados(saldo_e0: float, saldo_e1: float):
+    estados = {}
+    for nombre, categoria, cuenta, saldo in (
+            ('E0', 'PASIVO_CORTO_PLAZO', 'ACREEDORES', saldo_e0),
+            ('E1', 'ACTIVO_CIRCULANTE', 'DEUDORES', saldo_e1)):
+        estados[nombre] = {c: {} for c in BalanceModel().catalogo}
+        estados[nombre][categoria][cuenta] = saldo
+    return estados
+
+
+ELIMINACION = Eliminacion('E0', 'PASIVO_CORTO_PLAZO', 'ACREEDORES',
+                          'E1', 'ACTIVO_CIRCULANTE', 'DEUDORES')
+
+
+@pytest.mark.parametrize('almacenamiento', ['diccionario', 'centavos'])
+def test_eliminacion_de_saldos_negativos(almacenamiento):
+    resultado = consolidar(_estados(-300, -500), almacenamiento, [ELIMINACION], procesos=1)
+
+    assert resultado['estado']['PASIVO_CORTO_PLAZO']['ACREEDORES'] == pytest.approx(0)
+    assert resultado['estado']['ACTIVO_CIRCULANTE']['DEUDORES'] == pytest.approx(-200)
+    assert resultado['eliminaciones'][0]['importe'] == pytest.approx(-300)
+    assert resultado['eliminaciones'][0]['no_conciliado'] == pytest.approx(200)
+
+
+def test_eliminacion_con_signos_distintos_no_elimina_nada():
+    resultado = consolidar(_estados(300, -500), eliminaciones=[ELIMINACION], procesos=1)
+
+    assert resultado['estado']['PASIVO_CORTO_PLAZO']['ACREEDORES'] == pytest.approx(300)
+    assert resultado['estado']['ACTIVO_CIRCULANTE']['DEUDORES'] == pytest.approx(-500)
+    assert resultado['eliminaciones'][0]['importe'] == 0
+    assert resultado['eliminaciones'][0]['no_conciliado'] == pytest.approx(800)
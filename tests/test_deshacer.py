@@ -0,0 +1,57 @@
+"""
+tests/test_deshacer.py
+Deshacer y rehacer con asientos inversos
+"""
+
+from datetime import date
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+
+
+def _operar(controller):
+    fecha = date(2024, 1, 15)
+    operaciones = [
+        controller.realizar_compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600,
+                                            fecha=fecha),
+        controller.realizar_compra_credito([('ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO', 23200)],
+                                           'PASIVO_CORTO_PLAZO', 'PROVEEDORES', fecha=fecha),
+        controller.realizar_anticipo_clientes('CAJA', 5800.01, 0.5, fecha=fecha),
+        controller.realizar_lote('COMPRA EFECTIVO', {
+            'cuenta_pago': 'CAJA', 'tipo_destino': 'ACTIVO_CIRCULANTE',
+            'cuenta_destino': 'PAPELERIA', 'total': [116, 58.5]}, fecha=fecha),
+    ]
+    for exito, _, mensaje in operaciones:
+        assert exito, mensaje
+    return len(operaciones)
+
+
+def test_deshacer_todo_y_rehacer_todo(almacenamiento, saldos):
+    controller = BalanceController(almacenamiento=almacenamiento)
+    antes = saldos(controller.modelo)
+    pasos = _operar(controller)
+    despues = saldos(controller.modelo)
+
+    for _ in range(pasos):
+        assert controller.deshacer()[0]
+    assert not controller.puede_deshacer()
+    assert saldos(controller.modelo) == pytest.approx(antes)
+
+    for _ in range(pasos):
+        assert controller.rehacer()[0]
+    assert not controller.puede_rehacer()
+    assert saldos(controller.modelo) == pytest.approx(despues)
+
+    controller.modelo.verificar_subtotales()
+    assert len(controller.modelo.diario) == 3 * pasos
+
+
+def test_nueva_operacion_descarta_lo_deshecho():
+    controller = BalanceController()
+    _operar(controller)
+    controller.deshacer()
+    assert controller.puede_rehacer()
+
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 116)
+    assert not controller.puede_rehacer()
@@ -0,0 +1,86 @@
+"""
+tests/test_eventos.py
+Eventos de cambio del modelo hacia las vistas
+"""
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+from models.eventos import ASIENTO, CATALOGO, ESTADO, BusEventos, EventoCambio
+
+TOTALES = {'balance_cuadra': True}
+
+
+def _evento(tipo, deltas, secuencia=None):
+    return EventoCambio(tipo, deltas, frozenset(deltas), TOTALES, secuencia)
+
+
+def test_combinar_suma_deltas_y_toma_el_tipo_mas_general():
+    caja = ('ACTIVO_CIRCULANTE', 'CAJA')
+    banco = ('ACTIVO_CIRCULANTE', 'BANCO')
+
+    evento = _evento(ASIENTO, {caja: -10}, 1).combinar(_evento(CATALOGO, {caja: 3, banco: 5}))
+
+    assert evento.tipo == CATALOGO
+    assert evento.deltas == {caja: -7, banco: 5}
+    assert evento.cuentas == {caja, banco}
+    assert evento.secuencia == 1
+    assert evento.eventos == 2
+    assert evento.combinar(EventoCambio(ESTADO, {}, None, TOTALES)).cuentas is None
+
+
+def test_suscribir_agrupar_y_cancelar():
+    bus = BusEventos()
+    recibidos = []
+    cancelar = bus.suscribir(recibidos.append)
+    assert bus.activo
+
+    bus.emitir(_evento(ASIENTO, {('CAPITAL', 'CAPITAL SOCIAL'): 1}, 1))
+    with bus.agrupados():
+        for secuencia in (2, 3, 4):
+            bus.emitir(_evento(ASIENTO, {('CAPITAL', 'CAPITAL SOCIAL'): 1}, secuencia))
+        assert len(recibidos) == 1
+
+    assert [e.eventos for e in recibidos] == [1, 3]
+    assert recibidos[1].secuencia == 4
+    assert recibidos[1].deltas == {('CAPITAL', 'CAPITAL SOCIAL'): 3}
+
+    cancelar()
+    assert not bus.activo
+    bus.emitir(_evento(ASIENTO, {}, 5))
+    assert len(recibidos) == 2
+
+
+def test_diferido_entrega_al_despachar():
+    bus = BusEventos(diferido=True)
+    recibidos = []
+    bus.suscribir(recibidos.append)
+
+    bus.emitir(_evento(ASIENTO, {}, 1))
+    bus.emitir(_evento(ASIENTO, {}, 2))
+    assert recibidos == []
+
+    assert bus.despachar().eventos == 2
+    assert bus.despachar() is None
+    assert len(recibidos) == 1
+
+
+def test_el_controlador_emite_un_evento_por_operacion(almacenamiento):
+    controller = BalanceController(almacenamiento=almacenamiento)
+    recibidos = []
+    controller.eventos.suscribir(recibidos.append)
+
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 100)
+    controller.realizar_lote('COMPRA EFECTIVO', {
+        'cuenta_pago': 'CAJA', 'tipo_destino': 'ACTIVO_CIRCULANTE',
+        'cuenta_destino': 'INVENTARIO', 'total': [10.5, 20]
+    })
+    assert recibidos[1].totales['total_activo'] == \
+        pytest.approx(controller.calcular_totales()['total_activo'])
+    controller.reiniciar_sistema()
+
+    assert [e.tipo for e in recibidos] == [ASIENTO, ASIENTO, ESTADO]
+    lote = recibidos[1]
+    assert lote.deltas[('ACTIVO_CIRCULANTE', 'CAJA')] == pytest.approx(-30.5)
+    assert lote.secuencia == recibidos[0].secuencia + 1
+    assert recibidos[2].cuentas is None
@@ -0,0 +1,98 @@
+"""
+tests/test_importador.py
+Importación en flujo de operaciones desde CSV y JSONL
+"""
+
+import json
+from datetime import date
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+from models.importador import leer_registros, validar_registro
+
+ENCABEZADO = "tipo,cuenta_pago,tipo_destino,cuenta_destino,total,fecha\n"
+
+
+def test_validar_registro_normaliza_y_convierte():
+    tipo, parametros, fecha = validar_registro({
+        'tipo': 'compra_efectivo', 'cuenta_pago': ' caja ', 'tipo_destino': 'activo_circulante',
+        'cuenta_destino': 'Inventario', 'total': '1160.50', 'fecha': '2024-01-15'
+    }, lambda categoria, cuenta: True)
+
+    assert tipo == 'COMPRA EFECTIVO'
+    assert parametros == {'cuenta_pago': 'CAJA', 'tipo_destino': 'ACTIVO_CIRCULANTE',
+                          'cuenta_destino': 'INVENTARIO', 'total': 1160.5}
+    assert fecha == date(2024, 1, 15)
+
+
+@pytest.mark.parametrize('cambio, mensaje', [
+    ({'tipo': 'VENTA'}, "Tipo desconocido"),
+    ({'total': ''}, "Falta 'total'"),
+    ({'total': 'mil'}, "no es numérico"),
+    ({'total': '-5'}, "mayor que cero"),
+    ({'cuenta_destino': 'NO EXISTE'}, "Cuenta no encontrada"),
+    ({'fecha': '15/01/2024'}, "Fecha inválida"),
+])
+def test_validar_registro_rechaza(cambio, mensaje):
+    registro = {'tipo': 'COMPRA EFECTIVO', 'cuenta_pago': 'CAJA',
+                'tipo_destino': 'ACTIVO_CIRCULANTE', 'cuenta_destino': 'INVENTARIO',
+                'total': '116', **cambio}
+
+    with pytest.raises(ValueError, match=mensaje):
+        validar_registro(registro, lambda categoria, cuenta: cuenta != 'NO EXISTE')
+
+
+def test_leer_jsonl_reporta_las_lineas_invalidas(tmp_path):
+    ruta = tmp_path / 'operaciones.jsonl'
+    ruta.write_text('{"tipo": "ANTICIPO CLIENTES"}\n\n{no es json\n[1, 2]\n', encoding='utf-8')
+
+    registros = list(leer_registros(str(ruta)))
+
+    assert [(linea, error is None) for linea, _, error in registros] == \
+        [(1, True), (3, False), (4, False)]
+    assert registros[0][1] == {'tipo': 'ANTICIPO CLIENTES'}
+
+
+def test_formato_no_reconocido():
+    with pytest.raises(ValueError):
+        list(leer_registros('operaciones.txt'))
+
+
+def test_importar_csv_agrupa_por_fecha_y_rechaza_lo_invalido(tmp_path):
+    ruta = tmp_path / 'operaciones.csv'
+    ruta.write_text(ENCABEZADO +
+                    "compra_efectivo,CAJA,ACTIVO_CIRCULANTE,INVENTARIO,116,2024-01-15\n"
+                    "compra_efectivo,CAJA,ACTIVO_CIRCULANTE,NO EXISTE,116,2024-01-15\n"
+                    "compra_efectivo,CAJA,ACTIVO_CIRCULANTE,PAPELERIA,abc,2024-01-15\n"
+                    "compra_efectivo,CAJA,ACTIVO_CIRCULANTE,PAPELERIA,232,2024-01-16\n",
+                    encoding='utf-8')
+    controller = BalanceController()
+    caja = controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'CAJA')
+
+    exito, resumen, _ = controller.importar_operaciones(str(ruta))
+
+    assert not exito
+    assert (resumen['registros'], resumen['importados'], resumen['lotes'],
+            resumen['rechazados']) == (4, 2, 2, 2)
+    assert [error.linea for error in resumen['errores']] == [3, 4]
+    assert controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'CAJA') == \
+        pytest.approx(caja - 348)
+    assert [asiento.fecha for asiento in controller.modelo.diario] == \
+        [date(2024, 1, 15), date(2024, 1, 16)]
+
+
+def test_lote_sin_fondos_se_aplica_registro_por_registro(tmp_path):
+    ruta = tmp_path / 'operaciones.jsonl'
+    registro = {'tipo': 'COMPRA EFECTIVO', 'cuenta_pago': 'CAJA',
+                'tipo_destino': 'ACTIVO_CIRCULANTE', 'cuenta_destino': 'INVENTARIO'}
+    ruta.write_text('\n'.join(json.dumps({**registro, 'total': total})
+                              for total in (30000, 30000)) + '\n', encoding='utf-8')
+    controller = BalanceController()
+
+    exito, resumen, _ = controller.importar_operaciones(str(ruta))
+
+    assert not exito
+    assert (resumen['importados'], resumen['rechazados']) == (1, 1)
+    assert resumen['errores'][0].linea == 2
+    assert 'Fondos insuficientes' in resumen['errores'][0].mensaje
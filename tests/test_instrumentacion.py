@@ -0,0 +1,73 @@
+"""
+tests/test_instrumentacion.py
+Métricas opcionales del controlador y perfiles
+"""
+
+import json
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+
+
+def test_activar_mide_llamadas_y_asientos():
+    controller = BalanceController()
+    assert controller.metricas() is None
+
+    instrumentacion = controller.activar_instrumentacion()
+    assert controller.activar_instrumentacion() is instrumentacion
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116)
+    controller.realizar_compra_credito([('ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO', 1160),
+                                        ('ACTIVO_CIRCULANTE', 'PAPELERIA', 116)],
+                                       'PASIVO_CORTO_PLAZO', 'PROVEEDORES')
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'NO EXISTE', 116)
+
+    datos = json.loads(controller.metricas())
+    assert datos['asientos'] == 2
+    assert datos['movimientos'] == sum(len(a.movimientos) for a in controller.obtener_diario())
+    efectivo = datos['metodos']['controlador.realizar_compra_efectivo']
+    assert efectivo['llamadas'] == 2
+    assert efectivo['p50_s'] <= efectivo['maximo_s']
+    # Una llamada anidada cuenta en el controlador y en el modelo
+    assert datos['metodos']['modelo.compra_efectivo']['llamadas'] == 2
+    assert datos['metodos']['modelo.compra_efectivo']['errores'] == 1
+
+
+def test_prometheus_y_formato_desconocido():
+    controller = BalanceController()
+    controller.activar_instrumentacion()
+    controller.realizar_anticipo_clientes('CAJA', 1160, 0.5)
+
+    texto = controller.metricas('prometheus')
+    assert 'balance_asientos_total 1\n' in texto
+    assert 'balance_llamadas_total{metodo="controlador.realizar_anticipo_clientes"} 1' in texto
+    assert texto.endswith('\n')
+    with pytest.raises(ValueError):
+        controller.metricas('xml')
+
+
+def test_desactivar_quita_las_envolturas():
+    controller = BalanceController()
+    instrumentacion = controller.activar_instrumentacion()
+    assert 'calcular_totales' in vars(controller)
+
+    assert controller.desactivar_instrumentacion() is instrumentacion
+    assert 'calcular_totales' not in vars(controller)
+    assert 'compra_efectivo' not in vars(controller.modelo)
+
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116)
+    assert instrumentacion.asientos == 0
+    assert controller.desactivar_instrumentacion() is None
+
+
+def test_perfilar_un_bloque():
+    controller = BalanceController()
+    with controller.perfilar(memoria=True) as perfil:
+        controller.realizar_lote('COMPRA EFECTIVO', {
+            'cuenta_pago': 'CAJA', 'tipo_destino': 'ACTIVO_CIRCULANTE',
+            'cuenta_destino': 'INVENTARIO', 'total': [116.0] * 100})
+
+    assert perfil.duracion > 0
+    assert any(funcion == 'aplicar_lote' for _, _, funcion in perfil.estadisticas.stats)
+    assert perfil.texto(limite=5)
+    assert perfil.memoria_pico > 0
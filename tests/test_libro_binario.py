@@ -0,0 +1,91 @@
+"""
+tests/test_libro_binario.py
+Guardar y cargar un libro binario (.blib)
+"""
+
+from datetime import date
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+from models.balance_model import BalanceModel
+from models.libro_binario import LibroBinario
+
+
+def _guardar(modelo, ruta):
+    libro = LibroBinario(str(ruta))
+    libro.guardar_todo(modelo)
+    libro.cerrar(modelo)
+
+
+def _cargar(ruta) -> BalanceModel:
+    modelo = BalanceModel()
+    LibroBinario(str(ruta)).cargar(modelo)
+    return modelo
+
+
+def test_guardar_y_cargar_conserva_el_estado(almacenamiento, tmp_path, saldos):
+    ruta = str(tmp_path / 'libro.blib')
+    controller = BalanceController(almacenamiento=almacenamiento, base_datos=ruta)
+    controller.realizar_compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600,
+                                        fecha=date(2024, 1, 15))
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'CLIENTES', 500)
+    controller.realizar_anticipo_clientes('CLIENTES', 5800, 0.5, fecha=date(2024, 2, 1))
+    esperado = saldos(controller.modelo)
+    secuencia = controller.modelo.diario.ultimo.secuencia
+    controller.cerrar()
+
+    cargado = BalanceController(almacenamiento=almacenamiento, base_datos=ruta)
+    assert saldos(cargado.modelo) == pytest.approx(esperado)
+    cargado.modelo.verificar_subtotales()
+
+    # El diario continúa la numeración y la fecha del archivo
+    exito, detalles, mensaje = cargado.realizar_compra_efectivo(
+        'CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 116, fecha=date(2024, 2, 1))
+    assert exito, mensaje
+    assert detalles['secuencia'] == secuencia + 1
+    with pytest.raises(ValueError):
+        cargado.modelo.diario.validar_fecha(date(2024, 1, 31))
+    cargado.cerrar()
+
+
+def test_cuenta_dada_de_baja_y_de_alta_no_suma_los_registros_anteriores(tmp_path):
+    ruta = tmp_path / 'libro.blib'
+    modelo = BalanceModel()
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'X', 1160, date(2024, 1, 15))
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'X')
+    _guardar(modelo, ruta)
+
+    # La baja y la nueva alta ocurren en otra sesión
+    modelo = BalanceModel()
+    libro = LibroBinario(str(ruta))
+    libro.cargar(modelo)
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'X', 116, date(2024, 2, 1))
+    libro.sincronizar(modelo)
+    libro.cerrar(modelo)
+
+    cargado = _cargar(ruta)
+    assert cargado.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'X') == pytest.approx(100)
+    assert cargado.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'CAJA') == pytest.approx(50000 - 1276)
+
+
+def test_balance_al_fecha_anterior_a_la_carga(tmp_path):
+    ruta = tmp_path / 'libro.blib'
+    modelo = BalanceModel()
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116000, date(2024, 1, 15))
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 1160, date(2025, 6, 15))
+    _guardar(modelo, ruta)
+
+    cargado = _cargar(ruta)
+    assert cargado.balance_al(date(2023, 12, 31))['estado']['ACTIVO_CIRCULANTE']['BANCO'] == 2000000
+    assert cargado.balance_al(date(2024, 6, 30))['estado']['ACTIVO_CIRCULANTE']['BANCO'] == 1884000
+    assert cargado.balance_al(date(2025, 6, 15))['estado']['ACTIVO_CIRCULANTE']['BANCO'] == 1882840
+
+    # Los asientos de la sesión se suman a partir de la apertura
+    cargado.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116, date(2025, 7, 1))
+    assert cargado.balance_al(date(2025, 6, 30))['estado']['ACTIVO_CIRCULANTE']['BANCO'] == 1882840
+    assert cargado.balance_al(date(2025, 7, 1))['estado']['ACTIVO_CIRCULANTE']['BANCO'] == 1882724
+    assert cargado.balance_al(date(2024, 6, 30))['totales']['balance_cuadra']
+
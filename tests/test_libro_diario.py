@@ -0,0 +1,63 @@
+"""
+tests/test_libro_diario.py
+Reproducir el libro diario sobre el estado inicial da el estado actual
+"""
+
+from datetime import date
+
+import pytest
+
+from models.balance_model import BalanceModel
+
+
+def _saldos(estado) -> dict:
+    return {categoria: dict(cuentas) for categoria, cuentas in estado.a_dict().items()}
+
+
+def _assert_mismos_saldos(estado, esperado):
+    obtenido = _saldos(estado)
+    assert obtenido.keys() == esperado.keys()
+    for categoria, cuentas in esperado.items():
+        assert obtenido[categoria] == pytest.approx(cuentas, abs=0.005)
+
+
+def test_reproducir_da_el_estado_actual(modelo):
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600, date(2024, 1, 15))
+    modelo.compra_credito([('ACTIVO_NO_CIRCULANTE', 'EQ. COMPUTO', 23200)],
+                          'PASIVO_CORTO_PLAZO', 'PROVEEDORES', date(2024, 2, 1))
+    modelo.anticipo_clientes('CAJA', 5800, 0.5, date(2024, 3, 1))
+    modelo.modificar_cuenta('ACTIVO_CIRCULANTE', 'CAJA', 60000)
+
+    _assert_mismos_saldos(modelo.reconstruir_estado(), _saldos(modelo.estado_actual))
+
+
+def test_cuenta_dada_de_baja_y_de_alta_no_hereda_movimientos(modelo):
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'X', 1160, date(2024, 1, 15))
+    assert modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'X')
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'X', 116, date(2024, 1, 15))
+
+    assert modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'X') == pytest.approx(100)
+    _assert_mismos_saldos(modelo.reconstruir_estado(), _saldos(modelo.estado_actual))
+    assert modelo.balance_al(date(2024, 1, 15))['estado']['ACTIVO_CIRCULANTE']['X'] == \
+        pytest.approx(100)
+
+
+def test_la_baja_no_adelanta_la_fecha_del_diario():
+    modelo = BalanceModel()
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 116, date(2024, 1, 15))
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+
+    assert modelo.diario.ultimo.fecha == date(2024, 1, 15)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 116, date(2024, 1, 20))
+
+
+def test_secuencia_estrictamente_creciente():
+    modelo = BalanceModel()
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 116)
+    modelo.diario.limpiar()
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 116)
+
+    assert len(modelo.diario) == 1
+    assert modelo.diario.ultimo.secuencia == 2
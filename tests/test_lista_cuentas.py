@@ -0,0 +1,46 @@
+"""
+tests/test_lista_cuentas.py
+Listas de cuentas por categoría guardadas con su versión
+"""
+
+from controllers.balance_controller import BalanceController
+from controllers.concurrencia import BalanceControllerConcurrente
+
+
+def test_la_lista_solo_cambia_con_altas_y_bajas(almacenamiento):
+    controller = BalanceController(almacenamiento=almacenamiento)
+    antes = controller.obtener_cuentas('ACTIVO_CIRCULANTE')
+
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 100)
+    controller.modificar_cuenta('ACTIVO_CIRCULANTE', 'CAJA', 5000)
+    controller.agregar_cuenta('CAPITAL', 'RESERVA', 10)
+    assert controller.obtener_cuentas('ACTIVO_CIRCULANTE') is antes
+
+    controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'CLIENTES', 10)
+    despues = controller.obtener_cuentas('ACTIVO_CIRCULANTE')
+    assert despues == antes + ('CLIENTES',)
+    assert controller.obtener_cuentas('ACTIVO_CIRCULANTE') is despues
+
+
+def test_cargar_otro_estado_invalida_las_listas(tmp_path):
+    ruta = str(tmp_path / 'balance.json')
+    otro = BalanceController()
+    otro.agregar_cuenta('CAPITAL', 'RESERVA', 10)
+    assert otro.guardar_estado(ruta)[0]
+    controller = BalanceController()
+    antes = controller.obtener_cuentas('CAPITAL')
+
+    assert controller.cargar_estado(ruta)[0]
+
+    assert 'RESERVA' not in antes
+    assert 'RESERVA' in controller.obtener_cuentas('CAPITAL')
+
+
+def test_lista_de_cuentas_sigue_la_version():
+    controller = BalanceControllerConcurrente(almacenamiento='arreglo')
+    antes = controller.obtener_cuentas('ACTIVO_CIRCULANTE')
+    assert controller.obtener_cuentas('ACTIVO_CIRCULANTE') is antes
+
+    controller.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+    despues = controller.obtener_cuentas('ACTIVO_CIRCULANTE')
+    assert 'PAPELERIA' in antes and 'PAPELERIA' not in despues
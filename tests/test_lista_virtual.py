@@ -0,0 +1,39 @@
+"""
+tests/test_lista_virtual.py
+Lista virtual de cuentas para categorías grandes
+"""
+
+from utils.helpers import formatear_moneda
+from views.components.base_components import ListaCuentasVirtual
+
+
+def _textos(lista):
+    return [(lista.canvas.itemcget(nombre, 'text'), lista.canvas.itemcget(valor, 'text'))
+            for nombre, valor in lista._textos]
+
+
+def test_solo_dibuja_las_filas_visibles(raiz):
+    filas = [(f'CUENTA {i}', float(i)) for i in range(500)]
+    lista = ListaCuentasVirtual(raiz, filas)
+
+    assert len(lista) == 500 and 'CUENTA 499' in lista
+    assert len(lista._textos) == ListaCuentasVirtual.FILAS_VISIBLES
+    assert _textos(lista)[0] == ('CUENTA 0', formatear_moneda(0))
+
+    lista._desplazar('moveto', 0.5)
+    assert _textos(lista)[0][0] == 'CUENTA 250'
+    lista._desplazar('scroll', 1000, 'pages')
+    assert _textos(lista)[-1][0] == 'CUENTA 499'
+
+
+def test_actualizar_y_reemplazar(raiz):
+    lista = ListaCuentasVirtual(raiz, [(f'CUENTA {i}', 1.0) for i in range(100)])
+
+    lista.actualizar('CUENTA 3', 250)
+    lista.actualizar('CUENTA 90', 99)
+    assert _textos(lista)[3] == ('CUENTA 3', formatear_moneda(250))
+
+    lista._desplazar('moveto', 1)
+    lista.reemplazar([(f'NUEVA {i}', 2.0) for i in range(5)])
+    assert len(lista._textos) == 5
+    assert _textos(lista)[0] == ('NUEVA 0', formatear_moneda(2))
@@ -0,0 +1,40 @@
+"""
+tests/test_lotes.py
+Lotes de transacciones (realizar_lote)
+"""
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+
+
+def test_lote_vacio_no_registra_asiento(almacenamiento):
+    controller = BalanceController(almacenamiento=almacenamiento)
+    columnas = {'cuenta_pago': 'CAJA', 'tipo_destino': 'ACTIVO_CIRCULANTE',
+                'cuenta_destino': 'INVENTARIO', 'total': []}
+
+    exito, detalles, _ = controller.realizar_lote('COMPRA EFECTIVO', columnas)
+
+    assert exito
+    assert detalles['operaciones'] == 0
+    assert detalles['secuencia'] is None
+    assert len(controller.modelo.diario) == 0
+    assert not controller.puede_deshacer()
+
+
+def test_lote_igual_a_operaciones_sueltas(almacenamiento):
+    totales = [1160, 580.5, 99.99]
+    lote = BalanceController(almacenamiento=almacenamiento)
+    sueltas = BalanceController(almacenamiento=almacenamiento)
+
+    exito, _, mensaje = lote.realizar_lote('COMPRA EFECTIVO', {
+        'cuenta_pago': 'CAJA', 'tipo_destino': 'ACTIVO_CIRCULANTE',
+        'cuenta_destino': 'INVENTARIO', 'total': totales})
+    assert exito, mensaje
+    for total in totales:
+        sueltas.modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', total)
+
+    for cuenta in ('CAJA', 'INVENTARIO', 'IVA ACREDITABLE'):
+        assert lote.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', cuenta) == \
+            pytest.approx(sueltas.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', cuenta), abs=0.02)
+    assert len(lote.modelo.diario) == 1
@@ -0,0 +1,49 @@
+"""
+tests/test_persistencia.py
+Guardar y cargar el estado en JSON
+"""
+
+from datetime import date
+
+import pytest
+
+from models.balance_model import BalanceModel
+from models.persistencia import cargar_json, guardar_json
+
+
+def _cargar(ruta, almacenamiento) -> BalanceModel:
+    modelo = BalanceModel(almacenamiento=almacenamiento)
+    cargar_json(modelo, str(ruta))
+    return modelo
+
+
+def test_guardar_y_cargar_conserva_el_estado(modelo, almacenamiento, tmp_path, saldos):
+    ruta = tmp_path / 'estado.json'
+    modelo.compra_efectivo('BANCO', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 11600, date(2024, 1, 15))
+    modelo.anticipo_clientes('CAJA', 5800, 0.5, date(2024, 3, 1))
+    guardar_json(modelo, str(ruta))
+
+    cargado = _cargar(ruta, almacenamiento)
+    assert saldos(cargado) == pytest.approx(saldos(modelo))
+    assert cargado.catalogo.a_dict() == modelo.catalogo.a_dict()
+    assert [a.secuencia for a in cargado.diario] == [a.secuencia for a in modelo.diario]
+
+
+def test_cargar_despues_de_eliminar_una_cuenta_con_movimientos(modelo, almacenamiento, tmp_path,
+                                                               saldos):
+    ruta = tmp_path / 'estado.json'
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'PAPELERIA', 1160, date(2024, 1, 15))
+    guardar_json(modelo, str(ruta))
+
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'PAPELERIA')
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    modelo.compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'X', 116, date(2024, 1, 20))
+    modelo.eliminar_cuenta('ACTIVO_CIRCULANTE', 'X')
+    modelo.agregar_cuenta('ACTIVO_CIRCULANTE', 'X', 0)
+    guardar_json(modelo, str(ruta))
+
+    cargado = _cargar(ruta, almacenamiento)
+    assert 'PAPELERIA' not in cargado.obtener_cuentas('ACTIVO_CIRCULANTE')
+    assert cargado.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'X') == 0
+    assert saldos(cargado) == pytest.approx(saldos(modelo))
+    cargado.verificar_subtotales()
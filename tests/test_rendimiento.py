@@ -0,0 +1,67 @@
+"""
+tests/test_rendimiento.py
+Suite de rendimiento con una malla mínima
+"""
+
+import json
+
+import pytest
+
+from benchmarks import rendimiento
+
+
+def test_preparar_carga_el_catalogo_y_el_diario():
+    controller = rendimiento.preparar('diccionario', 50, 40)
+
+    assert sum(len(c) for c in controller.obtener_catalogo_completo().values()) == 50
+    assert len(controller.obtener_diario()) == 40
+    assert controller.verificar_balance_cuadrado()[0]
+
+
+def test_medir_respeta_repeticiones():
+    llamadas = []
+    resultado = rendimiento.medir(lambda: llamadas.append(1), operaciones_por_llamada=10,
+                                  repeticiones=20, calentamiento=2)
+
+    assert resultado['llamadas'] == 20
+    assert len(llamadas) == 22
+    assert resultado['p50_us'] <= resultado['p99_us'] <= resultado['max_us']
+
+
+def test_main_escribe_resultados_y_detecta_regresiones(tmp_path, capsys):
+    salida = tmp_path / 'actual.json'
+    argumentos = ['--cuentas', '20', '--asientos', '10', '--repeticiones', '5',
+                  '--tiempo-max', '0.01', '--salida', str(salida)]
+    assert rendimiento.main(argumentos) == 0
+
+    resultado = json.loads(salida.read_text(encoding='utf-8'))
+    casos = {r['caso'] for r in resultado['resultados']}
+    assert {'realizar_lote', 'calcular_totales', 'balance_al', 'reiniciar'} <= casos
+    assert resultado['parametros']['asientos'] == [10]
+
+    # Un resultado anterior 10 veces más rápido es una regresión
+    anterior = tmp_path / 'anterior.json'
+    for r in resultado['resultados']:
+        r['p50_us'] /= 10
+    anterior.write_text(json.dumps(resultado), encoding='utf-8')
+    assert rendimiento.main(argumentos + ['--comparar', str(anterior)]) == 1
+    assert 'REGRESIÓN' in capsys.readouterr().err
+
+
+def test_comparar_ignora_casos_nuevos_y_mejoras():
+    def resultado(**p50):
+        return {'resultados': [{'caso': caso, 'almacenamiento': 'diccionario', 'cuentas': 10,
+                                'asientos': 10, 'p50_us': valor}
+                               for caso, valor in p50.items()]}
+
+    regresiones = rendimiento.comparar(resultado(a=10.0, b=10.0),
+                                       resultado(a=10.5, b=5.0, c=99.0))
+    assert regresiones == []
+
+    regresiones = rendimiento.comparar(resultado(a=10.0), resultado(a=12.0))
+    assert [r['caso'] for r in regresiones] == ['a']
+    assert regresiones[0]['razon'] == pytest.approx(1.2)
+
+
+def test_malla_por_omision_incluye_diarios_pequenos():
+    assert {10, 100} <= set(rendimiento.ASIENTOS_POR_OMISION)
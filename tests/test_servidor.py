@@ -0,0 +1,108 @@
+"""
+tests/test_servidor.py
+Servicio HTTP/JSON: rutas, errores y escrituras en grupo
+"""
+
+import asyncio
+import json
+
+from controllers.balance_controller import BalanceController
+from models.base_datos import leer_saldos
+from servidor import ServidorBalance
+
+COMPRA = {'tipo': 'COMPRA EFECTIVO', 'cuenta_pago': 'CAJA',
+          'tipo_destino': 'ACTIVO_CIRCULANTE', 'cuenta_destino': 'INVENTARIO', 'total': 116}
+
+
+async def _pedir(lector, escritor, metodo: str, ruta: str, datos=None):
+    """Una petición en una conexión keep-alive; retorna (estado, JSON)"""
+    cuerpo = json.dumps(datos).encode('utf-8') if datos is not None else b''
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: prueba\r\n"
+                   f"Content-Length: {len(cuerpo)}\r\n\r\n".encode('latin-1') + cuerpo)
+    await escritor.drain()
+
+    estado = int((await lector.readline()).split()[1])
+    encabezados = {}
+    while (linea := await lector.readline()) != b'\r\n':
+        nombre, _, valor = linea.decode('latin-1').partition(':')
+        encabezados[nombre.strip().lower()] = valor.strip()
+    return estado, json.loads(await lector.readexactly(int(encabezados['content-length'])))
+
+
+def _con_servidor(controller, prueba):
+    """Ejecuta prueba(servidor, puerto) con el servidor escuchando en un puerto libre"""
+    async def ejecutar():
+        servidor = ServidorBalance(controller)
+        servidor._cola = asyncio.Queue()
+        escritor = asyncio.create_task(servidor._escritor())
+        escucha = await asyncio.start_server(servidor._atender, '127.0.0.1', 0)
+        try:
+            return await prueba(servidor, escucha.sockets[0].getsockname()[1])
+        finally:
+            escucha.close()
+            escritor.cancel()
+
+    return asyncio.run(ejecutar())
+
+
+def test_lecturas_escrituras_y_errores():
+    async def prueba(servidor, puerto):
+        conexion = await asyncio.open_connection('127.0.0.1', puerto)
+        estado, datos = await _pedir(*conexion, 'POST', '/operaciones', COMPRA)
+        assert estado == 201 and datos['secuencia'] is not None
+
+        estado, datos = await _pedir(*conexion, 'GET', '/cuentas/ACTIVO_CIRCULANTE')
+        assert estado == 200 and datos['INVENTARIO'] > 0
+        assert (await _pedir(*conexion, 'GET', '/salud'))[1]['escrituras'] == 1
+
+        assert (await _pedir(*conexion, 'POST', '/operaciones', {**COMPRA, 'total': -1}))[0] == 400
+        assert (await _pedir(*conexion, 'GET', '/cuentas/NO_EXISTE'))[0] == 404
+        assert (await _pedir(*conexion, 'GET', '/no-existe'))[0] == 404
+        assert (await _pedir(*conexion, 'PUT', '/totales', {}))[0] == 405
+        conexion[1].close()
+
+    _con_servidor(BalanceController(), prueba)
+
+
+def test_error_en_una_lectura_responde_500_y_conserva_la_conexion():
+    controller = BalanceController()
+
+    def fallar():
+        raise RuntimeError("sin totales")
+    controller.calcular_totales = fallar
+
+    async def prueba(servidor, puerto):
+        conexion = await asyncio.open_connection('127.0.0.1', puerto)
+        estado, datos = await _pedir(*conexion, 'GET', '/totales')
+        assert estado == 500
+        assert 'sin totales' in datos['error']
+
+        estado, _ = await _pedir(*conexion, 'GET', '/estado')
+        assert estado == 200
+        conexion[1].close()
+
+    _con_servidor(controller, prueba)
+
+
+def test_escrituras_simultaneas_se_confirman_en_grupo(tmp_path):
+    ruta = str(tmp_path / 'balance.sqlite')
+    controller = BalanceController(base_datos=ruta)
+
+    async def prueba(servidor, puerto):
+        async def comprar():
+            conexion = await asyncio.open_connection('127.0.0.1', puerto)
+            respuesta = await _pedir(*conexion, 'POST', '/operaciones', COMPRA)
+            conexion[1].close()
+            return respuesta
+
+        respuestas = await asyncio.gather(*(comprar() for _ in range(20)))
+        assert all(estado == 201 for estado, _ in respuestas)
+        assert servidor.escrituras == 20
+        assert servidor.grupos <= 20
+
+    _con_servidor(controller, prueba)
+
+    # Cada respuesta llegó después de confirmar su grupo en la base
+    assert leer_saldos(ruta)['ACTIVO_CIRCULANTE']['CAJA'] == \
+        controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'CAJA')
+    controller.cerrar()
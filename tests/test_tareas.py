@@ -0,0 +1,108 @@
+"""
+tests/test_tareas.py
+Trabajo en segundo plano con avance y cancelación
+"""
+
+import threading
+
+import pytest
+
+from controllers.balance_controller import BalanceController
+from controllers.concurrencia import BalanceControllerConcurrente
+from models.base_datos import leer_saldos
+from utils.tareas import Tarea, TareaCancelada
+
+
+def test_resultado_y_avance():
+    tarea = Tarea(lambda t: [t.avanzar(i) for i in range(3)] and 'listo').iniciar()
+
+    assert tarea.esperar(5)
+    assert tarea.resultado() == 'listo'
+    assert tarea.progreso == 2
+    assert not tarea.cancelada
+
+
+def test_resultado_antes_de_terminar_y_errores():
+    soltar = threading.Event()
+    tarea = Tarea(lambda t: soltar.wait(5)).iniciar()
+    with pytest.raises(RuntimeError):
+        tarea.resultado()
+    soltar.set()
+    tarea.esperar(5)
+
+    def fallar(t):
+        raise ValueError("sin fondos")
+
+    tarea = Tarea(fallar).iniciar()
+    tarea.esperar(5)
+    with pytest.raises(ValueError):
+        tarea.resultado()
+    assert not tarea.cancelada
+
+
+def test_cancelar_se_detiene_en_avanzar():
+    empezo = threading.Event()
+
+    def contar(t):
+        empezo.set()
+        while True:
+            t.avanzar()
+
+    tarea = Tarea(contar).iniciar()
+    empezo.wait(5)
+    tarea.cancelar()
+
+    assert tarea.esperar(5)
+    assert tarea.cancelada
+    with pytest.raises(TareaCancelada):
+        tarea.resultado()
+
+
+def test_importacion_cancelada_conserva_los_bloques(tmp_path):
+    ruta = tmp_path / 'operaciones.csv'
+    ruta.write_text("tipo,cuenta_pago,tipo_destino,cuenta_destino,total\n" + "".join(
+        "compra_efectivo,CAJA,ACTIVO_CIRCULANTE,INVENTARIO,1\n" for _ in range(10)))
+    controller = BalanceController()
+    inventario = controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'INVENTARIO')
+
+    def importar(tarea):
+        def progreso(resumen):
+            # Se cancela al terminar el primer bloque
+            tarea.cancelar()
+            tarea.avanzar(dict(resumen))
+        return controller.importar_operaciones(str(ruta), tamano_bloque=4, progreso=progreso)
+
+    tarea = Tarea(importar).iniciar()
+    tarea.esperar(5)
+
+    assert tarea.cancelada
+    assert tarea.progreso['importados'] == 4
+    assert controller.modelo.obtener_valor_cuenta(
+        'ACTIVO_CIRCULANTE', 'INVENTARIO') == pytest.approx(inventario + 4)
+
+
+@pytest.mark.parametrize('clase', [BalanceController, BalanceControllerConcurrente])
+def test_escrituras_en_una_tarea_con_base_datos(clase, tmp_path):
+    ruta = str(tmp_path / 'balance.sqlite')
+    # La base se abre en este hilo y se escribe desde el de la tarea
+    controller = clase(base_datos=ruta)
+
+    controller.realizar_compra_efectivo('CAJA', 'ACTIVO_CIRCULANTE', 'INVENTARIO', 50)
+
+    def escribir(tarea):
+        # Reiniciar reescribe la base y la cuenta nueva actualiza el catálogo
+        return (controller.reiniciar_sistema(),
+                controller.agregar_cuenta('ACTIVO_CIRCULANTE', 'BANCO DOS', 500),
+                controller.realizar_compra_efectivo('BANCO DOS', 'ACTIVO_CIRCULANTE',
+                                                    'INVENTARIO', 100))
+
+    tarea = Tarea(escribir).iniciar()
+    assert tarea.esperar(5)
+    for exito, *_, mensaje in tarea.resultado():
+        assert exito and 'aviso' not in mensaje
+
+    esperado = controller.modelo.obtener_valor_cuenta('ACTIVO_CIRCULANTE', 'INVENTARIO')
+    controller.cerrar()
+    saldos = leer_saldos(ruta)['ACTIVO_CIRCULANTE']
+    assert saldos['INVENTARIO'] == pytest.approx(esperado)
+    assert saldos['BANCO DOS'] == pytest.approx(400)
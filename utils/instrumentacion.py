@@ -0,0 +1,319 @@
+"""
+utils/instrumentacion.py
+Instrumentación opcional del controlador y del modelo
+
+Al activarla se envuelven los métodos públicos de la instancia (no de la
+clase) para medir llamadas y tiempos, y _registrar_asiento para contar
+asientos y cuentas tocadas. Al desactivarla se quitan las envolturas, así
+que apagada no cuesta nada. También permite capturar un perfil cProfile y
+tracemalloc alrededor de un bloque de código.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Duraciones recientes que se guardan por método para los percentiles
+MUESTRAS_POR_METODO = 10000
+
+PERCENTILES = (50, 90, 99)
+
+# Métodos que no se miden (los de la propia instrumentación)
+EXCLUIDOS = frozenset({
+    'activar_instrumentacion', 'desactivar_instrumentacion', 'metricas', 'perfilar',
+})
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[round((len(ordenados) - 1) * p / 100)]
+
+
+class EstadisticaMetodo:
+    """Llamadas, tiempo acumulado y duraciones recientes de un método"""
+
+    __slots__ = ('llamadas', 'errores', 'total', 'maximo', 'muestras')
+
+    def __init__(self, muestras: int = MUESTRAS_POR_METODO):
+        self.llamadas = 0
+        self.errores = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.muestras: Deque[float] = deque(maxlen=muestras)
+
+    def a_dict(self) -> Dict:
+        """Resumen en segundos (percentiles sobre las muestras recientes)"""
+        ordenadas = sorted(self.muestras)
+        return {
+            'llamadas': self.llamadas,
+            'errores': self.errores,
+            'total_s': self.total,
+            'media_s': self.total / self.llamadas if self.llamadas else 0.0,
+            'maximo_s': self.maximo,
+            **{f"p{p}_s": _percentil(ordenadas, p) if ordenadas else 0.0
+               for p in PERCENTILES}
+        }
+
+
+class Instrumentacion:
+    """
+    Métricas de una sesión del controlador
+
+    Se crea con BalanceController.activar_instrumentacion(). Los métodos se
+    identifican como 'controlador.nombre' y 'modelo.nombre'; una llamada
+    anidada (p. ej. validar_fondos dentro de realizar_compra_efectivo)
+    cuenta en ambos.
+    """
+
+    def __init__(self, muestras: int = MUESTRAS_POR_METODO):
+        self.muestras = muestras
+        self.inicio = time.perf_counter()
+        self.metodos: Dict[str, EstadisticaMetodo] = {}
+        self.asientos = 0
+        self.movimientos = 0
+        self.cuentas_por_asiento: Counter = Counter()
+        self._candado = threading.Lock()
+
+        # (objeto, nombre) de cada envoltura instalada
+        self._envueltos: List[Tuple[object, str]] = []
+        self._modelo = None
+
+    # === ENVOLTURAS ===
+
+    def _envolver(self, objeto, prefijo: str, nombre: str, al_terminar: Optional[Callable] = None):
+        metodo = getattr(objeto, nombre)
+        estadistica = self.metodos.setdefault(f"{prefijo}.{nombre}",
+                                              EstadisticaMetodo(self.muestras))
+        candado = self._candado
+        reloj = time.perf_counter
+
+        def envoltura(*args, **kwargs):
+            inicio = reloj()
+            exito = False
+            try:
+                resultado = metodo(*args, **kwargs)
+                exito = True
+                return resultado
+            finally:
+                duracion = reloj() - inicio
+                with candado:
+                    estadistica.llamadas += 1
+                    estadistica.total += duracion
+                    estadistica.muestras.append(duracion)
+                    if duracion > estadistica.maximo:
+                        estadistica.maximo = duracion
+                    if not exito:
+                        estadistica.errores += 1
+                if exito and al_terminar is not None:
+                    al_terminar(resultado)
+
+        envoltura.__wrapped__ = metodo
+        envoltura.__name__ = nombre
+        setattr(objeto, nombre, envoltura)
+        self._envueltos.append((objeto, nombre))
+
+    def _envolver_publicos(self, objeto, prefijo: str):
+        for nombre in dir(type(objeto)):
+            if nombre.startswith('_') or nombre in EXCLUIDOS:
+                continue
+            if callable(getattr(type(objeto), nombre, None)):
+                self._envolver(objeto, prefijo, nombre)
+
+    def _asiento_registrado(self, asiento):
+        cuentas = len(asiento.movimientos)
+        with self._candado:
+            self.asientos += 1
+            self.movimientos += cuentas
+            self.cuentas_por_asiento[cuentas] += 1
+
+    def instrumentar_modelo(self, modelo):
+        """Envuelve los métodos públicos del modelo y _registrar_asiento"""
+        self._modelo = modelo
+        self._envolver_publicos(modelo, 'modelo')
+        self._envolver(modelo, 'modelo', '_registrar_asiento', self._asiento_registrado)
+
+    def instrumentar_controlador(self, controller):
+        """
+        Envuelve los métodos públicos del controlador y los de su modelo
+
+        Si el controlador cambia de modelo (p. ej. cargar_estado) el nuevo
+        se instrumenta al terminar la llamada.
+        """
+        def revisar_modelo(_):
+            if controller.modelo is not self._modelo:
+                self.instrumentar_modelo(controller.modelo)
+
+        for nombre in dir(type(controller)):
+            if nombre.startswith('_') or nombre in EXCLUIDOS:
+                continue
+            if callable(getattr(type(controller), nombre, None)):
+                self._envolver(controller, 'controlador', nombre, revisar_modelo)
+        self.instrumentar_modelo(controller.modelo)
+
+    def quitar(self):
+        """Quita todas las envolturas (los métodos vuelven a los de la clase)"""
+        for objeto, nombre in reversed(self._envueltos):
+            objeto.__dict__.pop(nombre, None)
+        self._envueltos = []
+        self._modelo = None
+
+    # === REPORTES ===
+
+    def reiniciar(self):
+        """Pone los contadores en cero (las envolturas siguen instaladas)"""
+        with self._candado:
+            for clave in self.metodos:
+                self.metodos[clave] = EstadisticaMetodo(self.muestras)
+            self.asientos = 0
+            self.movimientos = 0
+            self.cuentas_por_asiento.clear()
+            self.inicio = time.perf_counter()
+
+    def a_dict(self) -> Dict:
+        """Métricas como diccionario (tiempos en segundos)"""
+        with self._candado:
+            transcurrido = time.perf_counter() - self.inicio
+            metodos = {clave: e.a_dict() for clave, e in sorted(self.metodos.items())
+                       if e.llamadas}
+            por_asiento = dict(sorted(self.cuentas_por_asiento.items()))
+            asientos, movimientos = self.asientos, self.movimientos
+
+        return {
+            'segundos': transcurrido,
+            'asientos': asientos,
+            'movimientos': movimientos,
+            'asientos_por_segundo': asientos / transcurrido if transcurrido else 0.0,
+            'cuentas_por_asiento': {
+                'media': movimientos / asientos if asientos else 0.0,
+                'distribucion': por_asiento
+            },
+            'metodos': metodos
+        }
+
+    def a_json(self) -> str:
+        """Métricas en JSON"""
+        return json.dumps(self.a_dict(), indent=2)
+
+    def a_prometheus(self, prefijo: str = 'balance') -> str:
+        """Métricas en el formato de texto de Prometheus"""
+        datos = self.a_dict()
+        lineas = [
+            f"# HELP {prefijo}_asientos_total Asientos registrados",
+            f"# TYPE {prefijo}_asientos_total counter",
+            f"{prefijo}_asientos_total {datos['asientos']}",
+            f"# HELP {prefijo}_asientos_por_segundo Asientos por segundo desde la activación",
+            f"# TYPE {prefijo}_asientos_por_segundo gauge",
+            f"{prefijo}_asientos_por_segundo {datos['asientos_por_segundo']:.6g}",
+            f"# HELP {prefijo}_cuentas_por_asiento Cuentas tocadas por asiento",
+            f"# TYPE {prefijo}_cuentas_por_asiento histogram",
+        ]
+        acumulado = 0
+        for cuentas, veces in datos['cuentas_por_asiento']['distribucion'].items():
+            acumulado += veces
+            lineas.append(f'{prefijo}_cuentas_por_asiento_bucket{{le="{cuentas}"}} {acumulado}')
+        lineas += [
+            f'{prefijo}_cuentas_por_asiento_bucket{{le="+Inf"}} {datos["asientos"]}',
+            f"{prefijo}_cuentas_por_asiento_sum {datos['movimientos']}",
+            f"{prefijo}_cuentas_por_asiento_count {datos['asientos']}",
+            f"# HELP {prefijo}_llamadas_total Llamadas por método",
+            f"# TYPE {prefijo}_llamadas_total counter",
+        ]
+        metodos = datos['metodos']
+        for clave, m in metodos.items():
+            lineas.append(f'{prefijo}_llamadas_total{{metodo="{clave}"}} {m["llamadas"]}')
+        lineas += [
+            f"# HELP {prefijo}_errores_total Llamadas que lanzaron una excepción",
+            f"# TYPE {prefijo}_errores_total counter",
+        ]
+        for clave, m in metodos.items():
+            lineas.append(f'{prefijo}_errores_total{{metodo="{clave}"}} {m["errores"]}')
+        lineas += [
+            f"# HELP {prefijo}_duracion_segundos Duración de las llamadas por método",
+            f"# TYPE {prefijo}_duracion_segundos summary",
+        ]
+        for clave, m in metodos.items():
+            for p in PERCENTILES:
+                lineas.append(f'{prefijo}_duracion_segundos{{metodo="{clave}",'
+                              f'quantile="{p / 100}"}} {m[f"p{p}_s"]:.6g}')
+            lineas.append(f'{prefijo}_duracion_segundos_sum{{metodo="{clave}"}} {m["total_s"]:.6g}')
+            lineas.append(f'{prefijo}_duracion_segundos_count{{metodo="{clave}"}} {m["llamadas"]}')
+        return '\n'.join(lineas) + '\n'
+
+
+# === PERFILES ===
+
+class Perfil:
+    """Resultado de perfilar(): se llena al salir del bloque"""
+
+    def __init__(self):
+        self.duracion = 0.0
+        self.estadisticas: Optional[pstats.Stats] = None
+        self.asignaciones: List[str] = []
+        self.memoria_pico = 0
+
+    def texto(self, orden: str = 'cumulative', limite: int = 30) -> str:
+        """Funciones más costosas (formato de pstats)"""
+        if self.estadisticas is None:
+            return ''
+        salida = io.StringIO()
+        self.estadisticas.stream = salida
+        self.estadisticas.sort_stats(orden).print_stats(limite)
+        return salida.getvalue()
+
+    def guardar(self, ruta: str):
+        """Guarda el perfil para snakeviz, gprof2dot o pstats"""
+        if self.estadisticas is not None:
+            self.estadisticas.dump_stats(ruta)
+
+
+@contextmanager
+def perfilar(cpu: bool = True, memoria: bool = False,
+             lineas_memoria: int = 20) -> Iterator[Perfil]:
+    """
+    Captura un perfil alrededor de un bloque (p. ej. un lote o importación)
+
+        with perfilar(memoria=True) as perfil:
+            controller.importar_operaciones('operaciones.csv')
+        print(perfil.texto())
+
+    Args:
+        cpu: Perfil de llamadas con cProfile
+        memoria: Asignaciones con tracemalloc (más lento mientras dura)
+        lineas_memoria: Líneas de código que más memoria asignaron a reportar
+    """
+    perfil = Perfil()
+    perfilador = cProfile.Profile() if cpu else None
+    ya_rastreando = tracemalloc.is_tracing()
+    if memoria and not ya_rastreando:
+        tracemalloc.start()
+    if memoria:
+        tracemalloc.reset_peak()
+        antes = tracemalloc.take_snapshot()
+
+    inicio = time.perf_counter()
+    if perfilador is not None:
+        perfilador.enable()
+    try:
+        yield perfil
+    finally:
+        if perfilador is not None:
+            perfilador.disable()
+        perfil.duracion = time.perf_counter() - inicio
+
+        if perfilador is not None:
+            perfil.estadisticas = pstats.Stats(perfilador)
+        if memoria:
+            despues = tracemalloc.take_snapshot()
+            perfil.memoria_pico = tracemalloc.get_traced_memory()[1]
+            perfil.asignaciones = [
+                str(diferencia)
+                for diferencia in despues.compare_to(antes, 'lineno')[:lineas_memoria]
+            ]
+            if not ya_rastreando:
+                tracemalloc.stop()
@@ -0,0 +1,113 @@
+"""
+utils/tareas.py
+Trabajo pesado en un hilo aparte, con avance y cancelación
+
+Una Tarea ejecuta una función en un hilo de trabajo. La función recibe la
+tarea y llama a tarea.avanzar(progreso) entre pasos: así publica su avance
+y, si se pidió cancelar, se detiene en ese punto (avanzar lanza
+TareaCancelada). Quien la lanzó consulta `progreso` y `terminada` sin
+bloquearse (la interfaz lo hace desde root.after) y al final recoge el
+resultado.
+
+Es un hilo y no un proceso porque el trabajo opera sobre el modelo vivo;
+el intérprete cambia de hilo cada pocos milisegundos, así que el de la
+interfaz sigue atendiendo eventos mientras tanto.
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+
+class TareaCancelada(Exception):
+    """La tarea se detuvo en un avanzar() después de pedir cancelar"""
+
+
+class Tarea:
+    """
+    Función ejecutada en un hilo de trabajo
+
+    La cancelación es cooperativa: solo tiene efecto en la siguiente
+    llamada a avanzar(), que la función hace donde detenerse deja el
+    modelo consistente (p. ej. entre bloques de una importación).
+    """
+
+    def __init__(self, funcion: Callable[['Tarea'], Any], nombre: str = 'tarea'):
+        self._funcion = funcion
+        self._cancelar = threading.Event()
+        self._terminada = threading.Event()
+        self._hilo = threading.Thread(target=self._ejecutar, name=nombre, daemon=True)
+        self._resultado: Any = None
+        self._error: Optional[BaseException] = None
+
+        # Último avance publicado (lo que la función pase a avanzar)
+        self.progreso: Any = None
+
+    def _ejecutar(self):
+        try:
+            self._resultado = self._funcion(self)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._terminada.set()
+
+    def iniciar(self) -> 'Tarea':
+        """Arranca el hilo de trabajo"""
+        self._hilo.start()
+        return self
+
+    # === DESDE EL HILO DE TRABAJO ===
+
+    def avanzar(self, progreso: Any = None):
+        """
+        Publica el avance y es punto de cancelación
+
+        Raises:
+            TareaCancelada: Si se pidió cancelar
+        """
+        if progreso is not None:
+            self.progreso = progreso
+        if self._cancelar.is_set():
+            raise TareaCancelada()
+
+    # === DESDE QUIEN LA LANZÓ ===
+
+    def cancelar(self):
+        """Pide detenerse en el siguiente avanzar() (no espera)"""
+        self._cancelar.set()
+
+    @property
+    def cancelacion_pedida(self) -> bool:
+        return self._cancelar.is_set()
+
+    @property
+    def terminada(self) -> bool:
+        return self._terminada.is_set()
+
+    @property
+    def cancelada(self) -> bool:
+        """Terminó por la cancelación"""
+        return self.terminada and isinstance(self._error, TareaCancelada)
+
+    def esperar(self, segundos: Optional[float] = None) -> bool:
+        """
+        Espera a que termine
+
+        Returns:
+            True si terminó dentro del plazo
+        """
+        return self._terminada.wait(segundos)
+
+    def resultado(self) -> Any:
+        """
+        Lo que retornó la función
+
+        Raises:
+            RuntimeError: Si todavía no termina
+            La excepción de la función, si falló (TareaCancelada si se
+            canceló)
+        """
+        if not self.terminada:
+            raise RuntimeError("La tarea no ha terminado")
+        if self._error is not None:
+            raise self._error
+        return self._resultado
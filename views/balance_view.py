@@ -5,39 +5,119 @@ Vista principal del balance general
 
 import tkinter as tk
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from models.arbol_cuentas import SEPARADOR
+from models.eventos import BusEventos, EventoCambio
 from views.components.base_components import (
-    FrameConScroll, FilaCuenta, FilaTotal, 
+    FrameConScroll, FilaCuenta, FilaTotal, ListaCuentasVirtual,
     EncabezadoBalance, PieBalance, DesgloseFactura
 )
 from utils.helpers import COLORES
 
 
 class BalanceView:
-    """Vista para mostrar el balance general"""
+    """
+    Vista para mostrar el balance general
     
-    def __init__(self, parent: tk.Frame):
+    La pantalla se construye una sola vez; después mostrar_balance solo
+    cambia lo que cambió: los textos del encabezado, los valores de las
+    filas (por (categoría, cuenta)), las filas de cuentas que aparecen o
+    desaparecen y las secciones de pasivo, advertencia y desglose.
+    """
+    
+    # Categorías de pasivo: solo se muestran las cuentas con saldo
+    CATEGORIAS_PASIVO = ('PASIVO_LARGO_PLAZO', 'PASIVO_CORTO_PLAZO')
+    
+    CATEGORIAS = ('ACTIVO_CIRCULANTE', 'ACTIVO_NO_CIRCULANTE') + CATEGORIAS_PASIVO + ('CAPITAL',)
+    
+    # Con más filas que estas una categoría se dibuja con una lista
+    # virtual (solo las filas visibles) en lugar de una fila por cuenta
+    MAX_FILAS_FIJAS = ListaCuentasVirtual.FILAS_VISIBLES
+    
+    def __init__(self, parent: tk.Frame,
+                 total_cuenta: Optional[Callable[[str, str], float]] = None):
+        """
+        Args:
+            parent: Frame donde se dibuja
+            total_cuenta: (categoría, ruta) -> total del nivel; con él las
+                          actualizaciones agrupadas por nivel no recorren
+                          las subcuentas
+        """
         self.parent = parent
+        self.total_cuenta = total_cuenta
+        
+        # Niveles de subcuentas a mostrar ('BANCO/BBVA/CTA 1' con nivel 1
+        # se muestra como 'BANCO' con el total de todas); None = todas
+        self.nivel: Optional[int] = None
+        
+        self._reiniciar_referencias()
+    
+    def _reiniciar_referencias(self):
+        # Widgets que se conservan entre actualizaciones
+        self._encabezado: Optional[EncabezadoBalance] = None
+        self._contenedores: Dict[str, tk.Frame] = {}
+        self._filas: Dict[Tuple[str, str], FilaCuenta] = {}
+        self._listas: Dict[str, ListaCuentasVirtual] = {}
+        self._filas_total: Dict[str, FilaTotal] = {}
+        
+        # Secciones que se muestran u ocultan: (frame, opciones de pack,
+        # frames que van después, para volver a colocarla en su lugar)
+        self._secciones: Dict[str, Tuple[tk.Frame, Dict, List[tk.Frame]]] = {}
+        self._advertencia: Optional[tk.Label] = None
+        self._frame_desglose: Optional[tk.Frame] = None
+        self._desglose: Optional[Dict] = None
+        self._balance_cuadra = True
     
     def limpiar(self):
-        """Limpia el frame"""
+        """Limpia el frame (la siguiente llamada vuelve a construir todo)"""
         for widget in self.parent.winfo_children():
             widget.destroy()
+        self._reiniciar_referencias()
     
-    def mostrar_balance(self, estado: Dict, totales: Dict, 
-                       titulo: str = "BALANCE GENERAL",
-                       descripcion: str = None,
-                       desglose: Dict = None):
-        """
-        Muestra el balance general completo
+    def _ruta_visible(self, cuenta: str) -> str:
+        """Fila en la que se muestra una cuenta con el nivel actual"""
+        if not self.nivel:
+            return cuenta
+        return SEPARADOR.join(cuenta.split(SEPARADOR)[:self.nivel])
+    
+    def _cuentas(self, estado: Dict, categoria: str) -> Iterator[Tuple[str, float]]:
+        """Filas de una categoría: (cuenta o nivel, saldo o total del nivel)"""
+        if not self.nivel:
+            yield from estado[categoria].items()
+            return
         
-        Args:
-            estado: Estado actual de las cuentas
-            totales: Totales calculados
-            titulo: Título del balance
-            descripcion: Descripción adicional
-            desglose: Desglose de factura (opcional)
-        """
+        totales: Dict[str, float] = {}
+        for cuenta, valor in estado[categoria].items():
+            ruta = self._ruta_visible(cuenta)
+            totales[ruta] = totales.get(ruta, 0.0) + valor
+        yield from totales.items()
+    
+    def _fila_total(self, clave: str, parent, nombre: str, valor: float, **kwargs):
+        """Crea y registra una fila de total"""
+        self._filas_total[clave] = FilaTotal(parent, nombre, valor, **kwargs)
+    
+    def _seccion(self, nombre: str, frame: tk.Frame, siguientes: List[tk.Frame], **opciones):
+        """Registra una sección que se muestra u oculta según los totales"""
+        self._secciones[nombre] = (frame, opciones, siguientes)
+    
+    def _mostrar_seccion(self, nombre: str, visible: bool):
+        frame, opciones, siguientes = self._secciones[nombre]
+        if visible == bool(frame.winfo_manager()):
+            return
+        if not visible:
+            frame.pack_forget()
+            return
+        
+        antes = next((s for s in siguientes if s.winfo_manager()), None)
+        if antes is not None:
+            frame.pack(before=antes, **opciones)
+        else:
+            frame.pack(**opciones)
+    
+    # === CONSTRUCCIÓN ===
+    
+    def _construir(self, titulo: str, subtitulo: str, descripcion: Optional[str]):
+        """Crea el esqueleto de la pantalla, con las categorías vacías"""
         self.limpiar()
         
         # Frame con scroll
@@ -48,13 +128,7 @@ class BalanceView:
         frame = scroll_frame.scrollable_frame
         
         # Encabezado
-        fecha = datetime.now().strftime('%d de %B %Y')
-        EncabezadoBalance(
-            frame,
-            titulo,
-            f"ESTADO DE SITUACION FINANCIERA {fecha}",
-            descripcion
-        )
+        self._encabezado = EncabezadoBalance(frame, titulo, subtitulo, descripcion)
         
         # Frame principal para activo y pasivo
         main_balance = tk.Frame(frame)
@@ -71,24 +145,22 @@ class BalanceView:
         tk.Label(activo_frame, text="CIRCULANTE", font=('Arial', 10, 'bold'),
                 bg='#E3F2FD', anchor='w').pack(fill=tk.X, padx=5, pady=2)
         
-        for cuenta, valor in estado['ACTIVO_CIRCULANTE'].items():
-            FilaCuenta(activo_frame, cuenta, valor)
+        self._contenedor(activo_frame, 'ACTIVO_CIRCULANTE')
         
-        FilaTotal(activo_frame, "SUMA ACTIVOS CIRC.", 
-                 totales['activo_circulante'], bg=COLORES['highlight'])
+        self._fila_total('activo_circulante', activo_frame, "SUMA ACTIVOS CIRC.", 
+                         0.0, bg=COLORES['highlight'])
         
         # Activo No Circulante
         tk.Label(activo_frame, text="NO CIRCULANTE", font=('Arial', 10, 'bold'),
                 bg='#E3F2FD', anchor='w').pack(fill=tk.X, padx=5, pady=2)
         
-        for cuenta, valor in estado['ACTIVO_NO_CIRCULANTE'].items():
-            FilaCuenta(activo_frame, cuenta, valor)
+        self._contenedor(activo_frame, 'ACTIVO_NO_CIRCULANTE')
         
-        FilaTotal(activo_frame, "SUMA ACTIVOS", 
-                 totales['activo_no_circulante'], bg=COLORES['highlight'])
+        self._fila_total('activo_no_circulante', activo_frame, "SUMA ACTIVOS", 
+                         0.0, bg=COLORES['highlight'])
         
-        FilaTotal(activo_frame, "TOTAL", totales['total_activo'], 
-                 bg=COLORES['total'], bold=True)
+        self._fila_total('total_activo', activo_frame, "TOTAL", 0.0, 
+                         bg=COLORES['total'], bold=True)
         
         # PASIVO Y CAPITAL
         pasivo_frame = tk.Frame(main_balance, relief=tk.GROOVE, bd=2)
@@ -97,61 +169,255 @@ class BalanceView:
         tk.Label(pasivo_frame, text="CAPITAL CONTABLE", font=('Arial', 12, 'bold'),
                 bg=COLORES['activo']).pack(fill=tk.X)
         
-        # Pasivo Largo Plazo
-        if totales['pasivo_largo_plazo'] > 0:
-            tk.Label(pasivo_frame, text="PASIVO", font=('Arial', 10, 'bold'),
-                    bg=COLORES['pasivo'], anchor='w').pack(fill=tk.X, padx=5, pady=2)
-            tk.Label(pasivo_frame, text="LARGO PLAZO", font=('Arial', 9, 'bold'),
-                    bg='#FCE4EC', anchor='w').pack(fill=tk.X, padx=10, pady=1)
-            
-            for cuenta, valor in estado['PASIVO_LARGO_PLAZO'].items():
-                if valor > 0:
-                    FilaCuenta(pasivo_frame, cuenta, valor)
-        
-        # Pasivo Corto Plazo
-        if totales['pasivo_corto_plazo'] > 0:
-            if totales['pasivo_largo_plazo'] == 0:
-                tk.Label(pasivo_frame, text="PASIVO", font=('Arial', 10, 'bold'),
-                        bg=COLORES['pasivo'], anchor='w').pack(fill=tk.X, padx=5, pady=2)
-            
-            tk.Label(pasivo_frame, text="CORTO PLAZO", font=('Arial', 9, 'bold'),
-                    bg='#FCE4EC', anchor='w').pack(fill=tk.X, padx=10, pady=1)
-            
-            for cuenta, valor in estado['PASIVO_CORTO_PLAZO'].items():
-                if valor > 0:
-                    FilaCuenta(pasivo_frame, cuenta, valor)
+        # Pasivo (cada sección se muestra solo si su total es positivo)
+        titulo_pasivo = tk.Label(pasivo_frame, text="PASIVO", font=('Arial', 10, 'bold'),
+                                 bg=COLORES['pasivo'], anchor='w')
+        largo_plazo = tk.Frame(pasivo_frame)
+        corto_plazo = tk.Frame(pasivo_frame)
+        separador = tk.Label(pasivo_frame, text="", height=1)
         
-        if totales['pasivo_largo_plazo'] > 0 or totales['pasivo_corto_plazo'] > 0:
-            tk.Label(pasivo_frame, text="", height=1).pack()
+        for seccion, texto, categoria in ((largo_plazo, "LARGO PLAZO", 'PASIVO_LARGO_PLAZO'),
+                                          (corto_plazo, "CORTO PLAZO", 'PASIVO_CORTO_PLAZO')):
+            tk.Label(seccion, text=texto, font=('Arial', 9, 'bold'),
+                    bg='#FCE4EC', anchor='w').pack(fill=tk.X, padx=10, pady=1)
+            self._contenedor(seccion, categoria)
         
         # Capital
-        for cuenta, valor in estado['CAPITAL'].items():
-            FilaCuenta(pasivo_frame, cuenta, valor)
+        capital = self._contenedor(pasivo_frame, 'CAPITAL')
         
         tk.Label(pasivo_frame, text="", height=2).pack()
         
-        FilaTotal(pasivo_frame, "TOTAL", totales['total_pasivo_capital'],
-                 bg=COLORES['total'], bold=True)
-        
-        # Verificar balance
-        if not totales['balance_cuadra']:
-            warning_frame = tk.Frame(frame, bg='#FFEBEE', relief=tk.RIDGE, bd=2)
-            warning_frame.pack(fill=tk.X, pady=5)
-            tk.Label(
-                warning_frame,
-                text=f"⚠️ ADVERTENCIA: El balance no cuadra. Diferencia: ${totales['diferencia']:,.2f}",
-                font=('Arial', 10, 'bold'),
-                bg='#FFEBEE',
-                fg='red'
-            ).pack(pady=5)
-        
-        # Desglose si existe
-        if desglose:
-            self._mostrar_desglose(frame, desglose)
+        self._fila_total('total_pasivo_capital', pasivo_frame, "TOTAL",
+                         0.0, bg=COLORES['total'], bold=True)
+        
+        self._seccion('pasivo', titulo_pasivo, [largo_plazo, corto_plazo, separador, capital],
+                      fill=tk.X, padx=5, pady=2)
+        self._seccion('PASIVO_LARGO_PLAZO', largo_plazo, [corto_plazo, separador, capital],
+                      fill=tk.X)
+        self._seccion('PASIVO_CORTO_PLAZO', corto_plazo, [separador, capital], fill=tk.X)
+        self._seccion('separador', separador, [capital])
+        
+        # Advertencia de balance (oculta mientras cuadre), desglose y pie
+        advertencia = tk.Frame(frame, bg='#FFEBEE', relief=tk.RIDGE, bd=2)
+        self._advertencia = tk.Label(advertencia, font=('Arial', 10, 'bold'),
+                                     bg='#FFEBEE', fg='red')
+        self._advertencia.pack(pady=5)
+        
+        self._frame_desglose = tk.Frame(frame)
+        self._frame_desglose.pack(fill=tk.X)
+        
+        self._seccion('advertencia', advertencia, [self._frame_desglose], fill=tk.X, pady=5)
+        self._balance_cuadra = True
         
         # Pie
         PieBalance(frame)
     
+    def _contenedor(self, parent, categoria: str) -> tk.Frame:
+        """Frame donde van las filas de una categoría"""
+        contenedor = tk.Frame(parent)
+        contenedor.pack(fill=tk.X)
+        self._contenedores[categoria] = contenedor
+        return contenedor
+    
+    # === ACTUALIZACIÓN ===
+    
+    def _sincronizar_categoria(self, estado: Dict, categoria: str):
+        """
+        Deja las filas de una categoría como en el estado: actualiza los
+        valores que cambiaron y crea o destruye solo las filas de cuentas
+        que aparecieron o desaparecieron
+        """
+        filas = [(cuenta, valor) for cuenta, valor in self._cuentas(estado, categoria)
+                 if categoria not in self.CATEGORIAS_PASIVO or valor > 0]
+        contenedor = self._contenedores[categoria]
+        
+        nuevas = {cuenta for cuenta, _ in filas} if len(filas) <= self.MAX_FILAS_FIJAS else ()
+        for clave in [c for c in self._filas if c[0] == categoria and c[1] not in nuevas]:
+            self._filas.pop(clave).destroy()
+        
+        lista = self._listas.get(categoria)
+        if len(filas) > self.MAX_FILAS_FIJAS:
+            if lista is None:
+                self._listas[categoria] = ListaCuentasVirtual(contenedor, filas)
+            else:
+                lista.reemplazar(filas)
+            return
+        if lista is not None:
+            del self._listas[categoria]
+            lista.destroy()
+        
+        # De abajo hacia arriba, para colocar cada fila nueva antes de la
+        # siguiente (las cuentas existentes no cambian de orden)
+        siguiente = None
+        for cuenta, valor in reversed(filas):
+            fila = self._filas.get((categoria, cuenta))
+            if fila is None:
+                fila = FilaCuenta(contenedor, cuenta, valor)
+                if siguiente is not None:
+                    fila.pack(fill=tk.X, padx=5, pady=1, before=siguiente)
+                self._filas[(categoria, cuenta)] = fila
+            else:
+                fila.actualizar(valor)
+            siguiente = fila
+    
+    def _actualizar_filas(self, estado: Dict, cuentas: Iterable[Tuple[str, str]]) -> bool:
+        """
+        Actualiza solo las filas de las cuentas indicadas
+        
+        Returns:
+            False (sin cambiar nada) si alguna fila tendría que aparecer o
+            desaparecer
+        """
+        if self.nivel and self.total_cuenta is None:
+            return False
+        
+        cambios = []
+        for categoria, cuenta in set(cuentas):
+            valor = estado[categoria].get(cuenta)
+            if valor is not None and self.nivel:
+                cuenta = self._ruta_visible(cuenta)
+                valor = self.total_cuenta(categoria, cuenta)
+            lista = self._listas.get(categoria)
+            fila = self._filas.get((categoria, cuenta))
+            mostrada = cuenta in lista if lista is not None else fila is not None
+            visible = valor is not None and (
+                categoria not in self.CATEGORIAS_PASIVO or valor > 0)
+            
+            if mostrada != visible:
+                return False
+            if mostrada:
+                cambios.append((lista, fila, cuenta, valor))
+        
+        for lista, fila, cuenta, valor in cambios:
+            if lista is not None:
+                lista.actualizar(cuenta, valor)
+            else:
+                fila.actualizar(valor)
+        return True
+    
+    def _actualizar_totales(self, totales: Dict):
+        """Filas de totales, secciones de pasivo y advertencia de balance"""
+        for clave, fila in self._filas_total.items():
+            fila.actualizar(totales[clave])
+        
+        largo_plazo = totales['pasivo_largo_plazo'] > 0
+        corto_plazo = totales['pasivo_corto_plazo'] > 0
+        self._mostrar_seccion('pasivo', largo_plazo or corto_plazo)
+        self._mostrar_seccion('PASIVO_LARGO_PLAZO', largo_plazo)
+        self._mostrar_seccion('PASIVO_CORTO_PLAZO', corto_plazo)
+        self._mostrar_seccion('separador', largo_plazo or corto_plazo)
+        
+        self._balance_cuadra = totales['balance_cuadra']
+        if not self._balance_cuadra:
+            self._advertencia.config(
+                text=f"⚠️ ADVERTENCIA: El balance no cuadra. Diferencia: ${totales['diferencia']:,.2f}"
+            )
+        self._mostrar_seccion('advertencia', not self._balance_cuadra)
+    
+    def actualizar_cuentas(self, estado: Dict, totales: Dict,
+                           cuentas: Iterable[Tuple[str, str]]) -> bool:
+        """
+        Actualiza las filas de las cuentas indicadas y los totales
+        
+        Si alguna cuenta aparece o desaparece se sincronizan las
+        categorías completas (sin reconstruir la pantalla).
+        
+        Args:
+            estado: Estado actual de las cuentas
+            totales: Totales calculados
+            cuentas: (categoria, cuenta) modificadas
+        
+        Returns:
+            False si la vista aún no se ha dibujado (hay que llamar a
+            mostrar_balance)
+        """
+        if self._encabezado is None:
+            return False
+        
+        if not self._actualizar_filas(estado, cuentas):
+            for categoria in self.CATEGORIAS:
+                self._sincronizar_categoria(estado, categoria)
+        self._actualizar_totales(totales)
+        return True
+    
+    def conectar(self, eventos: BusEventos, obtener_estado: Callable[[], Dict]) -> Callable[[], None]:
+        """
+        Se suscribe a los cambios del modelo: cada evento (uno por ráfaga
+        si el bus los combina) actualiza las filas tocadas y los totales
+        
+        Args:
+            eventos: Bus del modelo (controller.eventos)
+            obtener_estado: Estado actual, para leer el saldo de las
+                            cuentas tocadas
+        
+        Returns:
+            Función que cancela la suscripción
+        """
+        def al_cambiar(evento: EventoCambio):
+            if self._encabezado is None:
+                return
+            estado = obtener_estado()
+            if evento.cuentas is None or not self._actualizar_filas(estado, evento.cuentas):
+                for categoria in self.CATEGORIAS:
+                    self._sincronizar_categoria(estado, categoria)
+            self._actualizar_totales(evento.totales)
+        
+        return eventos.suscribir(al_cambiar)
+    
+    def mostrar_balance(self, estado: Dict, totales: Dict, 
+                       titulo: str = "BALANCE GENERAL",
+                       descripcion: str = None,
+                       desglose: Dict = None,
+                       cuentas: Optional[Iterable[Tuple[str, str]]] = None):
+        """
+        Muestra el balance general completo
+        
+        La primera vez construye la pantalla; las siguientes solo aplican
+        las diferencias.
+        
+        Args:
+            estado: Estado actual de las cuentas
+            totales: Totales calculados
+            titulo: Título del balance
+            descripcion: Descripción adicional
+            desglose: Desglose de factura (opcional)
+            cuentas: (categoria, cuenta) modificadas desde la última vez, si
+                     se conocen; así no se comparan todas las cuentas
+        """
+        if self._encabezado is None:
+            self._construir(titulo, self._subtitulo(), descripcion)
+            cuentas = None
+        
+        if cuentas is None or not self._actualizar_filas(estado, cuentas):
+            for categoria in self.CATEGORIAS:
+                self._sincronizar_categoria(estado, categoria)
+        self._actualizar_totales(totales)
+        self.mostrar_encabezado(titulo, descripcion, desglose)
+    
+    @staticmethod
+    def _subtitulo() -> str:
+        fecha = datetime.now().strftime('%d de %B %Y')
+        return f"ESTADO DE SITUACION FINANCIERA {fecha}"
+    
+    def mostrar_encabezado(self, titulo: str = "BALANCE GENERAL",
+                           descripcion: Optional[str] = None,
+                           desglose: Optional[Dict] = None):
+        """
+        Cambia título, descripción y desglose sin tocar las cuentas (las
+        actualizan los eventos del modelo)
+        """
+        if self._encabezado is None:
+            return
+        self._encabezado.actualizar(titulo, self._subtitulo(), descripcion)
+        
+        # Desglose si existe (solo se vuelve a dibujar si cambió)
+        if desglose != self._desglose:
+            for widget in self._frame_desglose.winfo_children():
+                widget.destroy()
+            if desglose:
+                self._mostrar_desglose(self._frame_desglose, desglose)
+            self._desglose = desglose
+    
     def _mostrar_desglose(self, parent, desglose: Dict):
         """Muestra el desglose de una transacción"""
         tipo = desglose.get('tipo', '')
@@ -5,7 +5,7 @@ Componentes reutilizables para las vistas
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from utils.helpers import COLORES, formatear_moneda
 
 
@@ -41,8 +41,118 @@ class FilaCuenta(tk.Frame):
         
         tk.Label(self, text=nombre, font=('Arial', 9), bg=bg,
                 anchor='w').pack(side=tk.LEFT, fill=tk.X, expand=True)
-        tk.Label(self, text=formatear_moneda(valor), font=('Arial', 9), bg=bg,
-                anchor='e').pack(side=tk.RIGHT, padx=5)
+        self.valor = valor
+        self.label_valor = tk.Label(self, text=formatear_moneda(valor), font=('Arial', 9),
+                                    bg=bg, anchor='e')
+        self.label_valor.pack(side=tk.RIGHT, padx=5)
+    
+    def actualizar(self, valor: float):
+        """Cambia el valor mostrado sin recrear la fila (si cambió)"""
+        if valor != self.valor:
+            self.valor = valor
+            self.label_valor.config(text=formatear_moneda(valor))
+
+
+class ListaCuentasVirtual(tk.Frame):
+    """
+    Lista de cuentas para categorías grandes: en un solo Canvas dibuja
+    únicamente las filas visibles con un conjunto fijo de textos que se
+    reutilizan al desplazarse, así los widgets y el tiempo de dibujo no
+    dependen del número de cuentas
+    """
+    
+    ALTO_FILA = 21
+    FILAS_VISIBLES = 20
+    
+    def __init__(self, parent, filas: List[Tuple[str, float]], bg='white', **kwargs):
+        super().__init__(parent, bg=bg, **kwargs)
+        self.pack(fill=tk.X, padx=5, pady=1)
+        
+        self._nombres = [nombre for nombre, _ in filas]
+        self._valores = [valor for _, valor in filas]
+        self._posiciones: Dict[str, int] = {nombre: i for i, nombre in enumerate(self._nombres)}
+        self._inicio = 0
+        
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self._ancho = 0
+        self._textos: List[Tuple[int, int]] = []
+        self._crear_textos(min(len(filas), self.FILAS_VISIBLES))
+        
+        self.canvas.bind("<Configure>", self._redimensionar)
+        self.canvas.bind("<MouseWheel>", lambda e: self._desplazar('scroll', -e.delta // 120, 'units'))
+        self.canvas.bind("<Button-4>", lambda e: self._desplazar('scroll', -3, 'units'))
+        self.canvas.bind("<Button-5>", lambda e: self._desplazar('scroll', 3, 'units'))
+        self._dibujar()
+    
+    def __len__(self) -> int:
+        return len(self._nombres)
+    
+    def __contains__(self, nombre) -> bool:
+        return nombre in self._posiciones
+    
+    def actualizar(self, nombre: str, valor: float):
+        """Cambia el valor de una cuenta (se redibuja solo si está a la vista)"""
+        i = self._posiciones[nombre]
+        self._valores[i] = valor
+        if self._inicio <= i < self._inicio + len(self._textos):
+            self.canvas.itemconfigure(self._textos[i - self._inicio][1],
+                                      text=formatear_moneda(valor))
+    
+    def reemplazar(self, filas: List[Tuple[str, float]]):
+        """Cambia todas las filas conservando la posición de desplazamiento"""
+        self._nombres = [nombre for nombre, _ in filas]
+        self._valores = [valor for _, valor in filas]
+        self._posiciones = {nombre: i for i, nombre in enumerate(self._nombres)}
+        
+        visibles = min(len(filas), self.FILAS_VISIBLES)
+        if visibles != len(self._textos):
+            self._crear_textos(visibles)
+        self._inicio = max(0, min(self._inicio, len(filas) - visibles))
+        self._dibujar()
+    
+    def _crear_textos(self, visibles: int):
+        """Conjunto de dos textos (nombre y valor) por fila visible"""
+        for texto_nombre, texto_valor in self._textos:
+            self.canvas.delete(texto_nombre, texto_valor)
+        
+        centro = self.ALTO_FILA // 2
+        self._textos = [
+            (self.canvas.create_text(5, i * self.ALTO_FILA + centro, anchor='w', font=('Arial', 9)),
+             self.canvas.create_text(self._ancho - 10, i * self.ALTO_FILA + centro, anchor='e',
+                                     font=('Arial', 9)))
+            for i in range(visibles)
+        ]
+        self.canvas.config(height=visibles * self.ALTO_FILA)
+    
+    def _dibujar(self):
+        for k, (texto_nombre, texto_valor) in enumerate(self._textos):
+            i = self._inicio + k
+            self.canvas.itemconfigure(texto_nombre, text=self._nombres[i])
+            self.canvas.itemconfigure(texto_valor, text=formatear_moneda(self._valores[i]))
+        
+        total = len(self._nombres) or 1
+        self.scrollbar.set(self._inicio / total, (self._inicio + len(self._textos)) / total)
+    
+    def _redimensionar(self, event):
+        self._ancho = event.width
+        for _, texto_valor in self._textos:
+            self.canvas.coords(texto_valor, event.width - 10, self.canvas.coords(texto_valor)[1])
+    
+    def _desplazar(self, accion: str, cantidad, unidad: Optional[str] = None):
+        """Protocolo de comandos de tk.Scrollbar ('moveto' o 'scroll')"""
+        ultimo = len(self._nombres) - len(self._textos)
+        if accion == 'moveto':
+            inicio = round(float(cantidad) * len(self._nombres))
+        else:
+            paso = 1 if unidad == 'units' else len(self._textos)
+            inicio = self._inicio + int(cantidad) * paso
+        inicio = max(0, min(inicio, ultimo))
+        if inicio != self._inicio:
+            self._inicio = inicio
+            self._dibujar()
 
 
 class FilaTotal(tk.Frame):
@@ -57,8 +167,16 @@ class FilaTotal(tk.Frame):
         
         tk.Label(self, text=nombre, font=font, bg=bg,
                 anchor='w').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        tk.Label(self, text=formatear_moneda(valor), font=font, bg=bg,
-                anchor='e').pack(side=tk.RIGHT, padx=5)
+        self.valor = valor
+        self.label_valor = tk.Label(self, text=formatear_moneda(valor), font=font,
+                                    bg=bg, anchor='e')
+        self.label_valor.pack(side=tk.RIGHT, padx=5)
+    
+    def actualizar(self, valor: float):
+        """Cambia el valor mostrado sin recrear la fila (si cambió)"""
+        if valor != self.valor:
+            self.valor = valor
+            self.label_valor.config(text=formatear_moneda(valor))
 
 
 class EncabezadoBalance(tk.Frame):
@@ -69,14 +187,28 @@ class EncabezadoBalance(tk.Frame):
         super().__init__(parent, bg=COLORES['capital'], relief=tk.RIDGE, bd=2, **kwargs)
         self.pack(fill=tk.X, pady=(0, 5))
         
-        tk.Label(self, text=titulo, font=('Arial', 14, 'bold'),
-                bg=COLORES['capital']).pack(pady=3)
-        tk.Label(self, text=subtitulo, font=('Arial', 10),
-                bg=COLORES['capital']).pack(pady=2)
+        self.label_titulo = tk.Label(self, text=titulo, font=('Arial', 14, 'bold'),
+                                     bg=COLORES['capital'])
+        self.label_titulo.pack(pady=3)
+        self.label_subtitulo = tk.Label(self, text=subtitulo, font=('Arial', 10),
+                                        bg=COLORES['capital'])
+        self.label_subtitulo.pack(pady=2)
         
+        # La descripción solo ocupa lugar cuando tiene texto
+        self.label_descripcion = tk.Label(self, text=descripcion or '', font=('Arial', 9),
+                                          bg=COLORES['capital'], fg='#1565C0')
+        if descripcion:
+            self.label_descripcion.pack(pady=2)
+    
+    def actualizar(self, titulo: str, subtitulo: str, descripcion: Optional[str] = None):
+        """Cambia los textos sin recrear el encabezado"""
+        self.label_titulo.config(text=titulo)
+        self.label_subtitulo.config(text=subtitulo)
+        self.label_descripcion.config(text=descripcion or '')
         if descripcion:
-            tk.Label(self, text=descripcion, font=('Arial', 9),
-                    bg=COLORES['capital'], fg='#1565C0').pack(pady=2)
+            self.label_descripcion.pack(pady=2)
+        else:
+            self.label_descripcion.pack_forget()
 
 
 class PieBalance(tk.Frame):
@@ -142,10 +274,20 @@ class BotonAccion(tk.Button):
 
 
 class SelectorCuenta(tk.Frame):
-    """Componente para seleccionar una cuenta con tipo"""
+    """
+    Componente para seleccionar una cuenta con tipo
+    
+    Con buscar_cuentas_callback el combobox es editable: muestra solo las
+    primeras MAX_OPCIONES cuentas y al escribir se filtra con la búsqueda
+    del controlador (para catálogos de miles de cuentas).
+    """
+    
+    # Opciones que se cargan en el combobox cuando hay búsqueda
+    MAX_OPCIONES = 100
     
     def __init__(self, parent, label: str, categorias: List[str],
-                obtener_cuentas_callback: Callable, **kwargs):
+                obtener_cuentas_callback: Callable,
+                buscar_cuentas_callback: Optional[Callable] = None, **kwargs):
         super().__init__(parent, **kwargs)
         
         tk.Label(self, text=label, font=('Arial', 11, 'bold')).pack(pady=5)
@@ -172,14 +314,22 @@ class SelectorCuenta(tk.Frame):
         self.combo_cuenta = ttk.Combobox(
             self,
             textvariable=self.cuenta_var,
-            state='readonly',
+            state='normal' if buscar_cuentas_callback else 'readonly',
             width=30,
             font=('Arial', 10)
         )
         self.combo_cuenta.pack(pady=5)
         
-        # Callback para actualizar cuentas
+        # Callbacks para actualizar y buscar cuentas
         self.obtener_cuentas = obtener_cuentas_callback
+        self.buscar_cuentas = buscar_cuentas_callback
+        
+        # Lista que llenó el combo la última vez (None si hay un filtro)
+        self._cuentas_mostradas = None
+        
+        if buscar_cuentas_callback:
+            self.combo_cuenta.bind('<KeyRelease>', self._filtrar)
+            self.combo_cuenta.bind('<Return>', self._completar)
         
         # Actualizar cuando cambia el tipo
         if len(categorias) > 1:
@@ -191,13 +341,42 @@ class SelectorCuenta(tk.Frame):
         """Actualiza la lista de cuentas según el tipo seleccionado"""
         tipo = self.tipo_var.get()
         cuentas = self.obtener_cuentas(tipo)
+        
+        # El controlador retorna la misma tupla mientras la categoría no
+        # tenga altas ni bajas: volver a elegir el mismo tipo no cuesta nada
+        if cuentas is self._cuentas_mostradas:
+            return
+        self._cuentas_mostradas = cuentas
+        if self.buscar_cuentas:
+            cuentas = cuentas[:self.MAX_OPCIONES]
         self.combo_cuenta['values'] = cuentas
         if cuentas:
             self.combo_cuenta.set(cuentas[0])
     
+    def _filtrar(self, event=None):
+        """Filtra las opciones con lo escrito hasta ahora"""
+        if event is not None and event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        texto = self.cuenta_var.get()
+        if not texto.strip():
+            self.combo_cuenta['values'] = self.obtener_cuentas(self.tipo_var.get())[:self.MAX_OPCIONES]
+            return
+        encontradas = self.buscar_cuentas(texto, self.tipo_var.get(), self.MAX_OPCIONES)
+        self.combo_cuenta['values'] = [cuenta for _, cuenta in encontradas]
+        self._cuentas_mostradas = None
+    
+    def _completar(self, event=None):
+        """Enter: toma la primera opción si lo escrito no es una cuenta exacta"""
+        opciones = self.combo_cuenta['values']
+        if opciones and self.cuenta_var.get().strip().upper() not in opciones:
+            self.combo_cuenta.set(opciones[0])
+    
     def obtener_seleccion(self) -> tuple:
         """Retorna (tipo, cuenta)"""
-        return self.tipo_var.get(), self.cuenta_var.get()
+        cuenta = self.cuenta_var.get()
+        if self.buscar_cuentas:
+            cuenta = cuenta.strip().upper()
+        return self.tipo_var.get(), cuenta
 
 
 class CampoMoneda(tk.Frame):
@@ -5,6 +5,7 @@ Diálogos para gestión del catálogo
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from models.eventos import ASIENTO
 from utils.helpers import CATEGORIAS_COMBO, formatear_moneda
 
 
@@ -20,10 +21,27 @@ class DialogoCatalogo(tk.Toplevel):
         self.transient(parent)
         
         self._crear_interfaz()
+        
+        # No es modal: sigue los cambios al catálogo mientras está abierto
+        cancelar = controller.eventos.suscribir(self._al_cambiar)
+        self.bind('<Destroy>', lambda e: cancelar() if e.widget is self else None)
     
     def _crear_interfaz(self):
         tk.Label(self, text="CATÁLOGO DE CUENTAS", font=('Arial', 16, 'bold')).pack(pady=10)
         
+        self._cuerpo = tk.Frame(self)
+        self._cuerpo.pack(fill=tk.X)
+        self._llenar_cuerpo()
+    
+    def _al_cambiar(self, evento):
+        """Los asientos no tocan el catálogo; altas, bajas o cargas sí"""
+        if evento.tipo == ASIENTO:
+            return
+        for hijo in self._cuerpo.winfo_children():
+            hijo.destroy()
+        self._llenar_cuerpo()
+    
+    def _llenar_cuerpo(self):
         catalogo = self.controller.obtener_catalogo_completo()
         
         for categoria, nombre in [('ACTIVO_CIRCULANTE', 'ACTIVO CIRCULANTE'),
@@ -31,7 +49,7 @@ class DialogoCatalogo(tk.Toplevel):
                                    ('PASIVO_LARGO_PLAZO', 'PASIVO LARGO PLAZO'),
                                    ('PASIVO_CORTO_PLAZO', 'PASIVO CORTO PLAZO'),
                                    ('CAPITAL', 'CAPITAL')]:
-            frame = tk.Frame(self, relief=tk.GROOVE, bd=2)
+            frame = tk.Frame(self._cuerpo, relief=tk.GROOVE, bd=2)
             frame.pack(fill=tk.X, padx=20, pady=5)
             
             tk.Label(frame, text=nombre, font=('Arial', 11, 'bold'), bg='#BBDEFB').pack(fill=tk.X)
@@ -0,0 +1,106 @@
+"""
+views/dialogs/tarea_dialogs.py
+Diálogo de progreso para el trabajo en segundo plano
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+from utils.tareas import Tarea
+
+# Cada cuánto se revisa el avance de la tarea
+INTERVALO_MS = 50
+
+# Lo que se espera a la tarea antes de abrir el diálogo (un cuadro): las
+# operaciones cortas terminan sin que aparezca ninguna ventana
+ESPERA_INICIAL_S = 0.016
+
+
+class DialogoTarea(tk.Toplevel):
+    """Avance de una Tarea, con botón para cancelarla"""
+    
+    def __init__(self, parent, tarea: Tarea, titulo: str,
+                 describir: Optional[Callable[[Any], str]] = None,
+                 cancelable: bool = True):
+        super().__init__(parent)
+        self.tarea = tarea
+        self.describir = describir
+        
+        self.title(titulo)
+        self.geometry("420x160")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self._cancelar if cancelable else lambda: None)
+        
+        self._crear_interfaz(titulo, cancelable)
+        self._revisar()
+    
+    def _crear_interfaz(self, titulo: str, cancelable: bool):
+        tk.Label(self, text=titulo, font=('Arial', 12, 'bold')).pack(pady=(15, 5))
+        
+        self.label_progreso = tk.Label(self, text="Procesando...")
+        self.label_progreso.pack()
+        
+        self.barra = ttk.Progressbar(self, mode='indeterminate', length=360)
+        self.barra.pack(pady=10)
+        self.barra.start(INTERVALO_MS)
+        
+        self.boton_cancelar = None
+        if cancelable:
+            self.boton_cancelar = tk.Button(self, text="Cancelar", command=self._cancelar,
+                                            padx=15)
+            self.boton_cancelar.pack()
+    
+    def _cancelar(self):
+        self.tarea.cancelar()
+        self.label_progreso.config(text="Cancelando...")
+        if self.boton_cancelar is not None:
+            self.boton_cancelar.config(state=tk.DISABLED)
+    
+    def _revisar(self):
+        """Se vuelve a programar hasta que la tarea termine (nunca la espera)"""
+        if self.tarea.terminada:
+            self.barra.stop()
+            self.destroy()
+            return
+        
+        if (self.describir is not None and self.tarea.progreso is not None
+                and not self.tarea.cancelacion_pedida):
+            self.label_progreso.config(text=self.describir(self.tarea.progreso))
+        self.after(INTERVALO_MS, self._revisar)
+
+
+def ejecutar_en_segundo_plano(parent, titulo: str, funcion: Callable[[Tarea], Any],
+                              describir: Optional[Callable[[Any], str]] = None,
+                              cancelable: bool = True, eventos=None) -> Tarea:
+    """
+    Ejecuta funcion(tarea) en un hilo sin bloquear la interfaz
+
+    Si termina dentro de un cuadro retorna sin mostrar nada; si no, abre un
+    DialogoTarea modal y espera con wait_window, que sigue atendiendo el
+    ciclo de Tk (redibujar, root.after) mientras la tarea corre.
+
+    Args:
+        parent: Ventana sobre la que se muestra el diálogo
+        titulo: Título del diálogo
+        funcion: Trabajo; recibe la Tarea para llamar a avanzar()
+        describir: Texto del avance a partir de tarea.progreso
+        cancelable: Si se muestra el botón Cancelar
+        eventos: BusEventos del modelo; los cambios de la tarea se
+                 entregan a las vistas combinados al terminar, no a medias
+
+    Returns:
+        La Tarea terminada (resultado(), cancelada)
+    """
+    trabajo = funcion
+    if eventos is not None:
+        def trabajo(tarea: Tarea):
+            with eventos.agrupados():
+                return funcion(tarea)
+
+    tarea = Tarea(trabajo, titulo).iniciar()
+    if not tarea.esperar(ESPERA_INICIAL_S):
+        dialogo = DialogoTarea(parent, tarea, titulo, describir, cancelable)
+        parent.wait_window(dialogo)
+    return tarea
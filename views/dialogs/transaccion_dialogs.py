@@ -6,6 +6,7 @@ Diálogos para transacciones
 import tkinter as tk
 from tkinter import ttk, messagebox
 from views.components.base_components import BotonAccion, SelectorCuenta, CampoMoneda
+from views.dialogs.tarea_dialogs import ejecutar_en_segundo_plano
 
 
 class DialogoCompraEfectivo(tk.Toplevel):
@@ -38,7 +39,8 @@ class DialogoCompraEfectivo(tk.Toplevel):
         self.selector_destino = SelectorCuenta(
             self, "2. Cuenta destino:",
             ['ACTIVO_CIRCULANTE', 'ACTIVO_NO_CIRCULANTE'],
-            self.controller.obtener_cuentas
+            self.controller.obtener_cuentas,
+            self.controller.buscar_cuentas
         )
         self.selector_destino.pack(pady=10)
         
@@ -71,6 +73,9 @@ class DialogoCompraCredito(tk.Toplevel):
         self.resultado = None
         self.compras = []
         
+        # Cuentas cargadas en el combo de pasivo (tupla del caché del controlador)
+        self._cuentas_pasivo = None
+        
         self.title("Compra a Crédito")
         self.geometry("600x500")
         self.transient(parent)
@@ -128,10 +133,18 @@ class DialogoCompraCredito(tk.Toplevel):
         
         tk.Entry(frame, textvariable=monto_var, width=12).pack(side=tk.LEFT, padx=5)
         
+        mostradas = None
+        
         def actualizar(*args):
-            combo['values'] = self.controller.obtener_cuentas(tipo_var.get())
-            if combo['values']:
-                combo.set(combo['values'][0])
+            # Misma tupla del caché: misma categoría y sin altas ni bajas
+            nonlocal mostradas
+            cuentas = self.controller.obtener_cuentas(tipo_var.get())
+            if cuentas is mostradas:
+                return
+            mostradas = cuentas
+            combo['values'] = cuentas
+            if cuentas:
+                combo.set(cuentas[0])
         
         tipo_var.trace('w', actualizar)
         actualizar()
@@ -141,6 +154,9 @@ class DialogoCompraCredito(tk.Toplevel):
     def _actualizar_pasivo(self, *args):
         tipo = self.pasivo_tipo_var.get()
         cuentas = self.controller.obtener_cuentas(tipo)
+        if cuentas is self._cuentas_pasivo:
+            return
+        self._cuentas_pasivo = cuentas
         self.combo_pasivo['values'] = cuentas
         if cuentas:
             self.combo_pasivo.set(cuentas[0])
@@ -156,9 +172,15 @@ class DialogoCompraCredito(tk.Toplevel):
             tipo_pasivo = self.pasivo_tipo_var.get()
             cuenta_pasivo = self.cuenta_pasivo_var.get()
             
-            self.resultado = self.controller.realizar_compra_credito(
-                compras_list, tipo_pasivo, cuenta_pasivo
+            # Con muchos conceptos puede tardar: corre en un hilo aparte
+            tarea = ejecutar_en_segundo_plano(
+                self, "Compra a crédito",
+                lambda tarea: self.controller.realizar_compra_credito(
+                    compras_list, tipo_pasivo, cuenta_pasivo
+                ),
+                cancelable=False, eventos=self.controller.eventos
             )
+            self.resultado = tarea.resultado()
             self.destroy()
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -186,21 +208,24 @@ class DialogoCompraCombinada(tk.Toplevel):
         self.selector_pago = SelectorCuenta(
             self, "1. Cuenta de pago (anticipo):",
             ['ACTIVO_CIRCULANTE'],
-            self.controller.obtener_cuentas
+            self.controller.obtener_cuentas,
+            self.controller.buscar_cuentas
         )
         self.selector_pago.pack(pady=5)
         
         self.selector_destino = SelectorCuenta(
             self, "2. Cuenta destino:",
             ['ACTIVO_CIRCULANTE', 'ACTIVO_NO_CIRCULANTE'],
-            self.controller.obtener_cuentas
+            self.controller.obtener_cuentas,
+            self.controller.buscar_cuentas
         )
         self.selector_destino.pack(pady=5)
         
         self.selector_pasivo = SelectorCuenta(
             self, "3. Cuenta de pasivo (crédito):",
             ['PASIVO_CORTO_PLAZO', 'PASIVO_LARGO_PLAZO'],
-            self.controller.obtener_cuentas
+            self.controller.obtener_cuentas,
+            self.controller.buscar_cuentas
         )
         self.selector_pasivo.pack(pady=5)
         
@@ -253,7 +278,8 @@ class DialogoAnticipoClientes(tk.Toplevel):
         self.selector_recibe = SelectorCuenta(
             self, "1. Cuenta que recibe:",
             ['ACTIVO_CIRCULANTE'],
-            self.controller.obtener_cuentas
+            self.controller.obtener_cuentas,
+            self.controller.buscar_cuentas
         )
         self.selector_recibe.pack(pady=10)
         